@@ -34,6 +34,7 @@ from webdriver_manager.chrome import ChromeDriverManager
 
 # AI Agent
 from .ai_agent import AIAgent  # adjust import path as needed
+from ..utils.rate_limiter import RateLimiter, RateLimitPolicy  # shared cross-process token buckets
 
 # CAPTCHA solver libraries (install conditionally)
 try:
@@ -67,40 +68,6 @@ async def with_retries(func: Callable, tries: int = 3, base_delay_s: float = 2,
             await asyncio.sleep(delay)
 
 
-# -------------------- Rate Limiter --------------------
-@dataclass
-class RateLimitPolicy:
-    min_delay_s: float
-    max_delay_s: float
-    jitter_s: float = 0
-
-
-class RateLimiter:
-    """Per‑domain rate limiter with jitter."""
-    def __init__(self, default_policy: RateLimitPolicy, policies: Dict[str, RateLimitPolicy]):
-        self.default_policy = default_policy
-        self.policies = policies
-        self.last_request_time: Dict[str, float] = {}
-
-    async def wait(self, url: str):
-        """Wait appropriate delay for the domain extracted from url."""
-        domain = self._extract_domain(url)
-        policy = self.policies.get(domain, self.default_policy)
-        now = time.time()
-        last = self.last_request_time.get(domain, 0)
-        elapsed = now - last
-        delay = random.uniform(policy.min_delay_s, policy.max_delay_s) + random.uniform(-policy.jitter_s, policy.jitter_s)
-        delay = max(0, delay - elapsed)
-        if delay > 0:
-            logger.debug(f"Rate limiting {domain}: waiting {delay:.2f}s")
-            await asyncio.sleep(delay)
-        self.last_request_time[domain] = time.time()
-
-    @staticmethod
-    def _extract_domain(url: str) -> str:
-        return urlparse(url).netloc or "unknown"
-
-
 # -------------------- CAPTCHA Solver (Multi‑Provider) --------------------
 class CaptchaSolver:
     """
@@ -298,7 +265,7 @@ class AutomationWorker:
         if not job.posting_url:
             return JobDetails()
 
-        await self.limiter.wait(job.posting_url)
+        await self.limiter.wait(url=job.posting_url)
 
         options = webdriver.ChromeOptions()
         if self.headless:
@@ -1082,7 +1049,7 @@ Respond with JSON: {{"score": float, "reason": "..."}}
 
         # 3. Platform-specific apply (if apply_url exists)
         if job.apply_url:
-            await self.limiter.wait(job.apply_url)
+            await self.limiter.wait(url=job.apply_url)
             options = webdriver.ChromeOptions()
             if self.headless:
                 options.add_argument("--headless")
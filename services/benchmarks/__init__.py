@@ -0,0 +1,14 @@
+"""
+benchmarks/
+
+End-to-end search benchmarks that run the real search pipeline against
+local stand-ins for the upstream job APIs.
+
+- fixtures.py        provider response bodies in each API's wire shape (synthetic or recorded)
+- standin_server.py  local HTTP server serving them with configurable latency, errors and size
+- search_bench.py    scenario runner reporting latency percentiles, RPS and peak RSS
+
+Usage:
+    python -m services.benchmarks.search_bench --json bench.json
+    python -m services.benchmarks.search_bench --baseline bench.json
+"""
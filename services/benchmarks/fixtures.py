@@ -0,0 +1,371 @@
+"""
+benchmarks/fixtures.py
+
+Response bodies served by the stand-in providers, in each provider's real
+wire shape (the same keys the provider adapters read).
+
+Bodies are synthetic by default.  A recordings directory holding
+`<provider>.json` files (a response body captured from the real API) replaces
+the synthetic items for those providers; recorded items are cycled up to the
+requested count with their URLs and companies suffixed so every job stays
+distinct through dedupe.
+
+Search APIs (Adzuna, Remotive, Himalayas, Jobicy, USAJobs) only return
+matches, so every item carries the query.  Feed APIs (RemoteOK, Arbeitnow,
+The Muse) return everything and the adapters filter locally, so only
+`match_ratio` of their items carry one of the benchmark queries.
+
+Usage:
+    fixtures = Fixtures(recordings=Path("recorded/"))
+    body = fixtures.render("remoteok", items=5000, queries=["python developer"])
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+log = logging.getLogger(__name__)
+
+# Upstream host -> provider name (the stand-in routes on the original host)
+PROVIDER_HOSTS: Dict[str, str] = {
+    "api.adzuna.com": "adzuna",
+    "remotive.io": "remotive",
+    "himalayas.app": "himalayas",
+    "jobicy.com": "jobicy",
+    "www.arbeitnow.com": "arbeitnow",
+    "remoteok.com": "remoteok",
+    "www.themuse.com": "muse",
+    "data.usajobs.gov": "usajobs",
+}
+
+# Providers whose API filters by keyword (everything served is a match)
+KEYWORD_PROVIDERS = frozenset({"adzuna", "remotive", "himalayas", "jobicy", "usajobs"})
+
+# Request parameter carrying the keyword, per search API
+QUERY_PARAMS: Dict[str, str] = {
+    "adzuna": "what",
+    "remotive": "search",
+    "himalayas": "query",
+    "jobicy": "tag",
+    "usajobs": "Keyword",
+}
+
+_LEVELS = ("Junior", "Senior", "Lead", "Staff", "Principal", "")
+_ROLES = (
+    "Account Manager", "Nurse Practitioner", "Mechanical Technician", "Sales Associate",
+    "Warehouse Operative", "Financial Analyst", "Customer Success Specialist", "Teacher",
+    "Electrician", "Marketing Coordinator", "Pharmacist", "Logistics Planner",
+)
+_COMPANY_HEADS = ("Nimbus", "Quartz", "Harbor", "Vertex", "Lumen", "Cobalt", "Juniper", "Atlas", "Saffron", "Beacon")
+_COMPANY_TAILS = ("labs", "works", "soft", "health", "logistics", "capital", "media", "systems")
+_PLACES = ("Remote", "Berlin, Germany", "London, UK", "New York, NY", "Austin, TX", "Amsterdam, Netherlands", "Cairo, Egypt")
+_FILLER = (
+    "We are looking for a motivated colleague to join a growing team. You will own features end to end, "
+    "work closely with product and design, and help shape our engineering culture. "
+)
+
+
+@dataclass(frozen=True)
+class SyntheticJob:
+    """Provider-neutral fields one wire-shaped item is built from."""
+
+    index: int
+    title: str
+    company: str
+    location: str
+    url: str
+    description: str
+    posted_at: str
+
+
+def _description(size: int, title: str) -> str:
+    text = f"{title}. {_FILLER}"
+    return (text * (size // len(text) + 1))[:size]
+
+
+def synthetic_job(
+    provider: str,
+    index: int,
+    query: Optional[str],
+    description_bytes: int,
+    variant: str = "",
+) -> SyntheticJob:
+    """
+    Deterministic job `index` for `provider` (and `variant`, e.g. an Adzuna
+    country).  With a `query` the title contains it verbatim (the adapters
+    match on a plain substring); company names are unique per (provider,
+    variant, index) so near-dupe detection never folds distinct items together.
+    """
+    salt = zlib.crc32(f"{provider}:{variant}".encode()) % 1000
+    level = _LEVELS[index % len(_LEVELS)]
+    role = query.title() if query else _ROLES[(index // len(_LEVELS)) % len(_ROLES)]
+    title = f"{level} {role}".strip()
+    company = (
+        f"{_COMPANY_HEADS[index % len(_COMPANY_HEADS)]}"
+        f"{_COMPANY_TAILS[(index // len(_COMPANY_HEADS)) % len(_COMPANY_TAILS)]}{salt}x{index}"
+    )
+    return SyntheticJob(
+        index=index,
+        title=title,
+        company=company,
+        location=_PLACES[index % len(_PLACES)],
+        url=f"https://jobs.example.com/{provider}/{variant or 'all'}/{index}",
+        description=_description(description_bytes, title),
+        posted_at=f"2026-09-{1 + index % 28:02d}T08:00:00Z",
+    )
+
+
+# ── Wire shapes ───────────────────────────────────────────────────────────────
+# Each entry: (synthetic job -> item, page of items + paging info -> body, recorded body -> items)
+
+def _adzuna_item(j: SyntheticJob) -> Dict[str, Any]:
+    return {
+        "title": j.title,
+        "company": {"display_name": j.company},
+        "location": {"display_name": j.location},
+        "redirect_url": j.url,
+        "created": j.posted_at,
+        "description": j.description,
+    }
+
+
+def _remotive_item(j: SyntheticJob) -> Dict[str, Any]:
+    return {
+        "title": j.title,
+        "company_name": j.company,
+        "candidate_required_location": j.location,
+        "url": j.url,
+        "description": j.description,
+        "publication_date": j.posted_at,
+        "category": "Software Development",
+        "tags": [],
+    }
+
+
+def _himalayas_item(j: SyntheticJob) -> Dict[str, Any]:
+    return {
+        "title": j.title,
+        "company": {"name": j.company},
+        "location": j.location,
+        "application_url": j.url,
+        "description": j.description,
+        "published_at": j.posted_at,
+    }
+
+
+def _jobicy_item(j: SyntheticJob) -> Dict[str, Any]:
+    return {
+        "jobTitle": j.title,
+        "companyName": j.company,
+        "jobGeo": j.location,
+        "url": j.url,
+        "jobExcerpt": j.description,
+        "pubDate": j.posted_at,
+    }
+
+
+def _arbeitnow_item(j: SyntheticJob) -> Dict[str, Any]:
+    return {
+        "title": j.title,
+        "company_name": j.company,
+        "location": j.location,
+        "url": j.url,
+        "description": j.description,
+        "created_at": j.posted_at,
+        "remote": j.location == "Remote",
+        "tags": [],
+    }
+
+
+def _remoteok_item(j: SyntheticJob) -> Dict[str, Any]:
+    return {
+        "position": j.title,
+        "company": j.company,
+        "tags": ["dev"],
+        "location": j.location,
+        "url": j.url,
+        "description": j.description,
+        "date": j.posted_at,
+    }
+
+
+def _muse_item(j: SyntheticJob) -> Dict[str, Any]:
+    return {
+        "name": j.title,
+        "company": {"name": j.company},
+        "locations": [{"name": j.location}],
+        "refs": {"landing_page": j.url},
+        "contents": j.description,
+    }
+
+
+def _usajobs_item(j: SyntheticJob) -> Dict[str, Any]:
+    return {
+        "MatchedObjectDescriptor": {
+            "PositionTitle": j.title,
+            "OrganizationName": j.company,
+            "PositionLocation": [{"LocationName": j.location}],
+            "PositionURI": j.url,
+            "UserArea": {"Details": {"JobSummary": j.description}},
+            "PublicationStartDate": j.posted_at,
+        }
+    }
+
+
+@dataclass(frozen=True)
+class WireShape:
+    item: Callable[[SyntheticJob], Dict[str, Any]]
+    wrap: Callable[[List[Any], int, int], Any]          # (page items, total items, page count) -> body
+    unwrap: Callable[[Any], List[Any]]                   # recorded body -> items
+    url_keys: Sequence[Sequence[str]]                    # paths to the URL fields an item carries
+    company_keys: Sequence[Sequence[str]]
+
+
+WIRE_SHAPES: Dict[str, WireShape] = {
+    "adzuna": WireShape(
+        item=_adzuna_item,
+        wrap=lambda items, total, pages: {"results": items, "count": total},
+        unwrap=lambda body: body.get("results") or [],
+        url_keys=(("redirect_url",),),
+        company_keys=(("company", "display_name"),),
+    ),
+    "remotive": WireShape(
+        item=_remotive_item,
+        wrap=lambda items, total, pages: {"job-count": len(items), "jobs": items},
+        unwrap=lambda body: body.get("jobs") or [],
+        url_keys=(("url",),),
+        company_keys=(("company_name",),),
+    ),
+    "himalayas": WireShape(
+        item=_himalayas_item,
+        wrap=lambda items, total, pages: {"jobs": items, "totalCount": total},
+        unwrap=lambda body: body.get("jobs") or [],
+        url_keys=(("application_url",), ("url",)),
+        company_keys=(("company", "name"), ("company_name",)),
+    ),
+    "jobicy": WireShape(
+        item=_jobicy_item,
+        wrap=lambda items, total, pages: {"jobCount": len(items), "jobs": items},
+        unwrap=lambda body: body.get("jobs") or [],
+        url_keys=(("url",), ("jobUrl",)),
+        company_keys=(("companyName",),),
+    ),
+    "arbeitnow": WireShape(
+        item=_arbeitnow_item,
+        wrap=lambda items, total, pages: {"data": items, "links": {}, "meta": {"per_page": len(items)}},
+        unwrap=lambda body: body.get("data") or [],
+        url_keys=(("url",),),
+        company_keys=(("company_name",),),
+    ),
+    "remoteok": WireShape(
+        item=_remoteok_item,
+        wrap=lambda items, total, pages: [{"legal": "stand-in feed"}, *items],   # first entry is metadata
+        unwrap=lambda body: (body or [])[1:],
+        url_keys=(("url",), ("apply_url",)),
+        company_keys=(("company",),),
+    ),
+    "muse": WireShape(
+        item=_muse_item,
+        wrap=lambda items, total, pages: {"results": items, "page_count": pages, "total": total},
+        unwrap=lambda body: body.get("results") or [],
+        url_keys=(("refs", "landing_page"),),
+        company_keys=(("company", "name"),),
+    ),
+    "usajobs": WireShape(
+        item=_usajobs_item,
+        wrap=lambda items, total, pages: {
+            "SearchResult": {"SearchResultCount": len(items), "SearchResultCountAll": total, "SearchResultItems": items}
+        },
+        unwrap=lambda body: ((body.get("SearchResult") or {}).get("SearchResultItems")) or [],
+        url_keys=(("MatchedObjectDescriptor", "PositionURI"),),
+        company_keys=(("MatchedObjectDescriptor", "OrganizationName"),),
+    ),
+}
+
+
+def _suffix(item: Any, keys: Sequence[Sequence[str]], suffix: str) -> None:
+    for path in keys:
+        node = item
+        for key in path[:-1]:
+            node = node.get(key) if isinstance(node, dict) else None
+        if isinstance(node, dict) and isinstance(node.get(path[-1]), str) and node[path[-1]]:
+            node[path[-1]] = f"{node[path[-1]]}{suffix}"
+
+
+class Fixtures:
+    """Builds provider response bodies, from recordings where available."""
+
+    def __init__(self, recordings: Optional[Path] = None) -> None:
+        self.recorded: Dict[str, List[Any]] = {}
+        if recordings:
+            self._load(Path(recordings))
+
+    def _load(self, directory: Path) -> None:
+        for provider, shape in WIRE_SHAPES.items():
+            path = directory / f"{provider}.json"
+            if not path.exists():
+                continue
+            try:
+                items = shape.unwrap(json.loads(path.read_text(encoding="utf-8")))
+            except Exception as e:
+                log.warning("benchmarks: ignoring recording %s: %s", path, e)
+                continue
+            if items:
+                self.recorded[provider] = items
+
+    def items(
+        self,
+        provider: str,
+        start: int,
+        count: int,
+        queries: Sequence[str],
+        match_ratio: float = 1.0,
+        description_bytes: int = 600,
+        variant: str = "",
+    ) -> List[Any]:
+        """Items `start` .. `start + count` of the provider's result list."""
+        shape = WIRE_SHAPES[provider]
+        recorded = self.recorded.get(provider)
+        out: List[Any] = []
+        for index in range(start, start + count):
+            if recorded:
+                item = copy.deepcopy(recorded[index % len(recorded)])
+                if index >= len(recorded) or variant:
+                    _suffix(item, shape.url_keys, f"?standin={variant}{index}")
+                    _suffix(item, shape.company_keys, f" {variant}{index}")
+                out.append(item)
+                continue
+            # Spread matches evenly so any prefix of a feed holds its share
+            matched = provider in KEYWORD_PROVIDERS or int((index + 1) * match_ratio) > int(index * match_ratio)
+            query = queries[index % len(queries)] if matched and queries else None
+            out.append(shape.item(synthetic_job(provider, index, query, description_bytes, variant)))
+        return out
+
+    def render(
+        self,
+        provider: str,
+        items: int,
+        queries: Sequence[str],
+        page: int = 0,
+        per_page: Optional[int] = None,
+        match_ratio: float = 1.0,
+        description_bytes: int = 600,
+        variant: str = "",
+    ) -> bytes:
+        """
+        One response body.  `page` is zero-based; `per_page=None` serves the
+        whole list in one body (feeds, unpaged search APIs).
+        """
+        size = per_page or max(items, 1)
+        pages = max(1, (items + size - 1) // size)
+        start = page * size
+        count = max(0, min(size, items - start))
+        page_items = self.items(provider, start, count, queries, match_ratio, description_bytes, variant)
+        body = WIRE_SHAPES[provider].wrap(page_items, items, pages)
+        return json.dumps(body, separators=(",", ":")).encode("utf-8")
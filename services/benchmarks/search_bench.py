@@ -0,0 +1,395 @@
+"""
+benchmarks/search_bench.py
+
+End-to-end search benchmark against the local stand-in providers.
+
+Each scenario runs `JobSearchEngine.search` in a fresh spawned process (its
+own cache, job store, provider stats and cursor directories under a temp
+dir, feed mirrors off) with every provider HTTP call routed to the
+stand-in server, so the whole pipeline (planning, rate limiting, HTTP
+pools, decoding, dedupe, ranking, caching, store writes) is exercised
+without touching the real APIs.
+
+Scenarios:
+- cold        every request refreshes: full provider fan-out each time
+- warm        one priming search per query, then payload-cache hits
+- outage      Adzuna and Remotive answer 503 (retries, circuit breakers)
+- large_feed  RemoteOK and Arbeitnow serve 5000-item feeds with long descriptions
+
+Requests rotate through a fixed query set; with `--concurrency` at or below
+the number of queries no two in-flight requests share a single-flight key.
+
+Reported per scenario: p50 / p95 / p99 latency, requests per second, peak
+RSS of the search process, provider errors, jobs per response and the
+upstream requests the stand-in served.  `--json` writes the report;
+`--baseline` compares against an earlier one and exits 1 when a metric
+regresses by more than `--max-regression`.
+
+Usage:
+    python -m services.benchmarks.search_bench
+    python -m services.benchmarks.search_bench --scenarios cold,warm --requests 100 --json bench.json
+    python -m services.benchmarks.search_bench --baseline bench.json --max-regression 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+
+from .fixtures import Fixtures
+from .standin_server import CONTROL_PREFIX, DEFAULT_PROFILES, ProviderProfile, StandinConfig, StandinServer, standin_transport_factory
+
+# Everything but JobSpy, which scrapes job boards in-process rather than calling an API
+BENCH_PROVIDERS = ["adzuna", "remotive", "himalayas", "jobicy", "arbeitnow", "remoteok", "muse", "usajobs"]
+
+DEFAULT_QUERIES = [
+    "python developer",
+    "data engineer",
+    "frontend developer",
+    "devops engineer",
+    "product manager",
+    "data scientist",
+    "backend engineer",
+    "qa engineer",
+    "mobile developer",
+    "ux designer",
+    "site reliability engineer",
+    "machine learning engineer",
+]
+
+# Metrics where a larger value is the regression (everything else: smaller is)
+HIGHER_IS_WORSE = {"p50_ms": True, "p95_ms": True, "p99_ms": True, "rps": False, "peak_rss_mb": True}
+
+
+@dataclass
+class Scenario:
+    name: str
+    description: str
+    providers: List[str] = field(default_factory=lambda: list(BENCH_PROVIDERS))
+    profiles: Dict[str, Dict[str, Any]] = field(default_factory=dict)   # overrides of DEFAULT_PROFILES
+    match_ratio: float = 0.2
+    refresh: bool = True
+    prime: bool = False
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    s.name: s
+    for s in (
+        Scenario("cold", "every request refreshes and fans out to all providers"),
+        Scenario("warm", "cache primed once per query, then served from cache", refresh=False, prime=True),
+        Scenario(
+            "outage",
+            "adzuna and remotive fail every request",
+            profiles={"adzuna": {"error_rate": 1.0}, "remotive": {"error_rate": 1.0}},
+        ),
+        Scenario(
+            "large_feed",
+            "5000-item remoteok and arbeitnow feeds with 4 KB descriptions",
+            providers=["remoteok", "arbeitnow"],
+            profiles={
+                "remoteok": {"items": 5000, "description_bytes": 4000},
+                "arbeitnow": {"items": 5000, "description_bytes": 4000},
+            },
+            match_ratio=0.02,
+        ),
+    )
+}
+
+
+@dataclass
+class BenchOptions:
+    requests: int = 50
+    concurrency: int = 8
+    where: Optional[str] = None
+    mode: str = "balanced"
+    limit: int = 60
+    latency_scale: float = 1.0
+    real_limits: bool = False
+    queries: List[str] = field(default_factory=lambda: list(DEFAULT_QUERIES))
+
+
+def standin_config(scenario: Scenario, options: BenchOptions) -> StandinConfig:
+    profiles: Dict[str, ProviderProfile] = {}
+    for name, base in DEFAULT_PROFILES.items():
+        profile = replace(base, **scenario.profiles.get(name, {}))
+        profiles[name] = replace(
+            profile,
+            latency_ms=profile.latency_ms * options.latency_scale,
+            jitter_ms=profile.jitter_ms * options.latency_scale,
+        )
+    return StandinConfig(profiles=profiles, queries=list(options.queries), match_ratio=scenario.match_ratio)
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for no samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+
+
+# ── Scenario process ──────────────────────────────────────────────────────────
+
+def _isolated_env(workdir: Path, real_limits: bool) -> Dict[str, str]:
+    """Settings for a search process that shares no state with the host or earlier runs."""
+    env = {
+        "JOB_CACHE_DIR": str(workdir / "cache"),
+        "JOB_STORE_PATH": str(workdir / "jobs.sqlite3"),
+        "PROVIDER_STATS_PATH": str(workdir / "provider_stats.json"),
+        "SEARCH_CURSOR_DIR": str(workdir / "cursors"),
+        "FEED_MIRROR_DIR": str(workdir / "feed_mirror"),
+        "FEED_MIRROR_ENABLED": "false",
+        "RATE_LIMIT_BACKEND": "memory",
+        "RATE_LIMIT_DB_PATH": str(workdir / "rate_limits.sqlite3"),
+        "ADZUNA_APP_ID": "bench",
+        "ADZUNA_APP_KEY": "bench",
+        "ADZUNA_COUNTRIES": "gb,us,de",
+        "USAJOBS_API_KEY": "bench",
+    }
+    if not real_limits:
+        env.update({"ADZUNA_RATE_PER_MIN": "1000000", "ADZUNA_BURST": "1000000"})
+    return env
+
+
+async def _run_scenario(scenario: Scenario, base_url: str, options: BenchOptions) -> Dict[str, Any]:
+    # Imported here so the settings pick up the isolated environment
+    from ..engines.job_search_engine import JobSearchEngine
+    from ..utils import http_clients
+    from ..utils.rate_limiter import RateLimiter, RateLimitPolicy
+
+    http_clients._default_registry = http_clients.HttpClientRegistry(
+        transport_factory=standin_transport_factory(base_url)
+    )
+    # Politeness delays and the Adzuna budget measure the upstream's limits,
+    # not this code; keep them only when asked (`--real-limits`)
+    limiter = None if options.real_limits else RateLimiter(default_policy=RateLimitPolicy(0.0, 0.0, 0.0), policies={})
+    engine = JobSearchEngine(limiter=limiter)
+
+    async def one(query: str, refresh: bool) -> Dict[str, Any]:
+        return await engine.search(
+            query,
+            where=options.where,
+            limit=options.limit,
+            providers=scenario.providers,
+            mode=options.mode,
+            refresh=refresh,
+        )
+
+    if scenario.prime:
+        for query in options.queries:
+            await one(query, refresh=False)
+        # Report only the timed searches' upstream traffic
+        async with httpx.AsyncClient() as control:
+            await control.post(f"{base_url}{CONTROL_PREFIX}reset")
+
+    rss_before_mb = _peak_rss_mb()
+    latencies: List[float] = []
+    job_counts: List[int] = []
+    provider_errors = 0
+    failures = 0
+    semaphore = asyncio.Semaphore(max(1, options.concurrency))
+
+    async def timed(i: int) -> None:
+        nonlocal provider_errors, failures
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                payload = await one(options.queries[i % len(options.queries)], refresh=scenario.refresh)
+            except Exception:
+                failures += 1
+                return
+            latencies.append(time.perf_counter() - started)
+            job_counts.append(len(payload.get("jobs") or []))
+            provider_errors += len(payload.get("provider_errors") or {})
+
+    started = time.perf_counter()
+    await asyncio.gather(*(timed(i) for i in range(options.requests)))
+    wall_s = time.perf_counter() - started
+
+    await http_clients.get_default_registry().aclose()
+
+    return {
+        "requests": options.requests,
+        "failures": failures,
+        "provider_errors": provider_errors,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "rps": round(len(latencies) / wall_s, 2) if wall_s > 0 else 0.0,
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "rss_growth_mb": round(_peak_rss_mb() - rss_before_mb, 1),
+        "jobs_per_response": round(sum(job_counts) / len(job_counts), 1) if job_counts else 0.0,
+        "wall_s": round(wall_s, 3),
+    }
+
+
+def _scenario_main(scenario: Scenario, base_url: str, options: BenchOptions, results) -> None:
+    """Entry point of a spawned scenario process; puts its report (or error) on `results`."""
+    workdir = Path(tempfile.mkdtemp(prefix=f"huntflow-bench-{scenario.name}-"))
+    os.environ.update(_isolated_env(workdir, options.real_limits))
+    try:
+        results.put(asyncio.run(_run_scenario(scenario, base_url, options)))
+    except BaseException as e:
+        results.put({"error": f"{type(e).__name__}: {e}"})
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run_scenario(server: StandinServer, scenario: Scenario, options: BenchOptions, timeout_s: float = 1800.0) -> Dict[str, Any]:
+    server.configure(standin_config(scenario, options))
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    proc = ctx.Process(target=_scenario_main, args=(scenario, server.base_url, options, results), name=f"bench-{scenario.name}")
+    proc.start()
+    try:
+        report = results.get(timeout=timeout_s)
+    except Exception:
+        report = {"error": f"no report within {timeout_s:.0f}s"}
+    proc.join(timeout=30)
+    if proc.is_alive():
+        proc.terminate()
+
+    upstream = server.stats()
+    report["upstream_requests"] = sum(upstream["requests"].values())
+    report["upstream_errors"] = sum(upstream["errors"].values())
+    report["upstream_mb"] = round(sum(upstream["bytes"].values()) / (1024 * 1024), 2)
+    report["upstream"] = upstream["requests"]
+    return report
+
+
+# ── Reporting ─────────────────────────────────────────────────────────────────
+
+def format_report(reports: Dict[str, Dict[str, Any]]) -> str:
+    header = (
+        f"{'scenario':<12}{'reqs':>6}{'fail':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+        f"{'rps':>9}{'rss MB':>9}{'jobs':>7}{'prov err':>10}{'upstream':>10}"
+    )
+    lines = [header, "-" * len(header)]
+    for name, r in reports.items():
+        if "error" in r:
+            lines.append(f"{name:<12}  failed: {r['error']}")
+            continue
+        lines.append(
+            f"{name:<12}{r['requests']:>6}{r['failures']:>6}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}"
+            f"{r['rps']:>9.1f}{r['peak_rss_mb']:>9.1f}{r['jobs_per_response']:>7.1f}{r['provider_errors']:>10}"
+            f"{r['upstream_requests']:>10}"
+        )
+    return "\n".join(lines)
+
+
+def find_regressions(
+    reports: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    max_regression: float,
+) -> List[str]:
+    """One line per metric that is worse than the baseline by more than `max_regression` (a fraction)."""
+    found: List[str] = []
+    for name, report in reports.items():
+        before = baseline.get(name)
+        if not before or "error" in before:
+            continue
+        if "error" in report:
+            found.append(f"{name}: failed ({report['error']})")
+            continue
+        for metric, higher_is_worse in HIGHER_IS_WORSE.items():
+            old, new = before.get(metric), report.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old if higher_is_worse else (old - new) / old
+            if change > max_regression:
+                found.append(f"{name}: {metric} {old} -> {new} ({change:+.0%} worse)")
+    return found
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="End-to-end job search benchmark against local stand-in providers.")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"comma-separated, from: {', '.join(SCENARIOS)}")
+    parser.add_argument("--requests", type=int, default=50, help="timed searches per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--where", default=None, help="location passed to every search")
+    parser.add_argument("--mode", default="balanced", choices=["fast", "balanced", "exhaustive"])
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="multiplier on the stand-in latencies")
+    parser.add_argument("--fixtures", type=Path, default=None, help="directory of recorded <provider>.json bodies")
+    parser.add_argument("--real-limits", action="store_true", help="keep the per-provider politeness delays")
+    parser.add_argument("--json", type=Path, default=None, help="write the report here")
+    parser.add_argument("--baseline", type=Path, default=None, help="earlier --json report to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.15, help="allowed fractional slowdown per metric")
+    args = parser.parse_args(argv)
+
+    names = [n.strip() for n in args.scenarios.split(",") if n.strip()]
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    options = BenchOptions(
+        requests=args.requests,
+        concurrency=args.concurrency,
+        where=args.where,
+        mode=args.mode,
+        latency_scale=args.latency_scale,
+        real_limits=args.real_limits,
+    )
+
+    server = StandinServer(fixtures=Fixtures(recordings=args.fixtures))
+    server.start()
+    reports: Dict[str, Dict[str, Any]] = {}
+    try:
+        for name in names:
+            print(f"running {name}: {SCENARIOS[name].description}", file=sys.stderr, flush=True)
+            reports[name] = run_scenario(server, SCENARIOS[name], options)
+    finally:
+        server.stop()
+
+    print(format_report(reports))
+
+    if args.json:
+        args.json.write_text(
+            json.dumps(
+                {
+                    "meta": {
+                        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                        "python": platform.python_version(),
+                        "platform": platform.platform(),
+                        "options": asdict(options),
+                    },
+                    "scenarios": reports,
+                },
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8")).get("scenarios") or {}
+        regressions = find_regressions(reports, baseline, args.max_regression)
+        if regressions:
+            print("\nregressions:\n  " + "\n  ".join(regressions))
+            return 1
+        print(f"\nno regressions beyond {args.max_regression:.0%} of {args.baseline}")
+    return 1 if any("error" in r for r in reports.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,360 @@
+"""
+benchmarks/standin_server.py
+
+Local HTTP stand-in for the upstream job APIs.
+
+One threaded stdlib HTTP/1.1 server answers for every provider.  Benchmark
+clients keep their real provider URLs; `StandinTransport` (installed through
+`HttpClientRegistry(transport_factory=...)`) rewrites each request to the
+stand-in and names the original host in an `X-Standin-Host` header, which
+picks the provider whose wire-shaped fixture is served.
+
+Per provider (`ProviderProfile`):
+- latency + uniform jitter before the response
+- error rate (answered with `error_status`)
+- result count and description size (large feeds)
+
+Rendered bodies are cached by request shape, so serving cost stays flat and
+the latency is the configured one.
+
+Control endpoints:
+    POST /__standin/config   {"profiles": {name: {...}}, "queries": [...], "match_ratio": 0.2}
+                             replaces the configuration and resets the counters
+    POST /__standin/reset    resets the counters only
+    GET  /__standin/stats    per-provider requests, errors and bytes sent
+
+Usage:
+    python -m services.benchmarks.standin_server --port 8765 [--fixtures recorded/]
+
+    server = StandinServer(fixtures=Fixtures())
+    server.start()                                   # background thread
+    registry = HttpClientRegistry(transport_factory=standin_transport_factory(server.base_url))
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+
+from .fixtures import PROVIDER_HOSTS, QUERY_PARAMS, Fixtures
+
+log = logging.getLogger(__name__)
+
+STANDIN_HOST_HEADER = "X-Standin-Host"
+CONTROL_PREFIX = "/__standin/"
+
+MUSE_PAGE_SIZE = 20
+
+
+@dataclass
+class ProviderProfile:
+    latency_ms: float = 150.0
+    jitter_ms: float = 50.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    items: int = 50                 # total results (feeds: feed length)
+    description_bytes: int = 600
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ProviderProfile":
+        known = {k: v for k, v in (data or {}).items() if k in cls.__dataclass_fields__}
+        return cls(**known)
+
+
+# Roughly the latency and size each upstream shows from a nearby region
+DEFAULT_PROFILES: Dict[str, ProviderProfile] = {
+    "adzuna": ProviderProfile(latency_ms=180.0, items=200),
+    "remotive": ProviderProfile(latency_ms=250.0, items=60),
+    "himalayas": ProviderProfile(latency_ms=300.0, items=40),
+    "jobicy": ProviderProfile(latency_ms=200.0, items=50),
+    "arbeitnow": ProviderProfile(latency_ms=350.0, items=100),
+    "remoteok": ProviderProfile(latency_ms=400.0, items=300),
+    "muse": ProviderProfile(latency_ms=250.0, items=200),
+    "usajobs": ProviderProfile(latency_ms=300.0, items=100),
+}
+
+
+@dataclass
+class StandinConfig:
+    profiles: Dict[str, ProviderProfile] = field(default_factory=lambda: dict(DEFAULT_PROFILES))
+    queries: List[str] = field(default_factory=lambda: ["python developer"])
+    match_ratio: float = 0.2        # share of feed items matching one of `queries`
+    seed: int = 0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StandinConfig":
+        profiles = dict(DEFAULT_PROFILES)
+        for name, profile in (data.get("profiles") or {}).items():
+            profiles[name] = ProviderProfile.from_dict(profile)
+        return cls(
+            profiles=profiles,
+            queries=list(data.get("queries") or ["python developer"]),
+            match_ratio=float(data.get("match_ratio", 0.2)),
+            seed=int(data.get("seed", 0)),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "profiles": {name: asdict(p) for name, p in self.profiles.items()},
+            "queries": self.queries,
+            "match_ratio": self.match_ratio,
+            "seed": self.seed,
+        }
+
+
+def _first(params: Dict[str, List[str]], key: str, default: str = "") -> str:
+    values = params.get(key)
+    return values[0] if values else default
+
+
+def _page_request(provider: str, path: str, params: Dict[str, List[str]], profile: ProviderProfile) -> Tuple[int, Optional[int], str]:
+    """(zero-based page, page size or None for the whole list, variant) for one upstream request."""
+    if provider == "adzuna":
+        # /v1/api/jobs/{country}/search/{page}
+        parts = [p for p in path.split("/") if p]
+        country = parts[3] if len(parts) > 3 else ""
+        page = int(parts[-1]) if parts and parts[-1].isdigit() else 1
+        return max(0, page - 1), int(_first(params, "results_per_page", "50")), country
+    if provider == "usajobs":
+        return max(0, int(_first(params, "Page", "1")) - 1), int(_first(params, "ResultsPerPage", "25")), ""
+    if provider == "muse":
+        return int(_first(params, "page", "0")), MUSE_PAGE_SIZE, ""
+    if provider == "jobicy":
+        return 0, min(profile.items, int(_first(params, "count", "50"))), ""
+    return 0, None, ""
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_Server"
+
+    def log_message(self, format: str, *args: Any) -> None:   # noqa: A002 – stdlib signature
+        pass
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        if url.path.startswith(CONTROL_PREFIX):
+            self._control(url.path[len(CONTROL_PREFIX):], None)
+            return
+        self._provider(url.path, parse_qs(url.query))
+
+    def do_POST(self) -> None:
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        if url.path.startswith(CONTROL_PREFIX):
+            self._control(url.path[len(CONTROL_PREFIX):], body)
+            return
+        self._send(405, b'{"error":"method not allowed"}')
+
+    # ── Provider traffic ──────────────────────────────────────────────────────
+
+    def _provider(self, path: str, params: Dict[str, List[str]]) -> None:
+        state = self.server.state
+        host = (self.headers.get(STANDIN_HOST_HEADER) or self.headers.get("Host") or "").split(":")[0]
+        provider = PROVIDER_HOSTS.get(host)
+        if provider is None:
+            self._send(404, json.dumps({"error": f"no stand-in for host {host!r}"}).encode())
+            return
+
+        config, rng = state.config, state.rng
+        profile = config.profiles.get(provider) or ProviderProfile()
+        with state.lock:
+            delay_ms = profile.latency_ms + rng.uniform(0.0, profile.jitter_ms)
+            failed = rng.random() < profile.error_rate
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000.0)
+
+        if failed:
+            body = json.dumps({"error": "stand-in outage", "provider": provider}).encode()
+            state.count(provider, len(body), error=True)
+            self._send(profile.error_status, body)
+            return
+
+        page, per_page, variant = _page_request(provider, path, params, profile)
+        query_param = QUERY_PARAMS.get(provider)
+        queries = [_first(params, query_param)] if query_param and _first(params, query_param) else config.queries
+        body = state.body(provider, profile, tuple(queries), page, per_page, variant)
+        state.count(provider, len(body))
+        self._send(200, body)
+
+    # ── Control ───────────────────────────────────────────────────────────────
+
+    def _control(self, action: str, body: Optional[bytes]) -> None:
+        state = self.server.state
+        if action == "config" and body is not None:
+            try:
+                state.configure(StandinConfig.from_dict(json.loads(body or b"{}")))
+            except Exception as e:
+                self._send(400, json.dumps({"error": str(e)}).encode())
+                return
+            self._send(200, json.dumps(state.config.to_dict()).encode())
+        elif action == "config":
+            self._send(200, json.dumps(state.config.to_dict()).encode())
+        elif action == "reset" and body is not None:
+            state.reset_counters()
+            self._send(200, json.dumps(state.stats()).encode())
+        elif action == "stats":
+            self._send(200, json.dumps(state.stats()).encode())
+        else:
+            self._send(404, b'{"error":"unknown control endpoint"}')
+
+    def _send(self, status: int, body: bytes) -> None:
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # Streaming clients hang up once they have enough items
+            self.close_connection = True
+
+
+class _State:
+    def __init__(self, fixtures: Fixtures, config: StandinConfig) -> None:
+        self.fixtures = fixtures
+        self.lock = threading.Lock()
+        self.configure(config)
+
+    def configure(self, config: StandinConfig) -> None:
+        with self.lock:
+            self.config = config
+            self.rng = random.Random(config.seed)
+            self._bodies: Dict[Tuple[Any, ...], bytes] = {}
+        self.reset_counters()
+
+    def reset_counters(self) -> None:
+        with self.lock:
+            self._requests: Dict[str, int] = {}
+            self._errors: Dict[str, int] = {}
+            self._bytes: Dict[str, int] = {}
+
+    def body(
+        self,
+        provider: str,
+        profile: ProviderProfile,
+        queries: Tuple[str, ...],
+        page: int,
+        per_page: Optional[int],
+        variant: str,
+    ) -> bytes:
+        key = (provider, queries, page, per_page, variant)
+        cached = self._bodies.get(key)
+        if cached is None:
+            cached = self.fixtures.render(
+                provider,
+                items=profile.items,
+                queries=queries,
+                page=page,
+                per_page=per_page,
+                match_ratio=self.config.match_ratio,
+                description_bytes=profile.description_bytes,
+                variant=variant,
+            )
+            with self.lock:
+                self._bodies[key] = cached
+        return cached
+
+    def count(self, provider: str, size: int, error: bool = False) -> None:
+        with self.lock:
+            self._requests[provider] = self._requests.get(provider, 0) + 1
+            self._bytes[provider] = self._bytes.get(provider, 0) + size
+            if error:
+                self._errors[provider] = self._errors.get(provider, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {"requests": dict(self._requests), "errors": dict(self._errors), "bytes": dict(self._bytes)}
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 256
+    state: _State
+
+
+class StandinServer:
+    """The stand-in on 127.0.0.1; `port=0` picks a free port."""
+
+    def __init__(self, fixtures: Optional[Fixtures] = None, config: Optional[StandinConfig] = None, port: int = 0) -> None:
+        self._server = _Server(("127.0.0.1", port), _Handler)
+        self._server.state = _State(fixtures or Fixtures(), config or StandinConfig())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def configure(self, config: StandinConfig) -> None:
+        self._server.state.configure(config)
+
+    def stats(self) -> Dict[str, Any]:
+        return self._server.state.stats()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._server.serve_forever, name="standin-server", daemon=True)
+        self._thread.start()
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+
+class StandinTransport(httpx.AsyncBaseTransport):
+    """Sends every request to the stand-in, naming the original host in a header."""
+
+    def __init__(self, base_url: str, limits: Optional[httpx.Limits] = None) -> None:
+        target = httpx.URL(base_url)
+        self._scheme, self._host, self._port = target.scheme, target.host, target.port
+        self._inner = httpx.AsyncHTTPTransport(limits=limits or httpx.Limits())
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request.headers[STANDIN_HOST_HEADER] = request.url.host
+        request.url = request.url.copy_with(scheme=self._scheme, host=self._host, port=self._port)
+        return await self._inner.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+def standin_transport_factory(base_url: str) -> Callable[[str, httpx.Limits], httpx.AsyncBaseTransport]:
+    """`HttpClientRegistry(transport_factory=...)` hook; keeps each host's pool limits."""
+    return lambda netloc, limits: StandinTransport(base_url, limits)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import argparse
+    from pathlib import Path
+
+    parser = argparse.ArgumentParser(description="Serve stand-in job provider APIs on 127.0.0.1.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", type=Path, default=None, help="directory of recorded <provider>.json bodies")
+    args = parser.parse_args(argv)
+
+    server = StandinServer(fixtures=Fixtures(recordings=args.fixtures), port=args.port)
+    print(f"stand-in providers on {server.base_url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -34,6 +34,10 @@ class Settings(BaseSettings):
 
     ADZUNA_APP_ID: str = Field(default="")
     ADZUNA_APP_KEY: str = Field(default="")
+    ADZUNA_COUNTRIES: str = Field(default="eg")
+    ADZUNA_RATE_PER_MIN: float = Field(default=60.0)
+    ADZUNA_BURST: int = Field(default=10)
+    ADZUNA_MAX_CONCURRENCY: int = Field(default=8)
     USAJOBS_API_KEY: str = Field(default="")
 
     TWOCAPTCHA_API_KEY: str = Field(default="")
@@ -46,6 +50,16 @@ class Settings(BaseSettings):
     MAX_JOBS_PER_COUNTRY: int = Field(default=60)
     HEADLESS: bool = Field(default=True)
 
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = Field(default=10)
+    HTTP_MAX_KEEPALIVE_PER_HOST: int = Field(default=5)
+    HTTP_KEEPALIVE_EXPIRY_S: float = Field(default=30.0)
+    HTTP2_ENABLED: bool = Field(default=False)
+
+    FEED_MIRROR_ENABLED: bool = Field(default=True)
+
+    RATE_LIMIT_BACKEND: str = Field(default="sqlite")  # memory | sqlite | redis
+    REDIS_URL: str = Field(default="redis://localhost:6379/0")
+
     EU_COUNTRIES: str = Field(default="fr,de,nl,it,es,pl,ie,be,at,pt,ro,gr,se,dk,fi,cz,hu")
 
     SMTP_HOST: str = Field(default="")
@@ -64,6 +78,10 @@ class Settings(BaseSettings):
     def eu_country_list(self) -> list[str]:
         return [c.strip().lower() for c in self.EU_COUNTRIES.split(",") if c.strip()]
 
+    @property
+    def adzuna_country_list(self) -> list[str]:
+        return [c.strip().lower() for c in self.ADZUNA_COUNTRIES.split(",") if c.strip()]
+
     @property
     def applicant(self) -> Dict[str, Any]:
         return {
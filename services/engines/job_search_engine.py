@@ -6,28 +6,53 @@ Fix:
 - Provider plan adapts to search parameters (query, where)
 - Tier-specific batch size and per-provider limits (Tier 1 can be larger)
 - Keep cache, retries, dedupe, rate limiter
+- Reuse provider instances and the shared per-host HTTP pools
+- Providers load lazily from the registry (built-ins, manifest, entry points) on first use
+- search_iter streams each provider's deduplicated jobs as they land
+- fast/balanced/exhaustive time budgets with early tier start and partial results
+- Plan adapts to recorded per-provider yield/latency stats (see _adapt_plan)
+- Providers served from a warm feed mirror skip the rate limiter
+- Every job is upserted into the persistent JobStore; short results are topped up from it
+  (BM25-ranked), and the collected `search` payload is ranked by BM25 relevance
+- Near-duplicate postings across providers (MinHash/LSH) are collapsed into the richest record
+- Structured filters are pushed down to providers that declare support; the rest are applied locally
+- Per-provider circuit breakers skip known-bad providers instantly (reported as "circuit_open")
+- Every search returns an opaque `next_cursor`; passing it back fetches only the next slice
+- Concurrent identical `search` calls share one run (single-flight on the cache fingerprint)
+- Stale cache entries (past the soft TTL) are served at once and revalidated in the background
+- Each provider's raw result is also cached on its own, so overlapping plans reuse it
+- Query and location are canonicalized first (see utils/query_canon), so respellings of one
+  search share its cache entries, single-flight run and plan
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import random
 import re
-from typing import Optional, List, Dict, Tuple
-
-from services.responses.jobs import JobItem
-from services.services.providers.base import dedupe_jobs, ProviderResult
-from services.services.providers.arbeitnow import ArbeitnowProvider
-from services.services.providers.himalayas import HimalayasProvider
-from services.services.providers.jobicy import JobicyProvider
-from services.services.providers.remoteok import RemoteOKProvider
-from services.services.providers.remotive import RemotiveProvider
-from services.services.providers.usajobs import USAJobsProvider
-from services.services.providers.jobspy_adapter import JobSpyProvider
-from services.services.providers.muse import MuseProvider
-from services.utils.rate_limiter import RateLimiter
+import time
+from collections import deque
+from contextlib import aclosing
+from dataclasses import asdict, replace
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Deque, Optional, List, Dict, Set, Tuple
+
+from services.utils.job_record import JobRecord
+from services.services.providers.base import job_key, split_filters, JobProvider, ProviderResult, SearchFilters
+from services.services.providers.registry import get_default_provider_registry
+from services.utils.rate_limiter import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, RateLimiter
 from services.utils.retry import with_retries
+from services.utils.near_dupes import NearDuplicateIndex, merge_cluster
+from services.utils.search_index import rank_jobs
+from services.utils.circuit_breaker import HALF_OPEN, CircuitBreakerRegistry, get_default_breakers
 from services.utils.job_cache import get_default_cache
+from services.utils.job_filters import apply_filters
+from services.utils.job_store import JobStore, get_default_store
+from services.utils.provider_stats import ProviderStats, get_default_provider_stats
+from services.utils.query_canon import CanonicalQuery, canonicalize
+from services.utils.search_cursors import SearchCursorStore, get_default_cursor_store
+from services.utils.single_flight import SingleFlight, get_default_single_flight
 
 log = logging.getLogger(__name__)
 
@@ -51,27 +76,22 @@ TIER1_PROVIDERS = {"adzuna", "remotive", "himalayas", "jobicy"}
 TIER2_PROVIDERS = {"arbeitnow", "jobspy"}
 TIER3_PROVIDERS = {"remoteok", "muse", "usajobs"}
 
-PROVIDER_MAP = {
-    "jobspy": JobSpyProvider,
-    "arbeitnow": ArbeitnowProvider,
-    "himalayas": HimalayasProvider,
-    "jobicy": JobicyProvider,
-    "muse": MuseProvider,
-    "remoteok": RemoteOKProvider,
-    "usajobs": USAJobsProvider,
-    "remotive": RemotiveProvider,
-    "adzuna": None,  # lazy import
-}
 
+# Providers come from the lazy registry: each module is imported on first use
+# and its instance reused, so every search borrows the same pooled HTTP clients.
+def _get_provider(name: str) -> JobProvider:
+    return get_default_provider_registry().get(name)
+
+
+def default_provider_order() -> List[str]:
+    """DEFAULT_PROVIDER_ORDER followed by any other discovered provider (manifest, entry points)."""
+    names = get_default_provider_registry().names()
+    return [p for p in DEFAULT_PROVIDER_ORDER if p in names] + [p for p in names if p not in DEFAULT_PROVIDER_ORDER]
 
-def _get_provider(name: str):
-    cls = PROVIDER_MAP.get(name)
-    if cls is None and name == "adzuna":
-        from services.services.providers.adzuna import AdzunaProvider
-        return AdzunaProvider()
-    if cls is None:
-        raise KeyError(f"Unknown provider: {name}")
-    return cls()
+
+def _fresh_page_state() -> Dict[str, Any]:
+    """Paging state of a provider not yet called: token for paging providers, offset for the rest."""
+    return {"token": None, "offset": 0, "done": False}
 
 
 def _normalize_text(s: Optional[str]) -> str:
@@ -97,12 +117,80 @@ def _looks_us(text: str) -> bool:
     return any(k in text for k in ["united states", "usa", "us ", " u.s", "washington", "california", "new york"])
 
 
+# ── Deadline budgets ─────────────────────────────────────────────────────────
+# Total wall-clock budget per search mode (None = no bound).
+SEARCH_MODES: Dict[str, Optional[float]] = {
+    "fast": 8.0,
+    "balanced": 20.0,
+    "exhaustive": None,
+}
+DEFAULT_SEARCH_MODE = "balanced"
+
+# Share of the budget each tier may use before the next tier is started early.
+TIER_BUDGET_SHARE = {1: 0.5, 2: 0.3, 3: 0.2}
+
+# Stored jobs older than this (by last sighting) are not used for top-ups.
+STORE_TOPUP_MAX_AGE_S = 7 * 24 * 3600.0
+
+# ── Adaptive planning ────────────────────────────────────────────────────────
+# Calls per (provider, query class) before recorded stats override the priors.
+PLANNER_MIN_SAMPLES = 5
+# Providers averaging fewer unique jobs than this per call are pruned ...
+PLANNER_MIN_MEAN_UNIQUE = 0.5
+# ... except for an occasional exploration call so their stats can recover.
+PLANNER_EXPLORE_RATE = 0.1
+# Tier placement by unique-jobs-per-second relative to the best provider.
+PLANNER_TIER1_RATIO = 0.5
+PLANNER_TIER2_RATIO = 0.15
+
+
+def _resolve_deadline(mode: Optional[str], deadline_s: Optional[float]) -> Tuple[str, Optional[float]]:
+    mode = mode or DEFAULT_SEARCH_MODE
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode: {mode}")
+    if deadline_s is not None:
+        return mode, max(0.0, float(deadline_s))
+    return mode, SEARCH_MODES[mode]
+
+
+def _canonical_search(
+    query: str,
+    where: Optional[str],
+    filters: Optional[SearchFilters],
+) -> Tuple[CanonicalQuery, SearchFilters]:
+    """
+    Canonical query, and filters carrying its remote intent and the caller's
+    (case-folded) location, which is what providers are asked.
+    """
+    filters = filters or SearchFilters()
+    canon = canonicalize(query, filters.location or where, remote_only=filters.remote_only)
+    return canon, replace(filters, location=canon.search_location, remote_only=canon.remote)
+
+
+def _query_class(query: str, where: Optional[str]) -> str:
+    """Coarse intent bucket used to key provider statistics."""
+    combined = f"{_normalize_text(query)} {_normalize_text(where)}".strip()
+    intents = [
+        name
+        for name, hit in (
+            ("remote", _looks_remote(combined)),
+            ("eu", _looks_eu(combined)),
+            ("us", _looks_us(combined)),
+        )
+        if hit
+    ]
+    return "+".join(intents) or "general"
+
+
 def _tier_of(p: str) -> int:
     if p in TIER1_PROVIDERS:
         return 1
     if p in TIER2_PROVIDERS:
         return 2
-    return 3
+    if p in TIER3_PROVIDERS:
+        return 3
+    # Discovered providers may carry a tier hint; otherwise they run last
+    return get_default_provider_registry().tier(p) or 3
 
 
 def _build_provider_plan(
@@ -121,16 +209,17 @@ def _build_provider_plan(
 
     # Start with override or default, keep only known providers
     order = providers_override or base_order
-    order = [p for p in order if p in PROVIDER_MAP]
+    registry = get_default_provider_registry()
+    order = [p for p in order if p in registry]
 
     # Make sure adzuna is always present (it is your highest-yield structured source)
     if "adzuna" not in order:
         order = ["adzuna", *order]
 
     # Base grouping
-    tier1 = [p for p in order if p in TIER1_PROVIDERS]
-    tier2 = [p for p in order if p in TIER2_PROVIDERS]
-    tier3 = [p for p in order if p in TIER3_PROVIDERS]
+    tier1 = [p for p in order if _tier_of(p) == 1]
+    tier2 = [p for p in order if _tier_of(p) == 2]
+    tier3 = [p for p in order if _tier_of(p) == 3]
 
     # Adapt tier ordering based on intent
     remote_intent = _looks_remote(combined)
@@ -166,18 +255,106 @@ def _build_provider_plan(
     return tiers
 
 
+def _adapt_plan(
+    tiers: List[List[str]],
+    query_class: str,
+    stats: ProviderStats,
+    forced: bool = False,
+) -> Tuple[List[List[str]], List[int], List[str]]:
+    """
+    Rebuild the static tier plan from recorded statistics.
+
+    Providers with at least PLANNER_MIN_SAMPLES calls for this query class are
+    re-tiered by expected unique jobs per second (relative to the best one)
+    and pruned when they rarely add unique jobs.  Providers without enough
+    samples keep their static tier and run first within it so they collect
+    samples.  Explicitly requested providers (`forced`) are never pruned.
+
+    Returns (tiers, tier numbers, pruned providers).
+    """
+    snaps = {p: stats.snapshot(p, query_class) for tier in tiers for p in tier}
+    observed = {p: s for p, s in snaps.items() if s.calls >= PLANNER_MIN_SAMPLES}
+
+    pruned: List[str] = []
+    if not forced:
+        for p, snap in observed.items():
+            if snap.mean_unique < PLANNER_MIN_MEAN_UNIQUE and random.random() >= PLANNER_EXPLORE_RATE:
+                pruned.append(p)
+
+    best = max((s.unique_per_s for p, s in observed.items() if p not in pruned), default=0.0)
+
+    placed: Dict[int, List[str]] = {1: [], 2: [], 3: []}
+    for tier in tiers:
+        for p in tier:
+            if p in pruned:
+                continue
+            snap = observed.get(p)
+            if snap is None or best <= 0:
+                placed[_tier_of(p)].append(p)
+            elif snap.unique_per_s >= PLANNER_TIER1_RATIO * best:
+                placed[1].append(p)
+            elif snap.unique_per_s >= PLANNER_TIER2_RATIO * best:
+                placed[2].append(p)
+            else:
+                placed[3].append(p)
+
+    def rank(p: str) -> Tuple[int, float]:
+        snap = observed.get(p)
+        return (0, 0.0) if snap is None else (1, -snap.unique_per_s)
+
+    out_tiers: List[List[str]] = []
+    tier_nums: List[int] = []
+    for num in (1, 2, 3):
+        if placed[num]:
+            out_tiers.append(sorted(placed[num], key=rank))
+            tier_nums.append(num)
+
+    return out_tiers, tier_nums, pruned
+
+
 class JobSearchEngine:
     def __init__(
         self,
         provider_order: Optional[List[str]] = None,
         limiter: Optional[RateLimiter] = None,
         cache_ttl_s: float = 3600.0,
+        stats: Optional[ProviderStats] = None,
+        store: Optional[JobStore] = None,
+        breakers: Optional[CircuitBreakerRegistry] = None,
+        cursors: Optional[SearchCursorStore] = None,
+        flights: Optional[SingleFlight] = None,
     ) -> None:
-        self.provider_order = provider_order or DEFAULT_PROVIDER_ORDER
+        self.provider_order = provider_order or default_provider_order()
         self.limiter = limiter or RateLimiter()
+        self.stats = stats or get_default_provider_stats()
+        self.store = store or get_default_store()
+        self.breakers = breakers or get_default_breakers()
+        self.cursors = cursors or get_default_cursor_store()
+        self.flights = flights or get_default_single_flight()
+        self._revalidating: Set[asyncio.Future] = set()
+        self._settling: Set[asyncio.Future] = set()
         self._cache = get_default_cache()
         self._cache.ttl_s = cache_ttl_s
 
+    def expected_latency(self, p_name: str, query_class: str) -> Optional[float]:
+        """Recorded p50 latency, or None when the provider has no samples yet."""
+        snap = self.stats.snapshot(p_name, query_class)
+        return snap.p50_s if snap.calls else None
+
+    def _fits_budget(self, p_name: str, query_class: str, left_s: float) -> bool:
+        """
+        Whether a provider is still worth starting with `left_s` of the budget
+        remaining.  Unobserved providers always start (the deadline cancels
+        them if they run long), otherwise they would never record stats.
+        """
+        if _get_provider(p_name).serves_locally():
+            return True
+        wait_s = self.limiter.expected_wait(key=f"provider:{p_name}")
+        if wait_s >= left_s:
+            return False
+        observed = self.expected_latency(p_name, query_class)
+        return observed is None or wait_s + observed <= left_s
+
     async def search(
         self,
         query: str,
@@ -187,6 +364,12 @@ class JobSearchEngine:
         providers: Optional[List[str]] = None,
         batch_size: int = 3,
         per_provider_limit: int = 40,
+        mode: Optional[str] = None,
+        deadline_s: Optional[float] = None,
+        filters: Optional[SearchFilters] = None,
+        priority: str = PRIORITY_INTERACTIVE,
+        cursor: Optional[str] = None,
+        refresh: bool = False,
     ) -> dict:
         """
         Tier-sequential provider search with caching.
@@ -198,46 +381,409 @@ class JobSearchEngine:
         - within each tier, run providers in batches (tier-aware concurrency)
         - stop when min_results reached or providers exhausted
         - cap final jobs to `limit`
+        - honour the `mode`/`deadline_s` time budget (see `search_iter`)
+
+        This is `search_iter` collected into a single payload, with jobs
+        ranked by BM25 relevance to `query` (ties keep arrival order).
+
+        Concurrent calls for the same search (cache fingerprint plus the
+        arguments that shape the result) share one run: the first caller
+        fans out to the providers, the others await its payload.
         """
+        if cursor:
+            fingerprint = f"cursor:{cursor}"
+        else:
+            fingerprint = self.fingerprint(query, where=where, providers=providers, filters=filters)
+        flight_key = f"{fingerprint}|{limit}|{min_results}|{batch_size}|{per_provider_limit}|{mode}|{deadline_s}|{refresh}"
+
+        payload = await self.flights.do(
+            flight_key,
+            lambda: self._collect(
+                query=query,
+                where=where,
+                limit=limit,
+                min_results=min_results,
+                providers=providers,
+                batch_size=batch_size,
+                per_provider_limit=per_provider_limit,
+                mode=mode,
+                deadline_s=deadline_s,
+                filters=filters,
+                priority=priority,
+                cursor=cursor,
+                refresh=refresh,
+            ),
+        )
+        # Callers that joined a flight share its payload; give each its own containers
+        return {**payload, "jobs": list(payload["jobs"])}
 
-        tiers = _build_provider_plan(
+    def fingerprint(
+        self,
+        query: str,
+        where: Optional[str] = None,
+        providers: Optional[List[str]] = None,
+        filters: Optional[SearchFilters] = None,
+    ) -> str:
+        """The JobCache key a search with these parameters reads and writes."""
+        canon, filters = _canonical_search(query, where, filters)
+        static_tiers = _build_provider_plan(
             base_order=self.provider_order,
-            query=query,
-            where=where,
+            query=canon.text,
+            where=canon.where,
             providers_override=providers,
         )
+        flat_order = [p for tier in static_tiers for p in tier]
+        return self._cache.key(query=canon.key, where=canon.location, providers=flat_order + filters.cache_tags())
 
-        flat_order = [p for tier in tiers for p in tier]
+    def _revalidate(self, fingerprint: str, **kwargs) -> None:
+        """Start (or join) the background search that rewrites a stale cache entry."""
+        task = asyncio.ensure_future(
+            self.flights.do(
+                f"revalidate:{fingerprint}",
+                lambda: self._collect(refresh=True, mode="exhaustive", priority=PRIORITY_BACKGROUND, **kwargs),
+            )
+        )
+        self._revalidating.add(task)
+        task.add_done_callback(self._revalidated)
 
-        cached = self._cache.get(query=query, where=where, providers=flat_order)
-        if cached is not None:
-            log.info("job_cache: returning cached result for query=%r where=%r", query, where)
-            return cached
+    def _revalidated(self, task: asyncio.Future) -> None:
+        self._revalidating.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            log.warning("job_cache: background revalidation failed: %s", task.exception())
 
-        all_jobs: List[JobItem] = []
-        results: List[ProviderResult] = []
+    async def _collect(self, query: str, **kwargs) -> dict:
+        summary: dict = {}
 
-        async def search_provider(p_name: str) -> ProviderResult:
-            await self.limiter.wait(key=f"provider:{p_name}")
-            provider = _get_provider(p_name)
-            return await with_retries(
-                lambda: provider.search(
+        async for event in self.search_iter(query=query, **kwargs):
+            if event["event"] == "summary":
+                summary = event
+
+        payload = {k: v for k, v in summary.items() if k not in {"event", "cached"}}
+        payload["jobs"] = rank_jobs(payload.get("query") or query, payload.get("jobs") or [])
+        return payload
+
+    async def search_iter(
+        self,
+        query: str,
+        where: Optional[str] = None,
+        limit: int = 60,
+        min_results: int = 25,
+        providers: Optional[List[str]] = None,
+        batch_size: int = 3,
+        per_provider_limit: int = 40,
+        mode: Optional[str] = None,
+        deadline_s: Optional[float] = None,
+        filters: Optional[SearchFilters] = None,
+        priority: str = PRIORITY_INTERACTIVE,
+        cursor: Optional[str] = None,
+        refresh: bool = False,
+    ) -> AsyncIterator[dict]:
+        """
+        Streaming variant of `search`.
+
+        Yields one event per provider as soon as its result lands:
+            {"event": "jobs", "provider": ..., "tier": ..., "jobs": [...], "error": ..., "count": ...}
+        where `jobs` only holds jobs not already emitted (streaming providers,
+        see `ProviderCapabilities.streaming`, also get one event per chunk
+        while they run), then a final
+            {"event": "summary", "providers_used": ..., "provider_errors": ..., "count": ..., "jobs": [...], ...}
+
+        Near-duplicates of an emitted job (same posting from another provider)
+        are not emitted again; the summary's `jobs` holds the final list with
+        each duplicate cluster collapsed into its richest record.
+
+        Providers are planned by `_adapt_plan` from recorded statistics; each
+        call's latency, errors and unique contribution are recorded back
+        (jobs that only made the cursor backlog count as unique; calls still
+        running when the page fills up finish in the background and record).
+
+        Time budget (`mode` = fast | balanced | exhaustive, or an explicit
+        `deadline_s`):
+        - a batch running longer than its tier's share of the budget lets the
+          next batch start early
+        - providers whose expected latency no longer fits are skipped
+        - when the budget expires, in-flight providers are cancelled and the
+          summary is marked `partial` (partial results are not cached)
+
+        Results short of `min_results` are topped up from the JobStore
+        (emitted as provider "store").
+
+        `filters` (location defaults to `where`) are split per provider by its
+        declared capabilities: supported predicates go to the API, the rest
+        are applied to its results locally in one pass.
+
+        `priority` ("interactive" | "background") orders this search's
+        provider calls against others queued on the same rate limit.
+
+        Paging: the summary carries `next_cursor` (None once every provider
+        is exhausted).  Passing it back as `cursor` continues the same search
+        (query, where, filters and plan come from the cursor; other arguments
+        apply to the new page): paging providers resume from their page
+        token, the others skip what they already returned, jobs fetched but
+        cut off by `limit` come first, and nothing already returned is
+        returned again.  Cursor pages bypass the result cache.  An unknown or
+        expired cursor raises ValueError.
+
+        `query` and `where` are canonicalized first (utils/query_canon):
+        remote intent in either field becomes `filters.remote_only`, cache,
+        coalescing and planner keys use the canonical form, and providers are
+        asked the caller's own wording (case-folded, intent words removed).
+
+        Caching: a fresh entry is returned as is; an entry past the cache's
+        soft TTL is returned at once with `stale: True` in the summary while
+        one background search (background priority, no time budget)
+        rewrites it.  `refresh=True` skips the cache read.
+
+        Below the payload cache, each provider's raw result is cached per
+        (provider, query, the filters pushed to it).  A search whose payload
+        misses still takes every provider with a fresh entry from there (no
+        rate limit, no breaker, no stats sample) and only calls the rest;
+        they are listed in `providers_cached`.
+        """
+        mode, budget_s = _resolve_deadline(mode, deadline_s)
+        state: Optional[Dict[str, Any]] = None
+        if cursor:
+            state = self.cursors.load(cursor)
+            if state is None:
+                raise ValueError("Unknown or expired cursor")
+            query, where = state["query"], state["where"]
+            filters = SearchFilters(**state["filters"])
+            per_provider_limit = state["per_provider_limit"]
+        canon, filters = _canonical_search(query, where, filters)
+        query, where = canon.search_query, canon.search_location
+
+        query_class = _query_class(canon.text, canon.where)
+        static_tiers = _build_provider_plan(
+            base_order=self.provider_order,
+            query=canon.text,
+            where=canon.where,
+            providers_override=providers,
+        )
+        if state is None:
+            tiers, tier_nums, pruned = _adapt_plan(
+                static_tiers,
+                query_class,
+                self.stats,
+                forced=bool(providers),
+            )
+            provider_state = {p: _fresh_page_state() for tier in tiers for p in tier}
+        else:
+            # Continue the first page's plan with the providers that have more
+            provider_state = state["providers"]
+            tiers, tier_nums = [], []
+            for tier_num, tier in zip(state["tier_nums"], state["tiers"]):
+                tier = [p for p in tier if not provider_state[p]["done"]]
+                if tier:
+                    tiers.append(tier)
+                    tier_nums.append(tier_num)
+            pruned = []
+
+        # Cache key stays on the static plan so pruning does not fragment it
+        flat_order = [p for tier in static_tiers for p in tier]
+        cache_providers = flat_order + filters.cache_tags()
+
+        hit = None if state or refresh else self._cache.lookup(query=canon.key, where=canon.location, providers=cache_providers)
+        if hit is not None:
+            cached = hit.data
+            if cached.get("next_cursor") and not self.cursors.alive(cached["next_cursor"]):
+                # The snapshot expired before the page did (SEARCH_CURSOR_TTL_S
+                # below the cache hard TTL): offer no next page, not a dead cursor
+                cached = {**cached, "next_cursor": None}
+            log.info(
+                "job_cache: returning %s cached result for query=%r where=%r",
+                "stale" if hit.stale else "fresh",
+                query,
+                where,
+            )
+            if hit.stale:
+                self._revalidate(
+                    self._cache.key(query=canon.key, where=canon.location, providers=cache_providers),
                     query=query,
                     where=where,
-                    limit=per_provider_limit,
-                ),
-                tries=3,
-                base_delay_s=2,
-                max_delay_s=20,
+                    limit=limit,
+                    min_results=min_results,
+                    providers=providers,
+                    batch_size=batch_size,
+                    per_provider_limit=per_provider_limit,
+                    filters=filters,
+                )
+            cached_jobs = cached.get("jobs") or []
+            yield {
+                "event": "jobs",
+                "provider": "cache",
+                "tier": 0,
+                "jobs": cached_jobs,
+                "error": None,
+                "count": len(cached_jobs),
+            }
+            yield {
+                "event": "summary",
+                **cached,
+                "cached": True,
+                "stale": hit.stale,
+                "cache_age_s": round(hit.age_s, 1),
+            }
+            return
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + budget_s if budget_s is not None else None
+
+        def remaining_s() -> Optional[float]:
+            return None if deadline is None else deadline - loop.time()
+
+        all_jobs: List[JobRecord] = []
+        seen: Set[str] = set(state["seen"]) if state else set()
+        near_dupes = NearDuplicateIndex()
+        clusters: Dict[int, List[JobRecord]] = {}
+        # Jobs returned on earlier pages only serve as dedupe references
+        previous: List[List[str]] = state["near"] if state else []
+        for i, (title, company, location, country) in enumerate(previous):
+            ref = SimpleNamespace(title=title, company=company, location=location, country=country)
+            near_dupes.add(("previous", i), ref)
+        carried = [JobRecord(**job) for job in state["backlog"]] if state else []
+        backlog: List[JobRecord] = []
+        results: List[ProviderResult] = []
+        skipped: List[str] = []
+        partial = False
+
+        filter_plan: Dict[str, Dict[str, List[str]]] = {}
+
+        cached_providers: Set[str] = set()
+
+        def provider_request(p_name: str) -> Tuple[JobProvider, SearchFilters, SearchFilters, Dict[str, Any]]:
+            provider = _get_provider(p_name)
+            pushed, residual = split_filters(provider.capabilities, filters)
+            page = provider_state[p_name]
+            # Paging providers resume from their token; the rest are asked for
+            # everything up to the next slice, and the part already seen is dropped
+            kwargs: Dict[str, Any] = {"limit": per_provider_limit + page["offset"]}
+            if provider.capabilities.paging:
+                kwargs = {"limit": per_provider_limit, "page_token": page["token"]}
+            return provider, pushed, residual, kwargs
+
+        def provider_cache_tags(p_name: str, pushed: SearchFilters) -> List[str]:
+            return [f"provider:{p_name}", *pushed.cache_tags()]
+
+        def provider_cache_where(pushed: SearchFilters) -> Optional[str]:
+            """Canonical location for a per-provider key, when the location was pushed at all."""
+            return canon.location if pushed.location else None
+
+        def cached_result(p_name: str) -> Optional[ProviderResult]:
+            """A fresh per-provider entry that covers this request, if any."""
+            provider, pushed, _residual, kwargs = provider_request(p_name)
+            if refresh or provider.serves_locally() or kwargs.get("page_token"):
+                return None
+            entry = self._cache.get(
+                query=canon.key, where=provider_cache_where(pushed), providers=provider_cache_tags(p_name, pushed)
             )
+            if entry is None:
+                return None
+            jobs, entry_limit, next_page = entry["jobs"], entry["limit"], entry.get("next_page")
+            exhausted = len(jobs) < entry_limit if not provider.capabilities.paging else next_page is None
+            if provider.capabilities.paging:
+                # A page token only continues the exact slice it was issued for
+                usable = entry_limit == kwargs["limit"] or (exhausted and len(jobs) <= kwargs["limit"])
+            else:
+                usable = entry_limit >= kwargs["limit"] or exhausted
+            if not usable:
+                return None
+            return ProviderResult(provider=p_name, jobs=list(jobs[: kwargs["limit"]]), next_page=next_page)
 
-        # Tier-by-tier execution
-        for tier in tiers:
-            if len(all_jobs) >= min_results:
-                break
+        # Chunks from streaming providers, admitted by the main loop as they land
+        chunks: "asyncio.Queue[Tuple[str, List[JobRecord]]]" = asyncio.Queue()
+        streamed: Set[str] = set()
+        streamed_unique: Dict[str, int] = {}
 
-            # Tier-aware concurrency
-            tier_num = _tier_of(tier[0]) if tier else 3
+        async def stream_provider(
+            p_name: str, provider: JobProvider, pushed: SearchFilters, residual: SearchFilters, kwargs: Dict[str, Any]
+        ) -> ProviderResult:
+            """Forward each chunk to the page as it lands; returns the call's whole result."""
+            streamed.add(p_name)
+            jobs: List[JobRecord] = []
+            last = ProviderResult(provider=p_name, jobs=[])
+            async with aclosing(provider.stream(query=query, where=pushed.location, filters=pushed, **kwargs)) as parts:
+                async for last in parts:
+                    if last.jobs:
+                        jobs.extend(last.jobs)
+                        chunk = apply_filters(last.jobs, residual) if residual.active() else last.jobs
+                        chunks.put_nowait((p_name, chunk))
+            return ProviderResult(provider=p_name, jobs=jobs, error=last.error, next_page=last.next_page)
+
+        async def search_provider(
+            p_name: str, cached: Optional[ProviderResult] = None
+        ) -> Tuple[ProviderResult, float, Dict[str, Any]]:
+            t0 = loop.time()
+            provider, pushed, residual, kwargs = provider_request(p_name)
+            if filters.active():
+                filter_plan[p_name] = {"pushed": sorted(pushed.active()), "local": sorted(residual.active())}
+            breaker = self.breakers.get(p_name)
+            page = provider_state[p_name]
+            if cached is not None:
+                result = cached
+            else:
+                try:
+                    # Mirrored feeds are answered from memory: no network, no rate limit
+                    if not provider.serves_locally():
+                        await self.limiter.wait(key=f"provider:{p_name}", priority=priority)
+                    if provider.capabilities.streaming and not page["offset"]:
+                        # Chunks already on the page cannot be taken back, so no retries
+                        result = await stream_provider(p_name, provider, pushed, residual, kwargs)
+                    else:
+                        result = await with_retries(
+                            lambda: provider.search(
+                                query=query,
+                                where=pushed.location,
+                                filters=pushed,
+                                **kwargs,
+                            ),
+                            # A half-open probe gets a single attempt
+                            tries=1 if breaker.state == HALF_OPEN else 3,
+                            base_delay_s=2,
+                            max_delay_s=20,
+                            deadline=None if deadline is None else time.monotonic() + (deadline - loop.time()),
+                        )
+                except asyncio.CancelledError:
+                    # Also covers a cancel while queued on the limiter: a
+                    # half-open probe must not stay marked in flight
+                    breaker.release()
+                    raise
+                except Exception as exc:
+                    log.warning("provider %s failed: %s", p_name, exc)
+                    result = ProviderResult(provider=p_name, jobs=[], error=str(exc))
+                if result.error:
+                    breaker.record_failure(result.error)
+                else:
+                    breaker.record_success()
+                    if not provider.serves_locally() and not kwargs.get("page_token"):
+                        self._cache.set(
+                            query=canon.key,
+                            where=provider_cache_where(pushed),
+                            providers=provider_cache_tags(p_name, pushed),
+                            data={"jobs": result.jobs, "limit": kwargs["limit"], "next_page": result.next_page},
+                        )
+
+            # A failed call leaves the provider where it was for the next page
+            next_state = page
+            if provider.capabilities.paging:
+                if not result.error:
+                    next_state = {**page, "token": result.next_page, "done": result.next_page is None}
+            else:
+                result.jobs = result.jobs[page["offset"]:]
+                if not result.error:
+                    next_state = {
+                        **page,
+                        "offset": page["offset"] + len(result.jobs),
+                        "done": len(result.jobs) < per_provider_limit,
+                    }
+
+            if result.jobs and residual.active():
+                result.jobs = apply_filters(result.jobs, residual)
+            return result, loop.time() - t0, next_state
+
+        # Batches in plan order with tier-aware concurrency
+        pending: Deque[Tuple[int, List[str], float]] = deque()
+        for tier_num, tier in zip(tier_nums, tiers):
             tier_batch_size = batch_size
 
             # Tier 1 can run larger concurrent batches
@@ -248,30 +794,294 @@ class JobSearchEngine:
             else:
                 tier_batch_size = 1  # Tier 3 tends to be noisier, keep it sequential
 
-            idx = 0
-            while idx < len(tier) and len(all_jobs) < min_results:
-                batch = tier[idx: idx + tier_batch_size]
-                idx += tier_batch_size
+            batches = [tier[i: i + tier_batch_size] for i in range(0, len(tier), tier_batch_size)]
+            share_s = (budget_s or 0.0) * TIER_BUDGET_SHARE.get(tier_num, 0.2) / max(1, len(batches))
+            for batch in batches:
+                pending.append((tier_num, batch, share_s))
+
+        running: Dict[asyncio.Task, Tuple[str, int, float]] = {}
+        early_start_at: Optional[float] = None
+
+        def launch_next_batch() -> None:
+            nonlocal early_start_at
+            tier_num, batch, share_s = pending.popleft()
+            for p_name in batch:
+                cached = cached_result(p_name)
+                if cached is not None:
+                    cached_providers.add(p_name)
+                    running[asyncio.create_task(search_provider(p_name, cached))] = (p_name, tier_num, loop.time())
+                    continue
+                left = remaining_s()
+                if left is not None and not self._fits_budget(p_name, query_class, left):
+                    log.info("job_search: skipping %s (does not fit the %.1fs left)", p_name, left)
+                    skipped.append(p_name)
+                    continue
+                if not self.breakers.get(p_name).allow():
+                    log.info("job_search: skipping %s (circuit open)", p_name)
+                    results.append(ProviderResult(provider=p_name, jobs=[], error="circuit_open"))
+                    continue
+                running[asyncio.create_task(search_provider(p_name))] = (p_name, tier_num, loop.time())
+            early_start_at = loop.time() + share_s if deadline is not None else None
+
+        def enough() -> bool:
+            return len(all_jobs) >= min_results or len(all_jobs) >= limit
+
+        backlog_keys: Set[str] = set()
+
+        def backlogged_unique(jobs: List[JobRecord]) -> int:
+            """How many of these backlogged jobs are new to this search (page or backlog)."""
+            unique = 0
+            for job in jobs:
+                key = job_key(job)
+                if key in seen or key in backlog_keys:
+                    continue
+                backlog_keys.add(key)
+                if near_dupes.find(job) is None:
+                    unique += 1
+            return unique
+
+        def admit(jobs: List[JobRecord]) -> Tuple[List[JobRecord], int]:
+            """
+            Dedupe `jobs` into the page; whatever does not fit goes to the
+            backlog.  Returns the admitted jobs and how many were unique,
+            backlogged ones included, so a provider that answers after the
+            page filled up is not scored as if it added nothing.
+            """
+            fresh: List[JobRecord] = []
+            unique = 0
+            for n, job in enumerate(jobs):
+                if len(all_jobs) >= limit:
+                    backlog.extend(jobs[n:])
+                    unique += backlogged_unique(jobs[n:])
+                    break
+                key = job_key(job)
+                if key in seen:
+                    continue
+                seen.add(key)
+                root = near_dupes.add(len(all_jobs), job)
+                if root is not None:
+                    if isinstance(root, int):
+                        clusters.setdefault(root, []).append(job)
+                    continue
+                all_jobs.append(job)
+                fresh.append(job)
+                unique += 1
+            return fresh, unique
+
+        async def settle(task: asyncio.Task, p_name: str) -> None:
+            try:
+                result, elapsed_s, _next_state = await task
+            except asyncio.CancelledError:
+                return
+            except Exception as exc:
+                log.warning("provider %s failed after the page filled up: %s", p_name, exc)
+                return
+            if p_name in cached_providers:
+                return
+            if result.jobs:
+                await self.store.aupsert_many(result.jobs)
+            self.stats.record(
+                result.provider,
+                query_class,
+                elapsed_s,
+                returned=len(result.jobs),
+                unique=streamed_unique.pop(p_name, 0) + backlogged_unique(result.jobs),
+                error=bool(result.error),
+            )
 
-                batch_results = await asyncio.gather(
-                    *[search_provider(p) for p in batch],
-                    return_exceptions=True,
+        def settle_late(tasks: Dict[asyncio.Task, Tuple[str, int, float]]) -> None:
+            """
+            Let calls still in flight when the page fills up finish in the
+            background, so their jobs reach the store and the provider cache
+            and the planner gets a sample for every provider it started.
+            """
+            for task, (p_name, _tier, _launched_at) in tasks.items():
+                settling = asyncio.ensure_future(settle(task, p_name))
+                self._settling.add(settling)
+                settling.add_done_callback(self._settling.discard)
+
+        if carried:
+            fresh, _unique = admit(carried)
+            if fresh:
+                results.append(ProviderResult(provider="cursor", jobs=fresh))
+                yield {
+                    "event": "jobs",
+                    "provider": "cursor",
+                    "tier": 0,
+                    "jobs": fresh,
+                    "error": None,
+                    "count": len(all_jobs),
+                }
+
+        chunk_wait: Optional[asyncio.Future] = None
+
+        def take_chunks() -> List[Tuple[str, List[JobRecord]]]:
+            nonlocal chunk_wait
+            taken = []
+            if chunk_wait is not None and chunk_wait.done():
+                taken.append(chunk_wait.result())
+                chunk_wait = None
+            while not chunks.empty():
+                taken.append(chunks.get_nowait())
+            return taken
+
+        try:
+            while True:
+                if not running:
+                    if enough() or not pending:
+                        break
+                    launch_next_batch()
+                    continue
+
+                # Wake up on the first result or chunk, the early-start point or the deadline
+                wake_points = [t for t in (early_start_at if pending else None, deadline) if t is not None]
+                timeout = max(0.0, min(wake_points) - loop.time()) if wake_points else None
+                if chunk_wait is None:
+                    chunk_wait = asyncio.ensure_future(chunks.get())
+                done, _ = await asyncio.wait(
+                    {*running, chunk_wait}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
                 )
+                woke_for_chunk = chunk_wait in done
+                done.discard(chunk_wait)
+
+                # Chunks first: a finished streaming task's chunks are all queued by now
+                tier_of = {p: t for p, t, _launched_at in running.values()}
+                for p_name, jobs in take_chunks():
+                    fresh, unique = admit(jobs)
+                    streamed_unique[p_name] = streamed_unique.get(p_name, 0) + unique
+                    if fresh:
+                        yield {
+                            "event": "jobs",
+                            "provider": p_name,
+                            "tier": tier_of.get(p_name, 0),
+                            "jobs": fresh,
+                            "error": None,
+                            "count": len(all_jobs),
+                        }
 
-                for p_name, result in zip(batch, batch_results):
-                    if isinstance(result, Exception):
-                        log.warning("provider %s failed: %s", p_name, result)
-                        results.append(ProviderResult(provider=p_name, jobs=[], error=str(result)))
-                        continue
+                if not done and not woke_for_chunk:
+                    left = remaining_s()
+                    if left is not None and left <= 0:
+                        partial = True
+                        for task, (p_name, _tier, launched_at) in running.items():
+                            task.cancel()
+                            results.append(ProviderResult(provider=p_name, jobs=[], error="deadline_exceeded"))
+                            self.stats.record(
+                                p_name,
+                                query_class,
+                                loop.time() - launched_at,
+                                unique=streamed_unique.pop(p_name, 0),
+                                error=True,
+                            )
+                        running.clear()
+                        break
+                    if pending and not enough():
+                        # Current batch overran its share of the budget: overlap the next one
+                        launch_next_batch()
+                    else:
+                        early_start_at = None
+                    continue
 
+                for task in done:
+                    p_name, tier_num, _launched_at = running.pop(task)
+                    result, elapsed_s, provider_state[p_name] = task.result()
                     results.append(result)
-                    all_jobs.extend(result.jobs)
+                    from_cache = p_name in cached_providers
+                    if result.jobs and not from_cache:
+                        await self.store.aupsert_many(result.jobs)
+
+                    if p_name in streamed:
+                        # Its jobs reached the page chunk by chunk
+                        fresh, unique = [], streamed_unique.pop(p_name, 0)
+                    else:
+                        fresh, unique = admit(result.jobs)
+
+                    # Cache hits say nothing about the provider's latency or health
+                    if not from_cache:
+                        self.stats.record(
+                            result.provider,
+                            query_class,
+                            elapsed_s,
+                            returned=len(result.jobs),
+                            unique=unique,
+                            error=bool(result.error),
+                        )
 
-                all_jobs = dedupe_jobs(all_jobs)
+                    yield {
+                        "event": "jobs",
+                        "provider": result.provider,
+                        "tier": tier_num,
+                        "jobs": fresh,
+                        "error": result.error,
+                        "count": len(all_jobs),
+                    }
 
                 if len(all_jobs) >= limit:
-                    all_jobs = all_jobs[:limit]
+                    settle_late(running)
+                    running.clear()
                     break
+        finally:
+            for task in running:
+                task.cancel()
+            if chunk_wait is not None:
+                chunk_wait.cancel()
+
+        # Providers never reached because the budget ran out also count as partial
+        if deadline is not None and pending and not enough():
+            partial = True
+            for _tier_num, batch, _share_s in pending:
+                skipped.extend(batch)
+        if skipped and not enough():
+            partial = True
+
+        # Top up from jobs previously seen by any provider
+        if len(all_jobs) < min_results:
+            fresh = []
+            stored = await self.store.asearch(
+                query,
+                k=min(limit, min_results) - len(all_jobs) + len(seen),
+                seen_within_s=STORE_TOPUP_MAX_AGE_S,
+            )
+            for job in apply_filters(stored, filters):
+                if len(all_jobs) >= min(limit, min_results):
+                    break
+                key = job_key(job)
+                if key in seen:
+                    continue
+                seen.add(key)
+                if near_dupes.add(len(all_jobs), job) is not None:
+                    continue
+                all_jobs.append(job)
+                fresh.append(job)
+            if fresh:
+                results.append(ProviderResult(provider="store", jobs=fresh))
+                yield {
+                    "event": "jobs",
+                    "provider": "store",
+                    "tier": 0,
+                    "jobs": fresh,
+                    "error": None,
+                    "count": len(all_jobs),
+                }
+
+        for root, dupes in clusters.items():
+            all_jobs[root] = merge_cluster([all_jobs[root], *dupes])
+
+        next_cursor = None
+        if backlog or any(not page["done"] for page in provider_state.values()):
+            next_cursor = self.cursors.create({
+                "query": query,
+                "where": where,
+                "filters": asdict(filters),
+                "per_provider_limit": per_provider_limit,
+                "page": (state["page"] if state else 1) + 1,
+                "tiers": state["tiers"] if state else tiers,
+                "tier_nums": state["tier_nums"] if state else tier_nums,
+                "providers": provider_state,
+                "seen": sorted(seen),
+                "near": previous + [[j.title, j.company, j.location, j.country] for j in all_jobs],
+                "backlog": [job.to_dict() for job in backlog],
+            })
 
         payload = {
             "query": query,
@@ -279,18 +1089,38 @@ class JobSearchEngine:
             "providers_plan": tiers,
             "providers_used": [r.provider for r in results if r.jobs],
             "provider_errors": {r.provider: r.error for r in results if r.error},
+            "providers_skipped": skipped,
+            "providers_pruned": pruned,
+            "providers_cached": sorted(cached_providers),
+            "filter_plan": filter_plan,
+            "query_class": query_class,
+            "mode": mode,
+            "deadline_s": budget_s,
+            "partial": partial,
+            "near_duplicates": sum(len(d) for d in clusters.values()),
+            "elapsed_s": round(loop.time() - started, 3),
             "count": len(all_jobs),
+            "page": state["page"] if state else 1,
+            "next_cursor": next_cursor,
             "jobs": all_jobs,
         }
 
-        self._cache.set(query=query, where=where, providers=flat_order, data=payload)
+        if not partial and state is None:
+            self._cache.set(query=canon.key, where=canon.location, providers=cache_providers, data=payload)
 
         log.info(
-            "job_search: fetched %d jobs from %s for query=%r where=%r",
+            "job_search: fetched %d jobs from %s for query=%r where=%r (mode=%s, %.2fs%s)",
             len(all_jobs),
             payload["providers_used"],
             query,
             where,
+            mode,
+            payload["elapsed_s"],
+            ", partial" if partial else "",
         )
 
-        return payload
\ No newline at end of file
+        yield {
+            "event": "summary",
+            "cached": False,
+            **payload,
+        }
@@ -6,6 +6,7 @@ from services.automation.automation_worker import AutomationWorker
 from services.core.config import settings
 from services.engines.cv_engine import CVEngine
 from services.engines.job_search_engine import JobSearchEngine
+from services.utils.rate_limiter import PRIORITY_BACKGROUND
 
 logger = logging.getLogger(__name__)
 SIMILARITY_THRESHOLD = 0.6
@@ -26,6 +27,8 @@ async def run_automation_pipeline(query: str = "python developer", limit: int =
         where="remote",
         limit=limit * 3,
         min_results=limit,
+        mode="exhaustive",
+        priority=PRIORITY_BACKGROUND,
     )
 
     jobs = search_results.get("jobs", [])
@@ -50,7 +53,7 @@ async def run_automation_pipeline(query: str = "python developer", limit: int =
     worker = AutomationWorker()
 
     for job in top_jobs:
-        job_dict = job.model_dump() if hasattr(job, "model_dump") else job.dict() if hasattr(job, "dict") else dict(job)
+        job_dict = job.to_dict() if hasattr(job, "to_dict") else job.model_dump() if hasattr(job, "model_dump") else dict(job)
         await worker.process_job(job_dict, applicant)
         await asyncio.sleep(random.randint(10, 30))
 
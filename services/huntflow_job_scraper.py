@@ -38,6 +38,11 @@ from urllib.robotparser import RobotFileParser
 import httpx
 from bs4 import BeautifulSoup
 
+try:
+    from services.utils.job_store import get_default_store
+except ImportError:  # running as a standalone script outside the package
+    get_default_store = None
+
 
 DEFAULT_UA = "HuntFlowBot/1.0 (+https://example.com/bot; contact: you@example.com)"
 
@@ -313,6 +318,17 @@ def write_csv(path: str, rows: List[JobItem]) -> None:
             w.writerow(asdict(r))
 
 
+def save_to_store(rows: List[JobItem]) -> None:
+    """Upsert scraped rows into the shared job store when it is available."""
+    if get_default_store is None:
+        return
+    try:
+        written = get_default_store().upsert_many(r for r in rows if r.title)
+        print(f"Upserted {written} rows into the job store")
+    except Exception as e:
+        print(f"Job store unavailable: {e}")
+
+
 def cmd_adzuna(args: argparse.Namespace) -> None:
     jobs = adzuna_search(
         query=args.query,
@@ -323,6 +339,8 @@ def cmd_adzuna(args: argparse.Namespace) -> None:
     )
     write_csv(args.out, jobs)
     print(f"Wrote {len(jobs)} rows to {args.out}")
+    if not args.no_store:
+        save_to_store(jobs)
 
 
 def cmd_urls(args: argparse.Namespace) -> None:
@@ -347,6 +365,8 @@ def cmd_urls(args: argparse.Namespace) -> None:
 
     write_csv(args.out, rows)
     print(f"Wrote {len(rows)} rows to {args.out}")
+    if not args.no_store:
+        save_to_store(rows)
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -360,6 +380,7 @@ def build_parser() -> argparse.ArgumentParser:
     p1.add_argument("--results-per-page", type=int, default=20)
     p1.add_argument("--sleep", type=float, default=0.3)
     p1.add_argument("--out", default="adzuna_jobs.csv")
+    p1.add_argument("--no-store", action="store_true", help="Do not upsert results into the job store")
     p1.set_defaults(fn=cmd_adzuna)
 
     p2 = sub.add_parser("urls", help="Extract apply links from a list of public URLs")
@@ -367,6 +388,7 @@ def build_parser() -> argparse.ArgumentParser:
     p2.add_argument("--out", default="extracted_jobs.csv")
     p2.add_argument("--sleep", type=float, default=0.5)
     p2.add_argument("--no-robots", action="store_true", help="Disable robots.txt checks (not recommended)")
+    p2.add_argument("--no-store", action="store_true", help="Do not upsert results into the job store")
     p2.set_defaults(fn=cmd_urls)
 
     return p
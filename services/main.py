@@ -1,4 +1,5 @@
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
@@ -10,6 +11,11 @@ from services.ai_service.main import app as ai_service_app
 from services.routes.career_coach import router as career_coach_router
 from services.routes.apply_routes import router as apply_router
 from services.routes.notify import router as notify_router
+from services.services.feed_mirror import get_feed_mirrors
+from services.utils.http_clients import get_default_registry
+from services.utils.job_store import get_default_store
+from services.utils.provider_stats import get_default_provider_stats
+from services.utils.search_cursors import get_default_cursor_store
 
 try:
     from services.routes.applications import router as applications_router
@@ -19,7 +25,28 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="HuntFlow API", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    http_clients = get_default_registry()
+    await http_clients.open()
+    feed_mirrors = get_feed_mirrors()
+    await feed_mirrors.start()
+    job_store = get_default_store()
+    await job_store.start_pruning()
+    cursors = get_default_cursor_store()
+    await cursors.start_pruning()
+    try:
+        yield
+    finally:
+        await cursors.stop_pruning()
+        await job_store.stop_pruning()
+        await feed_mirrors.stop()
+        get_default_provider_stats().flush()
+        await http_clients.aclose()
+
+
+app = FastAPI(title="HuntFlow API", version="0.1.0", lifespan=lifespan)
 
 ALLOWED_ORIGINS = [
     "http://localhost:5173",
@@ -6,6 +6,7 @@ from fastapi import APIRouter
 from pydantic import BaseModel, Field
 
 from services.engines.job_search_engine import JobSearchEngine
+from services.services.providers.base import SearchFilters
 
 # ----------------------------------------------------------------------
 # Router + engine
@@ -25,6 +26,24 @@ class MultiSourceSearchRequest(BaseModel):
     limit: int = Field(default=60, ge=5, le=200)
     min_results: int = Field(default=25, ge=1, le=200)
     providers: Optional[List[str]] = None  # if passed, forces these sources only
+    mode: Literal["fast", "balanced", "exhaustive"] = "balanced"
+    deadline_s: Optional[float] = Field(default=None, gt=0, le=120)
+    remote_only: bool = False
+    max_days_old: Optional[int] = Field(default=None, ge=1, le=365)
+    salary_min: Optional[int] = Field(default=None, ge=0)
+    salary_max: Optional[int] = Field(default=None, ge=0)
+    category: Optional[str] = None
+    cursor: Optional[str] = None  # `next_cursor` of the previous page; its query and filters win
+
+    def filters(self) -> SearchFilters:
+        return SearchFilters(
+            location=self.where,
+            remote_only=self.remote_only,
+            max_days_old=self.max_days_old,
+            salary_min=self.salary_min,
+            salary_max=self.salary_max,
+            category=self.category,
+        )
 
 
 @router.post("/search")
@@ -37,6 +56,10 @@ async def multi_source_search(payload: MultiSourceSearchRequest):
         providers=payload.providers,
         batch_size=2,
         per_provider_limit=40,
+        mode=payload.mode,
+        deadline_s=payload.deadline_s,
+        filters=payload.filters(),
+        cursor=payload.cursor,
     )
 
 
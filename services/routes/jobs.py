@@ -4,31 +4,58 @@ routes/jobs.py
 Changes:
   - /search checks the 1-hour job cache before hitting Adzuna
   - /multi-search uses JobSearchEngine with built-in ROI order + cache
+  - /multi-search/stream emits each provider's jobs as NDJSON or SSE as they land
   - /extract supports safe fallback per URL
   - cache admin endpoints added
+  - every job returned by /search and /extract is upserted into the JobStore
+  - /search fans out across countries and pages concurrently under a shared Adzuna rate budget
+  - near-duplicates are collapsed by the multi-provider engine; Adzuna-only /search keeps exact-key dedupe
+  - /providers/health exposes per-provider circuit breaker state
+  - /providers/queues exposes rate-limit queue depth and wait times
+  - /multi-search accepts the `next_cursor` of a previous page to fetch only the next slice
+  - concurrent identical /search cache misses share one Adzuna fan-out (single-flight)
+  - /search serves stale cache entries at once and refreshes them in the background
+  - /cache/stats reports memory and disk tier usage
+  - /search caches each country separately, so overlapping country lists reuse each other's results
+  - /search and /multi-search canonicalize query and location, so respellings share cache entries
+  - /providers/registry lists discovered providers with their import and init cost
+  - /search keeps JobRecords through fetch, dedupe and cache; JobItem models are built for the response only
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
+from dataclasses import asdict
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Set
 
 import httpx
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, field_validator, model_validator
 
 from services.core.config import settings
 from services.engines.job_search_engine import JobSearchEngine
+from services.services.providers.base import SearchFilters
+from services.services.providers.registry import get_default_provider_registry
 from services.services.adzuna_client import AdzunaClient
+from services.services.feed_mirror import get_feed_mirrors
 from services.services.job_url_extractor import extract_job
 from services.utils.job_cache import get_default_cache
+from services.utils.job_record import JobRecord
+from services.utils.job_store import get_default_store
+from services.utils.query_canon import CanonicalQuery, canonicalize
+from services.utils.single_flight import get_default_single_flight
 
 log = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 engine = JobSearchEngine()
 _cache = get_default_cache()
+_store = get_default_store()
+_flights = get_default_single_flight()
 
 
 class JobItem(BaseModel):
@@ -44,10 +71,7 @@ class JobItem(BaseModel):
 
     @property
     def stable_key(self) -> str:
-        url = (self.apply_url or self.job_url or "").strip().lower()
-        if url:
-            return url
-        return f"{self.title}|{self.company}|{self.location}".strip().lower()
+        return _stable_key(self)
 
 
 class JobSearchRequest(BaseModel):
@@ -89,6 +113,24 @@ class MultiSourceSearchRequest(BaseModel):
     providers: Optional[List[str]] = None
     batch_size: int = Field(default=3, ge=1, le=10)
     per_provider_limit: int = Field(default=40, ge=5, le=200)
+    mode: Literal["fast", "balanced", "exhaustive"] = "balanced"
+    deadline_s: Optional[float] = Field(default=None, gt=0, le=120)
+    remote_only: bool = False
+    max_days_old: Optional[int] = Field(default=None, ge=1, le=365)
+    salary_min: Optional[int] = Field(default=None, ge=0)
+    salary_max: Optional[int] = Field(default=None, ge=0)
+    category: Optional[str] = None
+    cursor: Optional[str] = None  # `next_cursor` of the previous page; its query and filters win
+
+    def filters(self) -> SearchFilters:
+        return SearchFilters(
+            location=self.where,
+            remote_only=self.remote_only,
+            max_days_old=self.max_days_old,
+            salary_min=self.salary_min,
+            salary_max=self.salary_max,
+            category=self.category,
+        )
 
 
 class JobSearchResponse(BaseModel):
@@ -96,6 +138,7 @@ class JobSearchResponse(BaseModel):
     countries: List[str]
     count: int
     cached: bool = False
+    stale: bool = False
     jobs: List[JobItem]
 
 
@@ -139,21 +182,26 @@ def expand_countries(tokens: List[str]) -> List[str]:
     return out
 
 
-def dedupe_jobs(jobs: List[JobItem], cap: Optional[int] = None) -> List[JobItem]:
+def _stable_key(job: Any) -> str:
+    """`JobItem.stable_key` for route models and pipeline JobRecords alike."""
+    url = (job.apply_url or job.job_url or "").strip().lower()
+    if url:
+        return url
+    return f"{job.title}|{job.company}|{job.location}".strip().lower()
+
+
+def dedupe_jobs(jobs: List[Any], cap: Optional[int] = None) -> List[Any]:
     seen: Set[str] = set()
-    out: List[JobItem] = []
+    out: List[Any] = []
 
     for job in jobs:
-        key = job.stable_key
+        key = _stable_key(job)
         if key in seen:
             continue
         seen.add(key)
         out.append(job)
 
-        if cap is not None and len(out) >= cap:
-            break
-
-    return out
+    return out if cap is None else out[:cap]
 
 
 def safe_job_fallback(url: str) -> JobItem:
@@ -174,6 +222,9 @@ def normalize_job_item(item: Any) -> JobItem:
     if isinstance(item, JobItem):
         return item
 
+    if isinstance(item, JobRecord):
+        return JobItem(**item.to_dict())
+
     if item is None:
         return JobItem()
 
@@ -203,93 +254,187 @@ def normalize_job_item(item: Any) -> JobItem:
     )
 
 
-@router.post("/search", response_model=JobSearchResponse)
-async def search_jobs(payload: JobSearchRequest) -> JobSearchResponse:
+async def _search_adzuna_country(
+    client: AdzunaClient,
+    country: str,
+    payload: JobSearchRequest,
+    cap: int,
+) -> List[JobRecord]:
     """
-    Adzuna-backed search with cache per request fingerprint.
-    """
-    countries = expand_countries(payload.countries)
-    if not countries:
-        raise HTTPException(status_code=400, detail="No valid countries provided")
+    Fetch one country's pages concurrently.
 
-    cache_key_providers = [f"adzuna:{c}" for c in sorted(countries)]
-    cached_data = _cache.get(
-        query=payload.query,
-        where=payload.where,
-        providers=cache_key_providers,
-    )
-
-    if cached_data is not None:
-        log.info("job_cache: /search HIT for query=%r where=%r", payload.query, payload.where)
-        jobs = [normalize_job_item(j) for j in cached_data.get("jobs", [])]
-        return JobSearchResponse(
+    Only as many pages as are needed to reach `cap` are in flight; a short
+    page marks the end of the results, and reaching `cap` cancels whatever is
+    still running.  Pages are reassembled in page order.
+    """
+    per_page = payload.results_per_page
+    last_page = payload.pages
+    next_page = 1
+    got = 0
+    pages: Dict[int, List[JobRecord]] = {}
+    running: Dict[asyncio.Task, int] = {}
+
+    async def fetch(page: int) -> List[Any]:
+        return await client.search(
+            country_code=country,
             query=payload.query,
-            countries=countries,
-            count=len(jobs),
-            cached=True,
-            jobs=jobs,
+            page=page,
+            results_per_page=per_page,
+            where=payload.where,
+            sort_by=payload.sort_by,
+            max_days_old=payload.max_days_old,
+            job_types=payload.job_types,
+            salary_min=payload.salary_min,
+            salary_max=payload.salary_max,
+            remote_only=payload.remote_only,
         )
 
-    client = AdzunaClient()
-    jobs: List[JobItem] = []
-    per_country_limit = settings.MAX_JOBS_PER_COUNTRY
+    try:
+        while got < cap:
+            wanted = max(1, -(-(cap - got) // per_page))
+            while next_page <= last_page and len(running) < wanted:
+                running[asyncio.create_task(fetch(next_page))] = next_page
+                next_page += 1
+            if not running:
+                break
 
-    for country in countries:
-        country_jobs: List[JobItem] = []
-
-        for page in range(1, payload.pages + 1):
-            try:
-                chunk = await client.search(
-                    country_code=country,
-                    query=payload.query,
-                    page=page,
-                    results_per_page=payload.results_per_page,
-                    where=payload.where,
-                    sort_by=payload.sort_by,
-                    max_days_old=payload.max_days_old,
-                    job_types=payload.job_types,
-                    salary_min=payload.salary_min,
-                    salary_max=payload.salary_max,
-                    remote_only=payload.remote_only,
-                )
-            except (httpx.HTTPStatusError, httpx.TimeoutException, Exception) as exc:
-                log.warning(
-                    "adzuna search failed for country=%s query=%r page=%d: %s",
-                    country,
-                    payload.query,
-                    page,
-                    exc,
-                )
-                continue
-
-            for item in chunk or []:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                page = running.pop(task)
                 try:
-                    country_jobs.append(normalize_job_item(item))
-                except Exception as exc:
-                    log.warning("job normalization failed: %s", exc)
+                    chunk = task.result() or []
+                except (httpx.HTTPStatusError, httpx.TimeoutException, Exception) as exc:
+                    log.warning(
+                        "adzuna search failed for country=%s query=%r page=%d: %s",
+                        country,
+                        payload.query,
+                        page,
+                        exc,
+                    )
                     continue
 
-            if len(country_jobs) >= per_country_limit:
-                break
+                items: List[JobRecord] = []
+                for item in chunk:
+                    try:
+                        items.append(JobRecord.from_any(item))
+                    except Exception as exc:
+                        log.warning("job normalization failed: %s", exc)
+                pages[page] = items
+                got += len(items)
+
+                # A short page is the last one; later pages would come back empty
+                if len(chunk) < per_page and page < last_page:
+                    last_page = page
+                    for other, other_page in list(running.items()):
+                        if other_page > last_page:
+                            other.cancel()
+                            running.pop(other)
+    finally:
+        for task in running:
+            task.cancel()
+
+    country_jobs = [job for page in sorted(pages) for job in pages[page]]
+    return dedupe_jobs(country_jobs, cap=cap)
 
-        jobs.extend(dedupe_jobs(country_jobs, cap=per_country_limit))
 
-    jobs = dedupe_jobs(jobs, cap=per_country_limit * len(countries))
+@router.post("/search", response_model=JobSearchResponse)
+async def search_jobs(payload: JobSearchRequest) -> JobSearchResponse:
+    """
+    Adzuna-backed search with one cache entry per country.
+
+    Each country's results are cached on their own, so a request for
+    ["eg", "ae"] reuses what an earlier ["eg"] or ["ae", "sa"] fetched and
+    only calls Adzuna for the countries it lacks.  Missing countries are
+    fetched concurrently (at most ADZUNA_MAX_CONCURRENCY Adzuna requests in
+    flight across all requests, paced by the shared Adzuna rate budget), and concurrent misses for the
+    same country share one fetch.  A country past the cache's soft TTL is
+    served immediately (`stale: true`) while one background fetch refreshes
+    it.  `cached` is true when no country had to be fetched.
+
+    Query and location are canonicalized first (utils/query_canon): cache
+    and coalescing keys use the word-order-insensitive form, remote intent
+    sets `remote_only`, and Adzuna is asked the caller's own wording.
+    """
+    countries = expand_countries(payload.countries)
+    if not countries:
+        raise HTTPException(status_code=400, detail="No valid countries provided")
 
-    _cache.set(
-        query=payload.query,
-        where=payload.where,
-        providers=cache_key_providers,
-        data={"jobs": [j.model_dump() for j in jobs]},
+    canon = canonicalize(payload.query, payload.where, remote_only=payload.remote_only)
+    request = payload.model_copy(update={"query": canon.search_query, "where": canon.search_location, "remote_only": canon.remote})
+    per_country: Dict[str, List[JobRecord]] = {}
+    missing: List[str] = []
+    stale = False
+    for country in countries:
+        hit = _cache.lookup(query=canon.key, where=canon.where, providers=[f"adzuna:{country}"])
+        if hit is None:
+            missing.append(country)
+            continue
+        if hit.stale:
+            stale = True
+            _revalidate(_country_key(canon, country), lambda c=country: _fetch_country(request, canon, c))
+        per_country[country] = [JobRecord.from_any(j) for j in hit.data.get("jobs", [])]
+
+    log.info(
+        "job_cache: /search query=%r where=%r – %d/%d countries cached%s",
+        payload.query,
+        payload.where,
+        len(countries) - len(missing),
+        len(countries),
+        " (some stale)" if stale else "",
     )
 
+    fetched = await asyncio.gather(
+        *[_flights.do(_country_key(canon, c), lambda c=c: _fetch_country(request, canon, c)) for c in missing]
+    )
+    per_country.update(zip(missing, fetched))
+
+    jobs = [job for country in countries for job in per_country[country]]
+    jobs = dedupe_jobs(jobs, cap=settings.MAX_JOBS_PER_COUNTRY * len(countries))
     return JobSearchResponse(
         query=payload.query,
         countries=countries,
         count=len(jobs),
-        cached=False,
-        jobs=jobs,
+        cached=not missing,
+        stale=stale,
+        jobs=[normalize_job_item(j) for j in jobs],
+    )
+
+
+_revalidating: Set[asyncio.Future] = set()
+
+
+def _country_key(canon: CanonicalQuery, country: str) -> str:
+    return _cache.key(query=canon.key, where=canon.where, providers=[f"adzuna:{country}"])
+
+
+def _revalidate(flight_key: str, fn) -> None:
+    """Refresh a stale /search entry in the background; joins a refresh already running."""
+    task = asyncio.ensure_future(_flights.do(flight_key, fn))
+    _revalidating.add(task)
+    task.add_done_callback(_revalidated)
+
+
+def _revalidated(task: asyncio.Future) -> None:
+    _revalidating.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        log.warning("job_cache: /search background refresh failed: %s", task.exception())
+
+
+async def _fetch_country(
+    payload: JobSearchRequest,
+    canon: CanonicalQuery,
+    country: str,
+) -> List[JobRecord]:
+    """Fetch one country from Adzuna, store its jobs and cache them under the country's key."""
+    jobs = await _search_adzuna_country(AdzunaClient(), country, payload, settings.MAX_JOBS_PER_COUNTRY)
+    await _store.aupsert_many(jobs)
+    _cache.set(
+        query=canon.key,
+        where=canon.where,
+        providers=[f"adzuna:{country}"],
+        data={"jobs": jobs},
     )
+    return jobs
 
 
 @router.post("/multi-search")
@@ -306,8 +451,14 @@ async def multi_source_search(payload: MultiSourceSearchRequest):
             providers=payload.providers,
             batch_size=payload.batch_size,
             per_provider_limit=payload.per_provider_limit,
+            mode=payload.mode,
+            deadline_s=payload.deadline_s,
+            filters=payload.filters(),
+            cursor=payload.cursor,
         )
         return result
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     except Exception as exc:
         raise HTTPException(
             status_code=500,
@@ -315,6 +466,54 @@ async def multi_source_search(payload: MultiSourceSearchRequest):
         ) from exc
 
 
+def _encode_stream_event(event: Dict[str, Any], fmt: str) -> str:
+    if event.get("event") == "summary":
+        event = {k: v for k, v in event.items() if k != "jobs"}
+    elif event.get("event") == "jobs":
+        event = {**event, "jobs": [normalize_job_item(j).model_dump(mode="json") for j in event["jobs"]]}
+    body = json.dumps(event, default=str)
+    if fmt == "sse":
+        return f"event: {event.get('event', 'message')}\ndata: {body}\n\n"
+    return f"{body}\n"
+
+
+@router.post("/multi-search/stream")
+async def multi_source_search_stream(
+    payload: MultiSourceSearchRequest,
+    format: Literal["ndjson", "sse"] = "ndjson",
+):
+    """
+    Streaming multi-provider search.
+
+    Emits one `jobs` event per provider as soon as its deduplicated jobs are
+    available (streaming providers such as Adzuna also emit one per page as it
+    lands), then a final `summary` event with providers_used/provider_errors.
+    """
+
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            async for event in engine.search_iter(
+                query=payload.query,
+                where=payload.where,
+                limit=payload.limit,
+                min_results=payload.min_results,
+                providers=payload.providers,
+                batch_size=payload.batch_size,
+                per_provider_limit=payload.per_provider_limit,
+                mode=payload.mode,
+                deadline_s=payload.deadline_s,
+                filters=payload.filters(),
+                cursor=payload.cursor,
+            ):
+                yield _encode_stream_event(event, format)
+        except Exception as exc:
+            log.warning("multi-search stream failed: %s", exc)
+            yield _encode_stream_event({"event": "error", "detail": f"Multi-source search failed: {exc}"}, format)
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(event_stream(), media_type=media_type)
+
+
 @router.post("/extract", response_model=JobExtractedResponse)
 async def extract_apply_links(payload: JobExtractRequest) -> JobExtractedResponse:
     out: List[JobItem] = []
@@ -326,10 +525,84 @@ async def extract_apply_links(payload: JobExtractRequest) -> JobExtractedRespons
         except Exception:
             out.append(safe_job_fallback(url))
 
+    # Extracted pages are distinct URLs the caller asked for: exact-key dedupe only
     out = dedupe_jobs(out, cap=200)
+    await _store.aupsert_many(j for j in out if j.title)
     return JobExtractedResponse(count=len(out), jobs=out)
 
 
+@router.get("/providers/stats")
+async def provider_stats():
+    """Recorded per-provider, per-query-class latency/yield statistics."""
+    return {
+        "stats": [
+            {
+                **asdict(snap),
+                "error_rate": round(snap.error_rate, 4),
+                "mean_unique": round(snap.mean_unique, 3),
+                "unique_per_s": round(snap.unique_per_s, 3),
+            }
+            for snap in engine.stats.all_snapshots()
+        ]
+    }
+
+
+@router.get("/providers/health")
+async def provider_health():
+    """Circuit breaker state per provider (closed / open / half_open)."""
+    return {"providers": engine.breakers.status()}
+
+
+@router.post("/providers/health/reset")
+async def reset_provider_health(provider: Optional[str] = None):
+    """Close one provider's breaker, or all of them."""
+    engine.breakers.reset(provider)
+    return {"ok": True, "providers": engine.breakers.status()}
+
+
+@router.get("/providers/queues")
+async def provider_queues():
+    """Rate-limit queue depth and recent wait times per key and priority class."""
+    return {"queues": engine.limiter.scheduler.stats()}
+
+
+@router.get("/providers/registry")
+async def provider_registry():
+    """Known providers, where each was discovered, and its import/init cost once loaded."""
+    return {"providers": get_default_provider_registry().stats()}
+
+
+@router.get("/local-search", response_model=JobSearchResponse)
+async def local_search(
+    q: str = Query(min_length=2),
+    k: int = Query(default=20, ge=1, le=200),
+    country: Optional[str] = None,
+    source: Optional[str] = None,
+) -> JobSearchResponse:
+    """BM25-ranked search over every job already in the local JobStore (no provider calls)."""
+    jobs = [normalize_job_item(j) for j in await _store.asearch(q, k=k, country=country, source=source)]
+    return JobSearchResponse(
+        query=q,
+        countries=[country] if country else [],
+        count=len(jobs),
+        cached=True,
+        jobs=jobs,
+    )
+
+
+@router.get("/feeds")
+async def feed_mirror_status():
+    """Freshness of the locally mirrored full-feed providers."""
+    return {"feeds": get_feed_mirrors().status()}
+
+
+@router.post("/feeds/refresh")
+async def refresh_feed_mirrors():
+    mirrors = get_feed_mirrors()
+    changed = await asyncio.gather(*[m.refresh(force=True) for m in mirrors.mirrors.values()])
+    return {"refreshed": dict(zip(mirrors.mirrors, changed)), "feeds": mirrors.status()}
+
+
 @router.delete("/cache")
 async def clear_job_cache():
     removed = _cache.clear_all()
@@ -339,4 +612,9 @@ async def clear_job_cache():
 @router.post("/cache/prune")
 async def prune_expired_cache():
     pruned = _cache.prune_expired()
-    return {"pruned": pruned}
\ No newline at end of file
+    return {"pruned": pruned}
+
+
+@router.get("/cache/stats")
+async def job_cache_stats():
+    return _cache.stats()
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import re
 
-import httpx
-
 from services.core.config import settings
-from services.responses.jobs import JobItem
+from services.utils.job_record import JobRecord
+from services.utils.http_clients import get_http_client
+from services.utils.rate_limiter import TokenBucket, get_token_bucket
+
 ADZUNA_BASE = "https://api.adzuna.com/v1/api/jobs"
 
 
@@ -20,6 +22,31 @@ def _to_01(x: bool) -> int:
     return 1 if x else 0
 
 
+def adzuna_rate_budget() -> TokenBucket:
+    """Shared request budget for every Adzuna API call in this process."""
+    return get_token_bucket(
+        "provider:adzuna",
+        rate_per_s=settings.ADZUNA_RATE_PER_MIN / 60.0,
+        burst=settings.ADZUNA_BURST,
+    )
+
+
+_concurrency: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+
+
+def adzuna_concurrency() -> asyncio.Semaphore:
+    """
+    Shared cap (ADZUNA_MAX_CONCURRENCY) on Adzuna requests in flight across
+    every caller in this process; one per event loop, since semaphores bind
+    to the loop they first wait on.
+    """
+    global _concurrency
+    loop = asyncio.get_running_loop()
+    if _concurrency is None or _concurrency[0] is not loop:
+        _concurrency = (loop, asyncio.Semaphore(max(1, settings.ADZUNA_MAX_CONCURRENCY)))
+    return _concurrency[1]
+
+
 @dataclass
 class AdzunaClient:
     timeout_s: int = settings.REQUEST_TIMEOUT_S
@@ -37,7 +64,7 @@ class AdzunaClient:
         salary_min: Optional[int] = None,
         salary_max: Optional[int] = None,
         remote_only: bool = False,
-    ) -> List[JobItem]:
+    ) -> List[JobRecord]:
         if not settings.ADZUNA_APP_ID or not settings.ADZUNA_APP_KEY:
             raise RuntimeError("Missing ADZUNA_APP_ID or ADZUNA_APP_KEY")
 
@@ -86,12 +113,14 @@ class AdzunaClient:
 
         headers = {"User-Agent": "HuntFlow/1.0", "Accept": "application/json"}
 
-        async with httpx.AsyncClient(timeout=self.timeout_s, headers=headers, follow_redirects=True) as client:
-            r = await client.get(url, params=params)
+        async with adzuna_concurrency():
+            await adzuna_rate_budget().acquire()
+            client = get_http_client(url)
+            r = await client.get(url, params=params, headers=headers, timeout=self.timeout_s)
             r.raise_for_status()
             data: Dict[str, Any] = r.json()
 
-        jobs: List[JobItem] = []
+        jobs: List[JobRecord] = []
         for item in (data.get("results") or []):
             title = (item.get("title") or "").strip()
             company = ""
@@ -107,7 +136,7 @@ class AdzunaClient:
             desc = _snip(item.get("description") or "")
 
             jobs.append(
-                JobItem(
+                JobRecord(
                     source="adzuna",
                     country=country_code,
                     title=title,
@@ -0,0 +1,302 @@
+"""
+services/feed_mirror.py
+
+Local mirrors of full-feed job providers (RemoteOK, Arbeitnow, Remotive).
+
+These providers return their whole feed on every request and we filter it
+locally.  Instead of downloading the feed per search, a background task
+refreshes each feed on a schedule with conditional requests
+(ETag / If-Modified-Since), keeps the parsed jobs in a BM25 index and
+answers provider searches from memory, best matches first.  A snapshot is written to disk so a
+restarted process (or the CLI runner) starts warm.  Decoding, indexing and
+snapshot writes run in a worker thread; only the swap into the live mirror
+happens on the event loop.
+
+Usage:
+    mirrors = get_feed_mirrors()
+    await mirrors.start()                  # app startup
+    mirror = mirrors.get("remoteok")
+    if mirror and mirror.ready:
+        jobs = mirror.query("python developer", limit=40)
+    await mirrors.stop()                   # app shutdown
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..core.config import settings
+from ..utils.job_record import JobRecord
+from ..utils.http_clients import get_http_client
+from ..utils.search_index import BM25Index, tokenize
+
+log = logging.getLogger(__name__)
+
+# ── Default config ────────────────────────────────────────────────────────────
+_DEFAULT_MIRROR_DIR = Path(os.getenv("FEED_MIRROR_DIR", "/tmp/huntflow_feed_mirror"))
+
+# Wait this long before retrying a feed whose last refresh failed
+_FAILURE_BACKOFF_S = 300.0
+
+
+@dataclass
+class FeedSpec:
+    """
+    How to fetch and parse one full feed.
+
+    `items` pulls the raw job dicts out of the decoded response, `to_job`
+    builds a JobRecord from one of them and `search_text` returns the text the
+    provider used to match queries against.
+    """
+
+    name: str
+    url: str
+    items: Callable[[Any], List[Dict[str, Any]]]
+    to_job: Callable[[Dict[str, Any]], JobRecord]
+    search_text: Callable[[Dict[str, Any]], str]
+    params: Dict[str, Any] = field(default_factory=dict)
+    headers: Dict[str, str] = field(default_factory=dict)
+    refresh_interval_s: float = 3600.0
+
+    @property
+    def max_age_s(self) -> float:
+        # Serve a snapshot for up to three missed refreshes before falling back
+        # to live requests.
+        return self.refresh_interval_s * 3
+
+
+class FeedMirror:
+    """
+    One mirrored feed: conditional refresh, BM25 index and disk snapshot.
+    """
+
+    def __init__(self, spec: FeedSpec, mirror_dir: Path = _DEFAULT_MIRROR_DIR) -> None:
+        self.spec = spec
+        self.path = Path(mirror_dir) / f"{spec.name}.json"
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.fetched_at: float = 0.0
+        self.last_error: Optional[str] = None
+        self._retry_at: float = 0.0
+        self._jobs: List[JobRecord] = []
+        self._texts: List[str] = []
+        self._index = BM25Index(field_weights={"text": 1.0})
+        self._lock = asyncio.Lock()
+        self._load()
+
+    # ── Public API ────────────────────────────────────────────────────────────
+
+    @property
+    def age_s(self) -> float:
+        return time.time() - self.fetched_at if self.fetched_at else float("inf")
+
+    @property
+    def ready(self) -> bool:
+        return bool(self._jobs) and self.age_s <= self.spec.max_age_s
+
+    @property
+    def due(self) -> bool:
+        return self.age_s >= self.spec.refresh_interval_s and time.time() >= self._retry_at
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def query(self, query: str, limit: int = 50) -> List[JobRecord]:
+        """
+        Jobs whose search text contains every query term, ranked by BM25.
+        A query without searchable terms returns the feed in order.
+        """
+        if not tokenize(query):
+            return self._jobs[:limit]
+        hits = self._index.search(query, k=limit, require_all=True)
+        return [self._jobs[i] for i, _score in hits]
+
+    async def refresh(self, force: bool = False) -> bool:
+        """
+        Conditionally re-download the feed.  Returns True if the content
+        changed.  Errors are recorded on the mirror, never raised.
+        """
+        async with self._lock:
+            if not force and not self.due:
+                return False
+
+            headers = {"Accept": "application/json", **self.spec.headers}
+            if self.etag:
+                headers["If-None-Match"] = self.etag
+            if self.last_modified:
+                headers["If-Modified-Since"] = self.last_modified
+
+            try:
+                client = get_http_client(self.spec.url)
+                r = await client.get(
+                    self.spec.url,
+                    params=self.spec.params or None,
+                    headers=headers,
+                    timeout=settings.REQUEST_TIMEOUT_S,
+                )
+                if r.status_code == 304:
+                    self.fetched_at = time.time()
+                    self.last_error = None
+                    await asyncio.to_thread(self._save)
+                    log.debug("feed_mirror: %s not modified", self.spec.name)
+                    return False
+                r.raise_for_status()
+                jobs, texts, index = await asyncio.to_thread(self._parse, r.content)
+            except Exception as exc:
+                self.last_error = str(exc)
+                self._retry_at = time.time() + min(_FAILURE_BACKOFF_S, self.spec.refresh_interval_s)
+                log.warning("feed_mirror: refresh of %s failed – %s", self.spec.name, exc)
+                return False
+
+            self.etag = r.headers.get("ETag")
+            self.last_modified = r.headers.get("Last-Modified")
+            self.fetched_at = time.time()
+            self.last_error = None
+            self._jobs, self._texts, self._index = jobs, texts, index
+            await asyncio.to_thread(self._save)
+            log.info("feed_mirror: %s refreshed (%d jobs)", self.spec.name, len(jobs))
+            return True
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "name": self.spec.name,
+            "jobs": len(self._jobs),
+            "ready": self.ready,
+            "age_s": None if not self.fetched_at else round(self.age_s, 1),
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "last_error": self.last_error,
+        }
+
+    # ── Internals ─────────────────────────────────────────────────────────────
+
+    def _parse(self, content: bytes) -> Tuple[List[JobRecord], List[str], BM25Index]:
+        """Decode a feed body into jobs, their search texts and an index over them (worker thread)."""
+        jobs: List[JobRecord] = []
+        texts: List[str] = []
+        for item in self.spec.items(json.loads(content)):
+            if not isinstance(item, dict):
+                continue
+            try:
+                jobs.append(self.spec.to_job(item))
+                texts.append(self.spec.search_text(item))
+            except Exception as exc:
+                log.debug("feed_mirror: skipping bad %s item – %s", self.spec.name, exc)
+        return jobs, texts, _build_index(texts)
+
+    def _replace(self, jobs: List[JobRecord], texts: List[str]) -> None:
+        self._jobs, self._texts, self._index = jobs, texts, _build_index(texts)
+
+    def _save(self) -> None:
+        envelope = {
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "fetched_at": self.fetched_at,
+            "jobs": [j.to_dict() for j in self._jobs],
+            "texts": self._texts,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+            tmp.write_text(json.dumps(envelope, default=str), encoding="utf-8")
+            tmp.replace(self.path)
+        except Exception as exc:
+            log.warning("feed_mirror: could not write %s – %s", self.path.name, exc)
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            envelope = json.loads(self.path.read_text(encoding="utf-8"))
+            jobs = [JobRecord(**j) for j in envelope.get("jobs") or []]
+            texts = list(envelope.get("texts") or [])
+        except Exception as exc:
+            log.warning("feed_mirror: corrupt snapshot %s – ignoring (%s)", self.path.name, exc)
+            return
+        if len(jobs) != len(texts):
+            return
+        self.etag = envelope.get("etag")
+        self.last_modified = envelope.get("last_modified")
+        self.fetched_at = float(envelope.get("fetched_at") or 0.0)
+        self._replace(jobs, texts)
+
+
+def _build_index(texts: List[str]) -> BM25Index:
+    index = BM25Index(field_weights={"text": 1.0})
+    index.add_many((i, {"text": text}) for i, text in enumerate(texts))
+    return index
+
+
+class FeedMirrorService:
+    """
+    Owns the mirrors and the background refresh loop.
+    """
+
+    def __init__(self, specs: List[FeedSpec], mirror_dir: Path = _DEFAULT_MIRROR_DIR, tick_s: float = 60.0) -> None:
+        self.mirrors: Dict[str, FeedMirror] = {s.name: FeedMirror(s, mirror_dir) for s in specs}
+        self.tick_s = tick_s
+        self._task: Optional[asyncio.Task] = None
+
+    def get(self, name: str) -> Optional[FeedMirror]:
+        return self.mirrors.get(name)
+
+    async def refresh_due(self) -> None:
+        due = [m for m in self.mirrors.values() if m.due]
+        if due:
+            await asyncio.gather(*[m.refresh() for m in due])
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="feed-mirror-refresh")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [m.status() for m in self.mirrors.values()]
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh_due()
+            except Exception as exc:
+                log.warning("feed_mirror: refresh loop error – %s", exc)
+            await asyncio.sleep(self.tick_s)
+
+
+# ── Module-level singleton ────────────────────────────────────────────────────
+_default_mirrors: Optional[FeedMirrorService] = None
+
+
+def get_feed_mirrors() -> FeedMirrorService:
+    global _default_mirrors
+    if _default_mirrors is None:
+        from .providers.arbeitnow import ARBEITNOW_FEED
+        from .providers.remoteok import REMOTEOK_FEED
+        from .providers.remotive import REMOTIVE_FEED
+
+        specs = [REMOTEOK_FEED, ARBEITNOW_FEED, REMOTIVE_FEED] if settings.FEED_MIRROR_ENABLED else []
+        _default_mirrors = FeedMirrorService(specs)
+    return _default_mirrors
+
+
+def mirrored_jobs(name: str, query: str, limit: int) -> Optional[List[JobRecord]]:
+    """Answer from the mirror if it is warm, else None (caller goes live)."""
+    mirror = get_feed_mirrors().get(name)
+    if mirror is None or not mirror.ready:
+        return None
+    return mirror.query(query, limit=limit)
@@ -9,7 +9,7 @@ import httpx
 from bs4 import BeautifulSoup
 
 from services.core.config import settings
-from services.responses.jobs import JobItem
+from services.utils.job_record import JobRecord
 
 APPLY_WORDS = re.compile(r"\b(apply|apply now|submit application|easy apply|quick apply)\b", re.I)
 
@@ -82,7 +82,7 @@ def _find_apply_link(soup: BeautifulSoup, base_url: str) -> str:
     return ""
 
 
-async def extract_job(url: str) -> JobItem:
+async def extract_job(url: str) -> JobRecord:
     headers = {
         "User-Agent": "HuntFlow/1.0",
         "Accept": "text/html,application/xhtml+xml",
@@ -116,7 +116,7 @@ async def extract_job(url: str) -> JobItem:
     desc = (job.get("description") or "").strip() or _pick_meta(soup, "description")
     apply_url = _find_apply_link(soup, final_url)
 
-    return JobItem(
+    return JobRecord(
         source="url",
         country="",
         title=title,
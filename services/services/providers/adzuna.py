@@ -1,18 +1,23 @@
 # services/services/providers/adzuna.py
 from __future__ import annotations
 
+import asyncio
 import re
+from collections import deque
+from contextlib import aclosing
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
 from urllib.parse import urljoin, urlparse
 from urllib.robotparser import RobotFileParser
 
 import httpx
 from bs4 import BeautifulSoup
 
-from .base import JobProvider, ProviderResult
+from .base import JobProvider, ProviderCapabilities, ProviderResult, SearchFilters
+from ..adzuna_client import adzuna_concurrency, adzuna_rate_budget
 from ...core.config import settings
-from ...responses.jobs import JobItem
+from ...utils.job_record import JobRecord
+from ...utils.http_clients import get_http_client
 
 
 DEFAULT_UA = "HuntFlowBot/1.0 (+https://example.com/bot; contact: you@example.com)"
@@ -221,73 +226,221 @@ class AdzunaProvider(JobProvider):
     Adzuna provider for HuntFlow.
     Uses Adzuna Search endpoint (fast + scalable). It returns redirect_url
     which is usually the best apply link you can store.
+
+    Searches every country in ADZUNA_COUNTRIES.  Pages are fetched
+    concurrently (at most `max_concurrency` in flight per call and
+    ADZUNA_MAX_CONCURRENCY across the process, paced by the shared Adzuna
+    rate budget), page 1 of every country first, and no further pages are
+    requested once `limit` jobs are in hand.  `stream` yields each
+    page's jobs as it lands; `search` collects them.  Both end with a
+    `next_page` token holding the next page per country, so a follow-up
+    search resumes there instead of starting over.
     """
 
     name = "adzuna"
+    capabilities = ProviderCapabilities(
+        keyword=True, location=True, recency=True, salary=True, paging=True, streaming=True
+    )
 
-    async def search(self, query: str, limit: int = 50, where: Optional[str] = None) -> ProviderResult:
+    def __init__(self, countries: Optional[List[str]] = None, max_concurrency: Optional[int] = None) -> None:
+        self.countries = [c.strip().lower() for c in (countries or settings.adzuna_country_list) if c.strip()] or ["eg"]
+        self.max_concurrency = max(1, max_concurrency or settings.ADZUNA_MAX_CONCURRENCY)
+
+    async def search(
+        self,
+        query: str,
+        limit: int = 50,
+        where: Optional[str] = None,
+        filters: Optional[SearchFilters] = None,
+        page_token: Optional[Dict[str, Any]] = None,
+    ) -> ProviderResult:
+        jobs: List[JobRecord] = []
+        last: Optional[ProviderResult] = None
+        async for last in self.stream(query, limit=limit, where=where, filters=filters, page_token=page_token):
+            jobs.extend(last.jobs)
+        return ProviderResult(provider=self.name, jobs=jobs[:limit], error=last.error, next_page=last.next_page)
+
+    async def stream(
+        self,
+        query: str,
+        limit: int = 50,
+        where: Optional[str] = None,
+        filters: Optional[SearchFilters] = None,
+        page_token: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[ProviderResult]:
+        """Yield each page's jobs as it lands, then a final result with the error and `next_page`."""
         if not settings.ADZUNA_APP_ID or not settings.ADZUNA_APP_KEY:
-            return ProviderResult(provider=self.name, jobs=[], error="Missing ADZUNA_APP_ID or ADZUNA_APP_KEY")
+            yield ProviderResult(provider=self.name, jobs=[], error="Missing ADZUNA_APP_ID or ADZUNA_APP_KEY")
+            return
 
-        # Default to Egypt unless you pass country via env or extend the signature.
-        country = (getattr(settings, "ADZUNA_COUNTRY", "") or "eg").strip().lower()
+        filters = filters or SearchFilters(location=where)
+        emitted = 0
+        errors: List[str] = []
+        progress: Dict[str, Any] = {}
+        try:
+            async with aclosing(self._iter_pages(query, limit, filters, page_token, progress)) as pages:
+                async for country, chunk, error in pages:
+                    if error:
+                        errors.append(f"{country}: {error}")
+                    if chunk:
+                        emitted += len(chunk)
+                        yield ProviderResult(provider=self.name, jobs=chunk)
+        except Exception as e:
+            yield ProviderResult(provider=self.name, jobs=[], error=str(e))
+            return
+
+        # Only an outright failure is an error; a country that failed while
+        # others answered just contributes nothing.
+        error = "; ".join(errors) if errors and not emitted else None
+        next_page = progress if progress.get("pages") else None
+        yield ProviderResult(provider=self.name, jobs=[], error=error, next_page=next_page)
+
+    async def _iter_pages(
+        self,
+        query: str,
+        limit: int,
+        filters: SearchFilters,
+        page_token: Optional[Dict[str, Any]] = None,
+        progress: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[Tuple[str, List[JobRecord], Optional[str]]]:
+        """
+        Yield (country, jobs, error) per page, trimmed so that at most `limit`
+        jobs come out in total.
+
+        `page_token` ({"rpp": ..., "pages": {country: next page}}) resumes an
+        earlier walk; countries missing from it are exhausted.  `progress` is
+        filled with the token for the following call: per country, the first
+        page not yet emitted in full (a trimmed page is fetched again and its
+        repeats are left to the caller's dedupe).
+        """
+        progress = {} if progress is None else progress
+        if page_token:
+            results_per_page = int(page_token.get("rpp") or 50)
+            start = {c: int(p) for c, p in (page_token.get("pages") or {}).items() if c in self.countries}
+        else:
+            # Paging based on limit (Adzuna max 50 per page commonly)
+            results_per_page = min(50, max(5, -(-limit // len(self.countries))))
+            start = {country: 1 for country in self.countries}
+        progress["rpp"] = results_per_page
+        progress["pages"] = dict(start)
+        if limit <= 0 or not start:
+            return
+
+        pages = max(1, -(-limit // results_per_page))
+        queue: Deque[Tuple[str, int]] = deque(
+            (country, start[country] + offset) for offset in range(pages) for country in start
+        )
+        exhausted: Set[str] = set()
+        done_pages: Dict[str, Set[int]] = {country: set() for country in start}
+        last_page: Dict[str, int] = {}
+        running: Dict[asyncio.Task, Tuple[str, int]] = {}
+        emitted = 0
+
+        def launch() -> None:
+            # Keep enough pages in flight to cover what is still missing
+            while queue and len(running) < self.max_concurrency and emitted + len(running) * results_per_page < limit:
+                country, page = queue.popleft()
+                if country in exhausted:
+                    continue
+                task = asyncio.create_task(self._fetch_page(country, page, query, results_per_page, filters))
+                running[task] = (country, page)
+
+        def note(country: str, page: int, complete: bool, full: bool) -> None:
+            if complete:
+                done_pages[country].add(page)
+                if not full:
+                    last_page[country] = page
+            next_page = start[country]
+            while next_page in done_pages[country]:
+                next_page += 1
+            if country in last_page and next_page > last_page[country]:
+                progress["pages"].pop(country, None)
+            else:
+                progress["pages"][country] = next_page
 
+        try:
+            launch()
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    country, page = running.pop(task)
+                    try:
+                        chunk, full = task.result()
+                    except Exception as e:
+                        exhausted.add(country)
+                        yield country, [], str(e)
+                        continue
+                    if not full:
+                        exhausted.add(country)
+
+                    trimmed = chunk[: limit - emitted]
+                    emitted += len(trimmed)
+                    note(country, page, len(trimmed) == len(chunk), full)
+                    yield country, trimmed, None
+                    if emitted >= limit:
+                        return
+                launch()
+        finally:
+            for task in running:
+                task.cancel()
+
+    async def _fetch_page(
+        self,
+        country: str,
+        page: int,
+        query: str,
+        results_per_page: int,
+        filters: SearchFilters,
+    ) -> Tuple[List[JobRecord], bool]:
+        """One results page for one country.  Returns (jobs, page_was_full)."""
         base = f"https://api.adzuna.com/v1/api/jobs/{country}/search"
         headers = {"User-Agent": DEFAULT_UA, "Accept": "application/json"}
-
-        # Paging based on limit (Adzuna max 50 per page commonly)
-        results_per_page = min(50, max(5, limit))
-        pages = max(1, (limit + results_per_page - 1) // results_per_page)
-
-        jobs: list[JobItem] = []
-        try:
-            async with httpx.AsyncClient(timeout=30.0, headers=headers, follow_redirects=True) as client:
-                for page in range(1, pages + 1):
-                    params = {
-                        "app_id": settings.ADZUNA_APP_ID,
-                        "app_key": settings.ADZUNA_APP_KEY,
-                        "results_per_page": results_per_page,
-                        "what": query,
-                        "content-type": "application/json",
-                    }
-                    if where:
-                        params["where"] = where
-
-                    url = f"{base}/{page}"
-                    r = await client.get(url, params=params)
-                    r.raise_for_status()
-                    data = r.json()
-                    results = data.get("results") or []
-
-                    for item in results:
-                        title = _safe_text(item.get("title"))
-                        company = _safe_text((item.get("company") or {}).get("display_name")) if isinstance(item.get("company"), dict) else ""
-                        location = _safe_text((item.get("location") or {}).get("display_name")) if isinstance(item.get("location"), dict) else ""
-                        redirect_url = _safe_text(item.get("redirect_url"))
-                        created = _safe_text(item.get("created"))
-                        desc = _safe_text(item.get("description"))
-                        desc_snip = re.sub(r"\s+", " ", desc)[:240]
-
-                        jobs.append(
-                            JobItem(
-                                source=f"{self.name}:{country}",
-                                country=country,
-                                title=title,
-                                company=company,
-                                location=location,
-                                description_snippet=desc_snip,
-                                job_url=redirect_url or "",
-                                apply_url=redirect_url or "",
-                                posted_at=created or None,
-                                ats=None,
-                            )
-                        )
-                        if len(jobs) >= limit:
-                            break
-
-                    if len(jobs) >= limit:
-                        break
-
-            return ProviderResult(provider=self.name, jobs=jobs[:limit])
-        except Exception as e:
-            return ProviderResult(provider=self.name, jobs=[], error=str(e))
\ No newline at end of file
+        params = {
+            "app_id": settings.ADZUNA_APP_ID,
+            "app_key": settings.ADZUNA_APP_KEY,
+            "results_per_page": results_per_page,
+            "what": query,
+            "content-type": "application/json",
+        }
+        if filters.location:
+            params["where"] = filters.location
+        if filters.max_days_old:
+            params["max_days_old"] = filters.max_days_old
+        if filters.salary_min is not None:
+            params["salary_min"] = filters.salary_min
+        if filters.salary_max is not None:
+            params["salary_max"] = filters.salary_max
+
+        async with adzuna_concurrency():
+            await adzuna_rate_budget().acquire()
+            url = f"{base}/{page}"
+            client = get_http_client(url)
+            r = await client.get(url, params=params, headers=headers, timeout=30.0)
+            r.raise_for_status()
+            data = r.json()
+
+        results = data.get("results") or []
+        jobs: List[JobRecord] = []
+        for item in results:
+            title = _safe_text(item.get("title"))
+            company = _safe_text((item.get("company") or {}).get("display_name")) if isinstance(item.get("company"), dict) else ""
+            location = _safe_text((item.get("location") or {}).get("display_name")) if isinstance(item.get("location"), dict) else ""
+            redirect_url = _safe_text(item.get("redirect_url"))
+            created = _safe_text(item.get("created"))
+            desc = _safe_text(item.get("description"))
+            desc_snip = re.sub(r"\s+", " ", desc)[:240]
+
+            jobs.append(
+                JobRecord(
+                    source=f"{self.name}:{country}",
+                    country=country,
+                    title=title,
+                    company=company,
+                    location=location,
+                    description_snippet=desc_snip,
+                    job_url=redirect_url or "",
+                    apply_url=redirect_url or "",
+                    posted_at=created or None,
+                )
+            )
+        return jobs, len(results) >= results_per_page
@@ -1,51 +1,85 @@
 from __future__ import annotations
 
-import httpx
-from typing import Optional
+from typing import Any, Dict, Optional
 
-from .base import JobProvider, ProviderResult
-from ...responses.jobs import JobItem
+from .base import JobProvider, ProviderCapabilities, ProviderResult, SearchFilters
+from ..feed_mirror import FeedSpec, get_feed_mirrors, mirrored_jobs
+from ...utils.job_record import JobRecord
 from ...core.config import settings
+from ...utils.http_clients import get_http_client
+from ...utils.json_stream import iter_array_items
+
+URL = "https://www.arbeitnow.com/api/job-board-api"
+
+
+def _search_text(item: Dict[str, Any]) -> str:
+    title = (item.get("title") or "").strip()
+    company = (item.get("company_name") or "").strip()
+    return f"{title} {company}"
+
+
+def _to_job(item: Dict[str, Any]) -> JobRecord:
+    apply_url = (item.get("url") or "").strip()
+    return JobRecord(
+        source=ArbeitnowProvider.name,
+        country="",
+        title=(item.get("title") or "").strip(),
+        company=(item.get("company_name") or "").strip(),
+        location=(item.get("location") or "").strip(),
+        description_snippet=(item.get("description") or "")[:240],
+        job_url=apply_url,
+        apply_url=apply_url,
+        posted_at=item.get("created_at"),
+    )
+
+
+ARBEITNOW_FEED = FeedSpec(
+    name="arbeitnow",
+    url=URL,
+    items=lambda data: (data or {}).get("data") or [],
+    to_job=_to_job,
+    search_text=_search_text,
+    refresh_interval_s=3600.0,
+)
 
 
 class ArbeitnowProvider(JobProvider):
     name = "arbeitnow"
+    capabilities = ProviderCapabilities()
+
+    def serves_locally(self) -> bool:
+        mirror = get_feed_mirrors().get(self.name)
+        return bool(mirror and mirror.ready)
 
-    async def search(self, query: str, limit: int = 50, where: Optional[str] = None) -> ProviderResult:
-        url = "https://www.arbeitnow.com/api/job-board-api"
+    async def search(
+        self,
+        query: str,
+        limit: int = 50,
+        where: Optional[str] = None,
+        filters: Optional[SearchFilters] = None,
+    ) -> ProviderResult:
+        mirrored = mirrored_jobs(self.name, query, limit)
+        if mirrored is not None:
+            return ProviderResult(provider=self.name, jobs=mirrored)
+
+        # Items are decoded one at a time off the response stream and the
+        # body is abandoned once `limit` matches are in hand
+        needle = (query or "").lower()
+        jobs: list[JobRecord] = []
         try:
-            async with httpx.AsyncClient(timeout=settings.REQUEST_TIMEOUT_S) as client:
-                r = await client.get(url)
+            client = get_http_client(URL)
+            async with client.stream("GET", URL, timeout=settings.REQUEST_TIMEOUT_S) as r:
                 r.raise_for_status()
-                data = r.json()
+                async for item in iter_array_items(r.aiter_bytes(), path=("data",)):
+                    if not isinstance(item, dict):
+                        continue
+                    if needle and needle not in _search_text(item).lower():
+                        continue
+
+                    jobs.append(_to_job(item))
+                    if len(jobs) >= limit:
+                        break
         except Exception as e:
             return ProviderResult(provider=self.name, jobs=[], error=str(e))
 
-        jobs: list[JobItem] = []
-        for item in (data.get("data") or []):
-            title = (item.get("title") or "").strip()
-            company = (item.get("company_name") or "").strip()
-            location = (item.get("location") or "").strip()
-            apply_url = (item.get("url") or "").strip()
-
-            if query and query.lower() not in f"{title} {company}".lower():
-                continue
-
-            jobs.append(
-                JobItem(
-                    source=self.name,
-                    country="",
-                    title=title,
-                    company=company,
-                    location=location,
-                    description_snippet=(item.get("description") or "")[:240],
-                    job_url=apply_url,
-                    apply_url=apply_url,
-                    posted_at=item.get("created_at"),
-                    ats=None,
-                )
-            )
-            if len(jobs) >= limit:
-                break
-
-        return ProviderResult(provider=self.name, jobs=jobs)
\ No newline at end of file
+        return ProviderResult(provider=self.name, jobs=jobs)
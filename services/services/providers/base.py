@@ -1,33 +1,157 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Optional, Sequence
+from dataclasses import dataclass, fields, replace
+from typing import Any, AsyncIterator, Dict, FrozenSet, List, Optional, Sequence, Tuple
 
-from ...responses.jobs import JobItem
+from ...utils.job_record import JobRecord
 
 
 @dataclass
 class ProviderResult:
     provider: str
-    jobs: list[JobItem]
+    jobs: list[JobRecord]
     error: Optional[str] = None
+    # Paging providers: token for the next slice (None once exhausted)
+    next_page: Optional[Dict[str, Any]] = None
+
+
+# Filter predicates a provider may evaluate server-side, and the SearchFilters
+# fields each one covers.  Keyword matching is always done by the provider.
+PREDICATE_FIELDS = {
+    "location": ("location",),
+    "remote": ("remote_only",),
+    "recency": ("max_days_old",),
+    "salary": ("salary_min", "salary_max"),
+    "category": ("category",),
+}
+
+
+@dataclass(frozen=True)
+class SearchFilters:
+    """Structured filters on top of the keyword query; `location` is the old `where`."""
+
+    location: Optional[str] = None
+    remote_only: bool = False
+    max_days_old: Optional[int] = None
+    salary_min: Optional[int] = None
+    salary_max: Optional[int] = None
+    category: Optional[str] = None
+
+    def active(self) -> FrozenSet[str]:
+        """Names of the predicates this filter set actually constrains."""
+        return frozenset(
+            name
+            for name, names in PREDICATE_FIELDS.items()
+            if any(getattr(self, f) not in (None, False, "") for f in names)
+        )
+
+    def only(self, predicates: FrozenSet[str]) -> "SearchFilters":
+        """A copy keeping just the given predicates."""
+        cleared = {
+            f.name: f.default
+            for f in fields(self)
+            if not any(f.name in PREDICATE_FIELDS[p] for p in predicates)
+        }
+        return replace(self, **cleared)
+
+    def cache_tags(self) -> List[str]:
+        """Stable tags for cache keys; location is excluded (keys already carry `where`)."""
+        return [
+            f"filter:{f.name}={getattr(self, f.name)}"
+            for f in fields(self)
+            if f.name != "location" and getattr(self, f.name) not in (None, False, "")
+        ]
+
+
+@dataclass(frozen=True)
+class ProviderCapabilities:
+    """
+    Which predicates a provider pushes down to its API.  `keyword` marks a
+    server-side text search; providers without it filter feeds themselves.
+    `remote` also covers remote-only boards, where every result qualifies.
+    `paging` marks providers that resume from a `page_token` (see JobProvider).
+    `streaming` marks providers whose `stream` yields jobs as pages arrive.
+    """
+
+    keyword: bool = False
+    location: bool = False
+    remote: bool = False
+    recency: bool = False
+    salary: bool = False
+    category: bool = False
+    paging: bool = False
+    streaming: bool = False
+
+    def supported(self) -> FrozenSet[str]:
+        return frozenset(p for p in PREDICATE_FIELDS if getattr(self, p))
+
+
+def split_filters(
+    capabilities: ProviderCapabilities,
+    filters: Optional[SearchFilters],
+) -> Tuple[SearchFilters, SearchFilters]:
+    """(pushed, residual): what the provider's API evaluates and what is left to do locally."""
+    filters = filters or SearchFilters()
+    active = filters.active()
+    pushed = active & capabilities.supported()
+    return filters.only(pushed), filters.only(active - pushed)
 
 
 class JobProvider(ABC):
     name: str
+    capabilities: ProviderCapabilities = ProviderCapabilities()
+
+    def serves_locally(self) -> bool:
+        """True when searches are answered without network I/O (e.g. a warm feed mirror)."""
+        return False
 
     @abstractmethod
-    async def search(self, query: str, limit: int = 50, where: Optional[str] = None) -> ProviderResult:
+    async def search(
+        self,
+        query: str,
+        limit: int = 50,
+        where: Optional[str] = None,
+        filters: Optional[SearchFilters] = None,
+    ) -> ProviderResult:
+        """
+        `filters` only ever holds predicates listed in `capabilities`;
+        `where` mirrors `filters.location` for callers that predate filters.
+
+        Providers declaring `capabilities.paging` also accept a `page_token`
+        keyword (a JSON-serialisable dict from an earlier result's
+        `next_page`) and continue from there; they set `next_page` on each
+        result, None once nothing is left.
+        """
         raise NotImplementedError
 
+    async def stream(
+        self,
+        query: str,
+        limit: int = 50,
+        where: Optional[str] = None,
+        filters: Optional[SearchFilters] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ProviderResult]:
+        """
+        `search`, incrementally: yields chunks of jobs as they arrive, the
+        last result carrying `error` and `next_page` for the whole call.
+        The default yields the single `search` result; providers declaring
+        `capabilities.streaming` override it.
+        """
+        yield await self.search(query=query, limit=limit, where=where, filters=filters, **kwargs)
+
 
-def dedupe_jobs(items: Sequence[JobItem]) -> list[JobItem]:
+def job_key(j: JobRecord) -> str:
     # Dedup key: apply_url/job_url + title + company
+    return f"{(j.apply_url or j.job_url or '').strip().lower()}|{j.title.strip().lower()}|{j.company.strip().lower()}"
+
+
+def dedupe_jobs(items: Sequence[JobRecord]) -> list[JobRecord]:
     seen: set[str] = set()
-    out: list[JobItem] = []
+    out: list[JobRecord] = []
     for j in items:
-        key = f"{(j.apply_url or j.job_url or '').strip().lower()}|{j.title.strip().lower()}|{j.company.strip().lower()}"
+        key = job_key(j)
         if key in seen:
             continue
         seen.add(key)
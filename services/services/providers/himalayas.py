@@ -1,28 +1,35 @@
 from __future__ import annotations
 
-import httpx
 from typing import Optional
 
-from .base import JobProvider, ProviderResult
-from ...responses.jobs import JobItem
+from .base import JobProvider, ProviderCapabilities, ProviderResult, SearchFilters
+from ...utils.job_record import JobRecord
 from ...core.config import settings
+from ...utils.http_clients import get_http_client
 
 
 class HimalayasProvider(JobProvider):
     name = "himalayas"
-
-    async def search(self, query: str, limit: int = 50, where: Optional[str] = None) -> ProviderResult:
+    capabilities = ProviderCapabilities(keyword=True, remote=True)
+
+    async def search(
+        self,
+        query: str,
+        limit: int = 50,
+        where: Optional[str] = None,
+        filters: Optional[SearchFilters] = None,
+    ) -> ProviderResult:
         # Public JSON endpoint (simple)
         url = "https://himalayas.app/jobs/api"
         try:
-            async with httpx.AsyncClient(timeout=settings.REQUEST_TIMEOUT_S) as client:
-                r = await client.get(url, params={"query": query})
-                r.raise_for_status()
-                data = r.json()
+            client = get_http_client(url)
+            r = await client.get(url, params={"query": query}, timeout=settings.REQUEST_TIMEOUT_S)
+            r.raise_for_status()
+            data = r.json()
         except Exception as e:
             return ProviderResult(provider=self.name, jobs=[], error=str(e))
 
-        jobs: list[JobItem] = []
+        jobs: list[JobRecord] = []
         for item in (data.get("jobs") or data or []):
             title = (item.get("title") or "").strip()
             company = ((item.get("company") or {}).get("name") or item.get("company_name") or "").strip()
@@ -30,7 +37,7 @@ class HimalayasProvider(JobProvider):
             apply_url = (item.get("application_url") or item.get("url") or "").strip()
 
             jobs.append(
-                JobItem(
+                JobRecord(
                     source=self.name,
                     country="",
                     title=title,
@@ -40,7 +47,6 @@ class HimalayasProvider(JobProvider):
                     job_url=apply_url,
                     apply_url=apply_url,
                     posted_at=item.get("published_at") or item.get("created_at"),
-                    ats=None,
                 )
             )
             if len(jobs) >= limit:
@@ -1,28 +1,35 @@
 from __future__ import annotations
 
-import httpx
 from typing import Optional
 
-from .base import JobProvider, ProviderResult
-from ...responses.jobs import JobItem
+from .base import JobProvider, ProviderCapabilities, ProviderResult, SearchFilters
+from ...utils.job_record import JobRecord
 from ...core.config import settings
+from ...utils.http_clients import get_http_client
 
 
 class JobicyProvider(JobProvider):
     name = "jobicy"
-
-    async def search(self, query: str, limit: int = 50, where: Optional[str] = None) -> ProviderResult:
+    capabilities = ProviderCapabilities(keyword=True, remote=True)
+
+    async def search(
+        self,
+        query: str,
+        limit: int = 50,
+        where: Optional[str] = None,
+        filters: Optional[SearchFilters] = None,
+    ) -> ProviderResult:
         # Jobicy public API endpoint
         url = "https://jobicy.com/api/v2/remote-jobs"
         try:
-            async with httpx.AsyncClient(timeout=settings.REQUEST_TIMEOUT_S) as client:
-                r = await client.get(url, params={"count": min(limit, 50), "tag": query})
-                r.raise_for_status()
-                data = r.json()
+            client = get_http_client(url)
+            r = await client.get(url, params={"count": min(limit, 50), "tag": query}, timeout=settings.REQUEST_TIMEOUT_S)
+            r.raise_for_status()
+            data = r.json()
         except Exception as e:
             return ProviderResult(provider=self.name, jobs=[], error=str(e))
 
-        jobs: list[JobItem] = []
+        jobs: list[JobRecord] = []
         for item in (data.get("jobs") or []):
             title = (item.get("jobTitle") or "").strip()
             company = (item.get("companyName") or "").strip()
@@ -30,7 +37,7 @@ class JobicyProvider(JobProvider):
             apply_url = (item.get("url") or item.get("jobUrl") or "").strip()
 
             jobs.append(
-                JobItem(
+                JobRecord(
                     source=self.name,
                     country="",
                     title=title,
@@ -40,7 +47,6 @@ class JobicyProvider(JobProvider):
                     job_url=apply_url,
                     apply_url=apply_url,
                     posted_at=item.get("pubDate"),
-                    ats=None,
                 )
             )
             if len(jobs) >= limit:
@@ -2,36 +2,55 @@ from __future__ import annotations
 
 from typing import Optional
 
-from .base import JobProvider, ProviderResult
-from ...responses.jobs import JobItem
+from .base import JobProvider, ProviderCapabilities, ProviderResult, SearchFilters
+from ...utils.job_record import JobRecord
 
 
 class JobSpyProvider(JobProvider):
     name = "jobspy"
+    capabilities = ProviderCapabilities(keyword=True, location=True, remote=True, recency=True)
 
-    async def search(self, query: str, limit: int = 50, where: Optional[str] = None) -> ProviderResult:
-        # Optional: only works if jobspy is installed in your env
+    def __init__(self) -> None:
+        # Optional: only works if jobspy is installed in your env.  Imported
+        # once here (the registry builds this provider on first use) rather
+        # than on every search.
+        self._scrape_jobs = None
+        self._import_error: Optional[str] = None
         try:
             from jobspy import scrape_jobs  # type: ignore
+            self._scrape_jobs = scrape_jobs
         except Exception as e:
-            return ProviderResult(provider=self.name, jobs=[], error=f"jobspy not installed: {e}")
+            self._import_error = f"jobspy not installed: {e}"
 
+    async def search(
+        self,
+        query: str,
+        limit: int = 50,
+        where: Optional[str] = None,
+        filters: Optional[SearchFilters] = None,
+    ) -> ProviderResult:
+        scrape_jobs = self._scrape_jobs
+        if scrape_jobs is None:
+            return ProviderResult(provider=self.name, jobs=[], error=self._import_error)
+
+        filters = filters or SearchFilters(location=where)
         try:
             df = scrape_jobs(
                 site_name=["linkedin", "indeed", "glassdoor", "google", "zip_recruiter"],
                 search_term=query,
-                location=where or "",
+                location=filters.location or "",
+                is_remote=filters.remote_only,
                 results_wanted=min(limit, 50),
-                hours_old=72,
+                hours_old=24 * filters.max_days_old if filters.max_days_old else 72,
                 country_indeed="usa",
             )
         except Exception as e:
             return ProviderResult(provider=self.name, jobs=[], error=str(e))
 
-        jobs: list[JobItem] = []
+        jobs: list[JobRecord] = []
         for _, row in df.iterrows():
             jobs.append(
-                JobItem(
+                JobRecord(
                     source=self.name,
                     country="",
                     title=str(row.get("title") or ""),
@@ -41,7 +60,6 @@ class JobSpyProvider(JobProvider):
                     job_url=str(row.get("job_url") or ""),
                     apply_url=str(row.get("job_url") or ""),
                     posted_at=None,
-                    ats=None,
                 )
             )
             if len(jobs) >= limit:
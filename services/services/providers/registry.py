@@ -0,0 +1,265 @@
+"""
+services/providers/registry.py
+
+Lazy provider registry.
+
+Providers are discovered by name without importing them:
+- the built-in manifest below
+- a JSON manifest file named by JOB_PROVIDER_MANIFEST, e.g.
+      {"acme": "acme_jobs.provider:AcmeProvider",
+       "internal": {"target": "corp.jobs:InternalProvider", "tier": 1}}
+  (entries here may also replace a built-in; a `tier` other than 1, 2 or 3
+  rejects the entry with an error)
+- installed packages exposing the `huntflow.providers` entry point group
+  (these only add new names; a clash with a known name is logged and ignored)
+
+A provider's module is imported and its class instantiated on first use; the
+instance is cached, so every search shares its pooled HTTP clients.  A
+provider that fails to import or initialise is replaced by a stand-in whose
+searches return the error, so one broken plugin does not break a search.
+`stats()` reports per-provider import and init cost.
+
+Usage:
+    registry = get_default_provider_registry()
+    registry.names()                 # known provider names, nothing imported
+    provider = registry.get("remotive")
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from .base import JobProvider, ProviderResult
+
+log = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "huntflow.providers"
+
+BUILTIN_PROVIDERS: Dict[str, str] = {
+    "adzuna": "services.services.providers.adzuna:AdzunaProvider",
+    "remotive": "services.services.providers.remotive:RemotiveProvider",
+    "himalayas": "services.services.providers.himalayas:HimalayasProvider",
+    "jobicy": "services.services.providers.jobicy:JobicyProvider",
+    "arbeitnow": "services.services.providers.arbeitnow:ArbeitnowProvider",
+    "jobspy": "services.services.providers.jobspy_adapter:JobSpyProvider",
+    "remoteok": "services.services.providers.remoteok:RemoteOKProvider",
+    "muse": "services.services.providers.muse:MuseProvider",
+    "usajobs": "services.services.providers.usajobs:USAJobsProvider",
+}
+
+# Planner tiers a provider may be placed in
+TIERS = frozenset({1, 2, 3})
+
+# A target is "module:attr" or an already imported class/factory
+Target = Union[str, Callable[[], JobProvider]]
+
+
+@dataclass
+class ProviderSpec:
+    name: str
+    target: Target
+    origin: str                     # "builtin" | "manifest" | "entry_point" | "register"
+    tier: Optional[int] = None      # planner tier hint for providers the engine does not know
+    entry_point: Any = None         # importlib.metadata.EntryPoint, loaded on first use
+    import_ms: Optional[float] = None
+    init_ms: Optional[float] = None
+    error: Optional[str] = None
+
+
+class UnavailableProvider(JobProvider):
+    """Stand-in for a provider that could not be loaded; every search reports why."""
+
+    def __init__(self, name: str, error: str) -> None:
+        self.name = name
+        self.error = error
+
+    async def search(self, query: str, limit: int = 50, where: Optional[str] = None, filters=None, **_: Any) -> ProviderResult:
+        return ProviderResult(provider=self.name, jobs=[], error=f"provider unavailable: {self.error}")
+
+
+class ProviderRegistry:
+    """Name -> provider spec, discovered lazily; instances built on first `get`."""
+
+    def __init__(
+        self,
+        builtins: Optional[Dict[str, str]] = None,
+        manifest_path: Optional[Path] = None,
+        entry_points: bool = True,
+    ) -> None:
+        self._builtins = dict(BUILTIN_PROVIDERS if builtins is None else builtins)
+        self._manifest_path = manifest_path
+        self._use_entry_points = entry_points
+        self._specs: Optional[Dict[str, ProviderSpec]] = None
+        self._instances: Dict[str, JobProvider] = {}
+
+    # ── Public API ────────────────────────────────────────────────────────────
+
+    def names(self) -> List[str]:
+        return list(self._discover())
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._discover()
+
+    def tier(self, name: str) -> Optional[int]:
+        spec = self._discover().get(name)
+        return spec.tier if spec is not None else None
+
+    def register(self, name: str, target: Target, tier: Optional[int] = None, replace: bool = True) -> None:
+        """Add (or replace) a provider at runtime; any cached instance is dropped."""
+        if not _valid_tier(tier):
+            raise ValueError(f"Provider {name!r}: tier must be one of {sorted(TIERS)}, got {tier!r}")
+        specs = self._discover()
+        if name in specs and not replace:
+            return
+        specs[name] = ProviderSpec(name=name, target=target, origin="register", tier=tier)
+        self._instances.pop(name, None)
+
+    def get(self, name: str) -> JobProvider:
+        provider = self._instances.get(name)
+        if provider is not None:
+            return provider
+        spec = self._discover().get(name)
+        if spec is None:
+            raise KeyError(f"Unknown provider: {name}")
+        provider = self._instances[name] = self._load(spec)
+        return provider
+
+    def loaded(self) -> List[str]:
+        return list(self._instances)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per provider: where it came from, whether it is loaded, and what loading cost."""
+        return {
+            name: {
+                "origin": spec.origin,
+                "target": spec.target if isinstance(spec.target, str) else _qualname(spec.target),
+                "loaded": name in self._instances,
+                "import_ms": spec.import_ms,
+                "init_ms": spec.init_ms,
+                "error": spec.error,
+            }
+            for name, spec in self._discover().items()
+        }
+
+    # ── Internals ─────────────────────────────────────────────────────────────
+
+    def _discover(self) -> Dict[str, ProviderSpec]:
+        if self._specs is not None:
+            return self._specs
+
+        specs = {name: ProviderSpec(name=name, target=target, origin="builtin") for name, target in self._builtins.items()}
+
+        for name, entry in self._read_manifest().items():
+            if isinstance(entry, str):
+                entry = {"target": entry}
+            if not isinstance(entry, dict) or not isinstance(entry.get("target"), str):
+                log.warning("provider_registry: ignoring manifest entry %r", name)
+                continue
+            if not _valid_tier(entry.get("tier")):
+                log.error(
+                    "provider_registry: rejecting manifest entry %r – tier must be one of %s, got %r",
+                    name,
+                    sorted(TIERS),
+                    entry.get("tier"),
+                )
+                continue
+            specs[name] = ProviderSpec(name=name, target=entry["target"], origin="manifest", tier=entry.get("tier"))
+
+        if self._use_entry_points:
+            try:
+                found = metadata.entry_points(group=ENTRY_POINT_GROUP)
+            except Exception as exc:
+                log.warning("provider_registry: entry point scan failed – %s", exc)
+                found = []
+            for ep in found:
+                if ep.name in specs:
+                    log.warning("provider_registry: entry point %s clashes with a known provider – ignored", ep.name)
+                    continue
+                specs[ep.name] = ProviderSpec(name=ep.name, target=ep.value, origin="entry_point", entry_point=ep)
+
+        self._specs = specs
+        return specs
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        path = self._manifest_path
+        if path is None:
+            env = os.getenv("JOB_PROVIDER_MANIFEST")
+            path = Path(env) if env else None
+        if path is None:
+            return {}
+        try:
+            manifest = json.loads(Path(path).read_text(encoding="utf-8"))
+        except Exception as exc:
+            log.warning("provider_registry: could not read manifest %s – %s", path, exc)
+            return {}
+        if not isinstance(manifest, dict):
+            log.warning("provider_registry: manifest %s is not an object – ignoring", path)
+            return {}
+        return manifest
+
+    def _load(self, spec: ProviderSpec) -> JobProvider:
+        t0 = time.perf_counter()
+        try:
+            if spec.entry_point is not None:
+                factory = spec.entry_point.load()
+            elif isinstance(spec.target, str):
+                module_name, _, attr = spec.target.partition(":")
+                factory = getattr(importlib.import_module(module_name), attr)
+            else:
+                factory = spec.target
+        except Exception as exc:
+            spec.import_ms = _ms_since(t0)
+            return self._unavailable(spec, f"import failed: {exc}")
+        spec.import_ms = _ms_since(t0)
+
+        t1 = time.perf_counter()
+        try:
+            provider = factory()
+        except Exception as exc:
+            spec.init_ms = _ms_since(t1)
+            return self._unavailable(spec, f"init failed: {exc}")
+        spec.init_ms = _ms_since(t1)
+        spec.error = None
+        log.info(
+            "provider_registry: loaded %s (import %.1fms, init %.1fms)",
+            spec.name,
+            spec.import_ms,
+            spec.init_ms,
+        )
+        return provider
+
+    def _unavailable(self, spec: ProviderSpec, error: str) -> JobProvider:
+        spec.error = error
+        log.warning("provider_registry: %s unavailable – %s", spec.name, error)
+        return UnavailableProvider(spec.name, error)
+
+
+def _valid_tier(tier: Any) -> bool:
+    return tier is None or (isinstance(tier, int) and not isinstance(tier, bool) and tier in TIERS)
+
+
+def _ms_since(t0: float) -> float:
+    return round((time.perf_counter() - t0) * 1000, 2)
+
+
+def _qualname(obj: Any) -> str:
+    return f"{getattr(obj, '__module__', '?')}:{getattr(obj, '__qualname__', repr(obj))}"
+
+
+# ── Module-level singleton ────────────────────────────────────────────────────
+_default_registry: Optional[ProviderRegistry] = None
+
+
+def get_default_provider_registry() -> ProviderRegistry:
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = ProviderRegistry()
+    return _default_registry
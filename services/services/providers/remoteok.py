@@ -1,50 +1,91 @@
 from __future__ import annotations
 
-import httpx
-from typing import Optional
+from typing import Any, Dict, Optional
 
-from .base import JobProvider, ProviderResult
-from ...responses.jobs import JobItem
+from .base import JobProvider, ProviderCapabilities, ProviderResult, SearchFilters
+from ..feed_mirror import FeedSpec, get_feed_mirrors, mirrored_jobs
+from ...utils.job_record import JobRecord
 from ...core.config import settings
+from ...utils.http_clients import get_http_client
+from ...utils.json_stream import iter_array_items
+
+URL = "https://remoteok.com/api"
+
+
+def _search_text(item: Dict[str, Any]) -> str:
+    title = (item.get("position") or "").strip()
+    company = (item.get("company") or "").strip()
+    tags = " ".join(item.get("tags") or [])
+    return f"{title} {company} {tags}"
+
+
+def _to_job(item: Dict[str, Any]) -> JobRecord:
+    apply_url = (item.get("apply_url") or item.get("url") or "").strip()
+    return JobRecord(
+        source=RemoteOKProvider.name,
+        country="",
+        title=(item.get("position") or "").strip(),
+        company=(item.get("company") or "").strip(),
+        location=(item.get("location") or "Remote").strip(),
+        description_snippet=(item.get("description") or "")[:240],
+        job_url=apply_url,
+        apply_url=apply_url,
+        posted_at=str(item.get("date")) if item.get("date") else None,
+    )
+
+
+REMOTEOK_FEED = FeedSpec(
+    name="remoteok",
+    url=URL,
+    items=lambda data: (data or [])[1:],  # first entry is metadata
+    to_job=_to_job,
+    search_text=_search_text,
+    headers={"User-Agent": "HuntFlow/1.0"},
+    refresh_interval_s=3600.0,
+)
 
 
 class RemoteOKProvider(JobProvider):
     name = "remoteok"
+    capabilities = ProviderCapabilities(remote=True)
+
+    def serves_locally(self) -> bool:
+        mirror = get_feed_mirrors().get(self.name)
+        return bool(mirror and mirror.ready)
 
-    async def search(self, query: str, limit: int = 50, where: Optional[str] = None) -> ProviderResult:
-        url = "https://remoteok.com/api"
+    async def search(
+        self,
+        query: str,
+        limit: int = 50,
+        where: Optional[str] = None,
+        filters: Optional[SearchFilters] = None,
+    ) -> ProviderResult:
+        mirrored = mirrored_jobs(self.name, query, limit)
+        if mirrored is not None:
+            return ProviderResult(provider=self.name, jobs=mirrored)
+
+        # Items are decoded one at a time off the response stream and the
+        # body is abandoned once `limit` matches are in hand
+        needle = (query or "").lower()
+        jobs: list[JobRecord] = []
         try:
-            async with httpx.AsyncClient(timeout=settings.REQUEST_TIMEOUT_S, headers={"User-Agent": "HuntFlow/1.0"}) as client:
-                r = await client.get(url)
+            client = get_http_client(URL)
+            async with client.stream(
+                "GET", URL, headers={"User-Agent": "HuntFlow/1.0"}, timeout=settings.REQUEST_TIMEOUT_S
+            ) as r:
                 r.raise_for_status()
-                data = r.json()
+                index = 0
+                async for item in iter_array_items(r.aiter_bytes()):
+                    index += 1
+                    if index == 1 or not isinstance(item, dict):  # first entry is metadata
+                        continue
+                    if needle and needle not in _search_text(item).lower():
+                        continue
+
+                    jobs.append(_to_job(item))
+                    if len(jobs) >= limit:
+                        break
         except Exception as e:
             return ProviderResult(provider=self.name, jobs=[], error=str(e))
 
-        jobs: list[JobItem] = []
-        for item in data[1:]:  # first entry is metadata
-            title = (item.get("position") or "").strip()
-            company = (item.get("company") or "").strip()
-            tags = " ".join(item.get("tags") or [])
-            if query and query.lower() not in f"{title} {company} {tags}".lower():
-                continue
-
-            apply_url = (item.get("apply_url") or item.get("url") or "").strip()
-            jobs.append(
-                JobItem(
-                    source=self.name,
-                    country="",
-                    title=title,
-                    company=company,
-                    location=(item.get("location") or "Remote").strip(),
-                    description_snippet=(item.get("description") or "")[:240],
-                    job_url=apply_url,
-                    apply_url=apply_url,
-                    posted_at=str(item.get("date")) if item.get("date") else None,
-                    ats=None,
-                )
-            )
-            if len(jobs) >= limit:
-                break
-
-        return ProviderResult(provider=self.name, jobs=jobs)
\ No newline at end of file
+        return ProviderResult(provider=self.name, jobs=jobs)
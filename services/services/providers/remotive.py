@@ -1,43 +1,77 @@
 from __future__ import annotations
 
-import httpx
-from typing import Optional
+from typing import Any, Dict, Optional
 
-from .base import JobProvider, ProviderResult
-from ...responses.jobs import JobItem
+from .base import JobProvider, ProviderCapabilities, ProviderResult, SearchFilters
+from ..feed_mirror import FeedSpec, get_feed_mirrors, mirrored_jobs
+from ...utils.job_record import JobRecord
 from ...core.config import settings
+from ...utils.http_clients import get_http_client
+
+URL = "https://remotive.io/api/remote-jobs"
+
+
+def _search_text(item: Dict[str, Any]) -> str:
+    tags = " ".join(item.get("tags") or [])
+    return f"{item.get('title') or ''} {item.get('company_name') or ''} {item.get('category') or ''} {tags}"
+
+
+def _to_job(item: Dict[str, Any]) -> JobRecord:
+    return JobRecord(
+        source=RemotiveProvider.name,
+        country="",
+        title=(item.get("title") or "").strip(),
+        company=(item.get("company_name") or "").strip(),
+        location=(item.get("candidate_required_location") or "Remote").strip(),
+        description_snippet=(item.get("description") or "")[:240],
+        job_url=(item.get("url") or "").strip(),
+        apply_url=(item.get("url") or "").strip(),
+        posted_at=item.get("publication_date"),
+    )
+
+
+# Remotive asks clients to fetch the full list only a few times a day
+REMOTIVE_FEED = FeedSpec(
+    name="remotive",
+    url=URL,
+    items=lambda data: (data or {}).get("jobs") or [],
+    to_job=_to_job,
+    search_text=_search_text,
+    refresh_interval_s=6 * 3600.0,
+)
 
 
 class RemotiveProvider(JobProvider):
     name = "remotive"
+    capabilities = ProviderCapabilities(keyword=True, remote=True)
+
+    def serves_locally(self) -> bool:
+        mirror = get_feed_mirrors().get(self.name)
+        return bool(mirror and mirror.ready)
+
+    async def search(
+        self,
+        query: str,
+        limit: int = 50,
+        where: Optional[str] = None,
+        filters: Optional[SearchFilters] = None,
+    ) -> ProviderResult:
+        mirrored = mirrored_jobs(self.name, query, limit)
+        if mirrored is not None:
+            return ProviderResult(provider=self.name, jobs=mirrored)
 
-    async def search(self, query: str, limit: int = 50, where: Optional[str] = None) -> ProviderResult:
-        url = "https://remotive.io/api/remote-jobs"
         try:
-            async with httpx.AsyncClient(timeout=settings.REQUEST_TIMEOUT_S) as client:
-                r = await client.get(url, params={"search": query})
-                r.raise_for_status()
-                data = r.json()
+            client = get_http_client(URL)
+            r = await client.get(URL, params={"search": query}, timeout=settings.REQUEST_TIMEOUT_S)
+            r.raise_for_status()
+            data = r.json()
         except Exception as e:
             return ProviderResult(provider=self.name, jobs=[], error=str(e))
 
-        jobs: list[JobItem] = []
+        jobs: list[JobRecord] = []
         for item in (data.get("jobs") or []):
-            jobs.append(
-                JobItem(
-                    source=self.name,
-                    country="",
-                    title=(item.get("title") or "").strip(),
-                    company=(item.get("company_name") or "").strip(),
-                    location=(item.get("candidate_required_location") or "Remote").strip(),
-                    description_snippet=(item.get("description") or "")[:240],
-                    job_url=(item.get("url") or "").strip(),
-                    apply_url=(item.get("url") or "").strip(),
-                    posted_at=item.get("publication_date"),
-                    ats=None,
-                )
-            )
+            jobs.append(_to_job(item))
             if len(jobs) >= limit:
                 break
 
-        return ProviderResult(provider=self.name, jobs=jobs)
\ No newline at end of file
+        return ProviderResult(provider=self.name, jobs=jobs)
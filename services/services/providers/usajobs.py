@@ -1,36 +1,54 @@
 from __future__ import annotations
 
-import httpx
-from typing import Optional
+from typing import Any, Dict, Optional
 
-from .base import JobProvider, ProviderResult
-from ...responses.jobs import JobItem
+from .base import JobProvider, ProviderCapabilities, ProviderResult, SearchFilters
+from ...utils.job_record import JobRecord
 from ...core.config import settings
+from ...utils.http_clients import get_http_client
 
 
 class USAJobsProvider(JobProvider):
     name = "usajobs"
+    capabilities = ProviderCapabilities(keyword=True, location=True, recency=True, salary=True, paging=True)
 
-    async def search(self, query: str, limit: int = 50, where: Optional[str] = None) -> ProviderResult:
+    async def search(
+        self,
+        query: str,
+        limit: int = 50,
+        where: Optional[str] = None,
+        filters: Optional[SearchFilters] = None,
+        page_token: Optional[Dict[str, Any]] = None,
+    ) -> ProviderResult:
         # Requires API key for higher reliability, but endpoint works with headers.
         url = "https://data.usajobs.gov/api/search"
         headers = {
             "User-Agent": "HuntFlow/1.0",
             "Authorization-Key": getattr(settings, "USAJOBS_API_KEY", "") or "",
         }
-        params = {"Keyword": query}
-        if where:
-            params["LocationName"] = where
+        filters = filters or SearchFilters(location=where)
+        # Page size stays fixed across a walk so page numbers keep their meaning
+        page = int((page_token or {}).get("page") or 1)
+        page_size = int((page_token or {}).get("size") or min(500, limit))
+        params = {"Keyword": query, "Page": page, "ResultsPerPage": page_size}
+        if filters.location:
+            params["LocationName"] = filters.location
+        if filters.max_days_old:
+            params["DatePosted"] = min(60, filters.max_days_old)  # API maximum
+        if filters.salary_min is not None:
+            params["RemunerationMinimumAmount"] = filters.salary_min
+        if filters.salary_max is not None:
+            params["RemunerationMaximumAmount"] = filters.salary_max
 
         try:
-            async with httpx.AsyncClient(timeout=settings.REQUEST_TIMEOUT_S, headers=headers) as client:
-                r = await client.get(url, params=params)
-                r.raise_for_status()
-                data = r.json()
+            client = get_http_client(url)
+            r = await client.get(url, params=params, headers=headers, timeout=settings.REQUEST_TIMEOUT_S)
+            r.raise_for_status()
+            data = r.json()
         except Exception as e:
             return ProviderResult(provider=self.name, jobs=[], error=str(e))
 
-        jobs: list[JobItem] = []
+        jobs: list[JobRecord] = []
         items = (
             (((data.get("SearchResult") or {}).get("SearchResultItems")) or [])
         )
@@ -43,7 +61,7 @@ class USAJobsProvider(JobProvider):
             apply_url = (item.get("PositionURI") or "").strip()
 
             jobs.append(
-                JobItem(
+                JobRecord(
                     source=self.name,
                     country="us",
                     title=title,
@@ -53,10 +71,15 @@ class USAJobsProvider(JobProvider):
                     job_url=apply_url,
                     apply_url=apply_url,
                     posted_at=item.get("PublicationStartDate"),
-                    ats=None,
                 )
             )
             if len(jobs) >= limit:
                 break
 
-        return ProviderResult(provider=self.name, jobs=jobs)
\ No newline at end of file
+        if len(jobs) < len(items):
+            next_page = {"page": page, "size": page_size}        # trimmed: resume on this page
+        elif len(items) < page_size:
+            next_page = None
+        else:
+            next_page = {"page": page + 1, "size": page_size}
+        return ProviderResult(provider=self.name, jobs=jobs, next_page=next_page)
\ No newline at end of file
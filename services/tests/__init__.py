@@ -0,0 +1,9 @@
+"""
+tests/
+
+Focused tests for the search pipeline's stateful pieces (cursors, circuit
+breakers, rate limiting, caching, planning, dedupe and indexing).
+
+Usage:
+    python -m pytest -q services/tests
+"""
@@ -0,0 +1,117 @@
+from types import SimpleNamespace
+
+import pytest
+
+from services.utils import circuit_breaker
+from services.utils.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    BreakerPolicy,
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def make_breaker(**policy) -> CircuitBreaker:
+    defaults = dict(window_s=60.0, min_calls=3, failure_rate=0.6, cooldown_s=10.0, max_cooldown_s=25.0)
+    return CircuitBreaker("p", BreakerPolicy(**{**defaults, **policy}))
+
+
+def test_stays_closed_below_min_calls(clock):
+    breaker = make_breaker()
+    breaker.record_failure("boom")
+    breaker.record_failure("boom")
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_opens_at_failure_rate_and_refuses_calls(clock):
+    breaker = make_breaker()
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure("boom")
+    breaker.record_failure("boom")
+    assert breaker.state == CLOSED   # 2 of 4 failed
+    breaker.record_failure("boom")
+    assert breaker.state == OPEN     # 3 of 5 failed
+    assert not breaker.allow()
+    assert breaker.status()["retry_in_s"] == 10.0
+    assert breaker.status()["last_error"] == "boom"
+
+
+def test_old_outcomes_leave_the_window(clock):
+    breaker = make_breaker(min_calls=2)
+    breaker.record_failure()
+    clock[0] += 61
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    assert breaker.status()["window_calls"] == 1
+
+
+def test_half_open_admits_a_single_probe(clock):
+    breaker = make_breaker(min_calls=1)
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    clock[0] += 10
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_successful_probe_closes_and_resets_cooldown(clock):
+    breaker = make_breaker(min_calls=1)
+    breaker.record_failure()
+    clock[0] += 10
+    assert breaker.allow()
+    breaker.record_failure()          # probe failed: cooldown doubles
+    assert breaker.status()["retry_in_s"] == 20.0
+    clock[0] += 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.status()["window_calls"] == 1
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.status()["retry_in_s"] == 10.0
+
+
+def test_failed_probes_double_the_cooldown_up_to_the_cap(clock):
+    breaker = make_breaker(min_calls=1)
+    breaker.record_failure()
+    cooldowns = []
+    for _ in range(3):
+        clock[0] += 1000
+        assert breaker.allow()
+        breaker.record_failure()
+        cooldowns.append(breaker.status()["retry_in_s"])
+    assert cooldowns == [20.0, 25.0, 25.0]
+
+
+def test_release_frees_the_probe_slot(clock):
+    breaker = make_breaker(min_calls=1)
+    breaker.record_failure()
+    clock[0] += 10
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+
+
+def test_registry_shares_breakers_and_resets_one_or_all(clock):
+    registry = CircuitBreakerRegistry(BreakerPolicy(min_calls=1))
+    registry.get("a").record_failure()
+    registry.get("b").record_failure()
+    assert registry.get("a") is registry.get("a")
+    registry.reset("a")
+    assert [s["state"] for s in registry.status()] == [CLOSED, OPEN]
+    registry.reset()
+    assert [s["state"] for s in registry.status()] == [CLOSED, CLOSED]
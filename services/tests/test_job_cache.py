@@ -0,0 +1,83 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from services.utils import job_cache
+from services.utils.job_cache import JobCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(t=1_000_000.0)
+    monkeypatch.setattr(job_cache, "time", SimpleNamespace(time=lambda: now.t, monotonic=time.monotonic))
+    return now
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return JobCache(cache_dir=tmp_path, ttl_s=60, hard_ttl_s=600)
+
+
+def payload(n: int) -> dict:
+    return {"jobs": [{"title": f"job {n}-{i}", "company": "Acme"} for i in range(20)]}
+
+
+def disk_bytes(cache: JobCache) -> int:
+    return cache.stats()["disk"]["bytes"]
+
+
+def test_entries_go_from_fresh_to_stale_to_expired(cache, clock):
+    cache.set("python", payload(1), where="remote")
+    hit = cache.lookup("python", where="remote")
+    assert hit.data == payload(1) and not hit.stale
+
+    clock.t += 120
+    hit = cache.lookup("python", where="remote")
+    assert hit.stale and hit.age_s == pytest.approx(120)
+    assert cache.get("python", where="remote") is None
+
+    clock.t += 600
+    assert cache.lookup("python", where="remote") is None
+    assert cache.stats()["disk"]["entries"] == 0
+
+
+def test_disk_tier_serves_a_new_process(cache, tmp_path, clock):
+    cache.set("python", payload(1), providers=["remotive", "adzuna"])
+    other = JobCache(cache_dir=tmp_path, ttl_s=60, hard_ttl_s=600)
+    assert other.get("python", providers=["adzuna", "remotive"]) == payload(1)
+
+
+def test_prune_expired_removes_old_entries(cache, clock):
+    cache.set("old", payload(1))
+    clock.t += 500
+    cache.set("new", payload(2))
+    clock.t += 200
+    assert cache.prune_expired() == 1
+    assert cache.lookup("old") is None
+    assert cache.lookup("new") is not None
+
+
+def test_memory_hits_protect_entries_from_eviction(cache, clock):
+    cache.set("a", payload(1))
+    clock.t += 1
+    cache.set("b", payload(2))
+    cache.max_bytes = disk_bytes(cache) + 10
+
+    # "a" is only read from the memory tier, yet must count as recently used
+    clock.t += 1
+    assert cache.lookup("a").data == payload(1)
+    clock.t += 1
+    cache.set("c", payload(3))
+
+    fresh = JobCache(cache_dir=cache.cache_dir, ttl_s=60, hard_ttl_s=600)
+    assert fresh.lookup("b") is None
+    assert fresh.lookup("a").data == payload(1)
+    assert fresh.lookup("c").data == payload(3)
+
+
+def test_clear_all_empties_both_tiers(cache, clock):
+    cache.set("a", payload(1))
+    assert cache.clear_all() == 1
+    assert cache.lookup("a") is None
+    assert cache.stats()["memory"] == {"entries": 0, "bytes": 0}
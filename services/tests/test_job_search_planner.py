@@ -0,0 +1,228 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from services.engines import job_search_engine
+from services.engines.job_search_engine import PLANNER_MIN_SAMPLES, JobSearchEngine, _adapt_plan
+from services.services.providers import registry as provider_registry
+from services.services.providers.base import JobProvider, ProviderResult
+from services.services.providers.registry import ProviderRegistry
+from services.utils.circuit_breaker import CircuitBreakerRegistry
+from services.utils.job_cache import JobCache
+from services.utils.job_record import JobRecord
+from services.utils.job_store import JobStore
+from services.utils.provider_stats import ProviderStats
+from services.utils.rate_limiter import RateLimiter, RateLimitPolicy
+from services.utils.search_cursors import SearchCursorStore
+from services.utils.single_flight import SingleFlight
+
+
+class FakeProvider(JobProvider):
+    """Answers after `delay_s` with `count` distinct jobs."""
+
+    def __init__(self, name: str, delay_s: float = 0.0, count: int = 0) -> None:
+        self.name = name
+        self.delay_s = delay_s
+        self.count = count
+        self.calls = 0
+
+    async def search(self, query, limit=50, where=None, filters=None, **_) -> ProviderResult:
+        self.calls += 1
+        await asyncio.sleep(self.delay_s)
+        jobs = [
+            JobRecord(
+                source=self.name,
+                country="",
+                title=f"{self.name} engineer {i}",
+                company=f"{self.name} company {i}",
+                location="Remote",
+                job_url=f"https://{self.name}.example/jobs/{i}",
+            )
+            for i in range(min(self.count, limit))
+        ]
+        return ProviderResult(provider=self.name, jobs=jobs)
+
+
+@pytest.fixture
+def providers(monkeypatch):
+    """A registry holding only the fakes, installed as the default one."""
+    registry = ProviderRegistry(builtins={}, entry_points=False)
+    monkeypatch.setattr(provider_registry, "_default_registry", registry)
+
+    def install(name: str, delay_s: float = 0.0, count: int = 0) -> FakeProvider:
+        registry.register(name, lambda: FakeProvider(name, delay_s, count))
+        return registry.get(name)
+
+    return install
+
+
+@pytest.fixture
+def stats(tmp_path):
+    return ProviderStats(path=tmp_path / "stats.json", flush_interval_s=3600)
+
+
+@pytest.fixture
+def make_engine(tmp_path, stats):
+    def make() -> JobSearchEngine:
+        engine = JobSearchEngine(
+            provider_order=["adzuna", "remotive", "arbeitnow"],
+            limiter=RateLimiter(default_policy=RateLimitPolicy(0, 0, 0), policies={}),
+            stats=stats,
+            store=JobStore(tmp_path / "jobs.sqlite3"),
+            breakers=CircuitBreakerRegistry(),
+            cursors=SearchCursorStore(tmp_path / "cursors"),
+            flights=SingleFlight(),
+        )
+        engine._cache = JobCache(cache_dir=tmp_path / "cache")
+        return engine
+
+    return make
+
+
+def observe(stats: ProviderStats, provider: str, latency_s: float, unique: int, calls: int = PLANNER_MIN_SAMPLES) -> None:
+    for _ in range(calls):
+        stats.record(provider, "general", latency_s, returned=unique, unique=unique)
+
+
+def names(tiers: List[List[str]]) -> List[List[str]]:
+    return [list(tier) for tier in tiers]
+
+
+# ── ProviderStats ─────────────────────────────────────────────────────────────
+
+
+def test_stats_snapshot_aggregates_calls(stats):
+    stats.record("remotive", "general", 1.0, returned=10, unique=6)
+    stats.record("remotive", "general", 3.0, returned=10, unique=2, error=True)
+    snap = stats.snapshot("remotive", "general")
+    assert (snap.calls, snap.errors, snap.returned_jobs, snap.unique_jobs) == (2, 1, 20, 8)
+    assert snap.mean_unique == 4.0
+    assert snap.error_rate == 0.5
+    assert stats.snapshot("remotive", "remote").calls == 0
+
+
+def test_stats_survive_a_flush_and_reload(stats):
+    observe(stats, "remotive", 2.0, unique=8, calls=3)
+    stats.flush()
+    reloaded = ProviderStats(path=stats.path).snapshot("remotive", "general")
+    assert (reloaded.calls, reloaded.unique_jobs, reloaded.p50_s) == (3, 24, 2.0)
+    assert reloaded.unique_per_s == pytest.approx(4.0)
+
+
+def test_corrupt_stats_file_is_ignored(tmp_path):
+    path = tmp_path / "stats.json"
+    path.write_text("{not json", encoding="utf-8")
+    assert ProviderStats(path=path).all_snapshots() == []
+
+
+# ── _adapt_plan ───────────────────────────────────────────────────────────────
+
+
+def test_unobserved_providers_keep_their_tier_and_run_first(providers, stats):
+    for name in ("adzuna", "remotive", "arbeitnow"):
+        providers(name)
+    observe(stats, "adzuna", 1.0, unique=20)
+    observe(stats, "remotive", 1.0, unique=20, calls=PLANNER_MIN_SAMPLES - 1)
+
+    tiers, tier_nums, pruned = _adapt_plan([["adzuna", "remotive"], ["arbeitnow"]], "general", stats)
+    assert names(tiers) == [["remotive", "adzuna"], ["arbeitnow"]]
+    assert tier_nums == [1, 2]
+    assert pruned == []
+
+
+def test_providers_are_retiered_by_unique_jobs_per_second(providers, stats):
+    for name in ("adzuna", "remotive", "arbeitnow"):
+        providers(name)
+    observe(stats, "adzuna", 1.0, unique=2)         # 2/s: below 15% of the best
+    observe(stats, "remotive", 1.0, unique=4)       # 4/s: between 15% and 50%
+    observe(stats, "arbeitnow", 1.0, unique=20)     # 20/s: the best
+
+    tiers, tier_nums, pruned = _adapt_plan([["adzuna", "remotive"], ["arbeitnow"]], "general", stats)
+    assert names(tiers) == [["arbeitnow"], ["remotive"], ["adzuna"]]
+    assert tier_nums == [1, 2, 3]
+    assert pruned == []
+
+
+def test_low_yield_providers_are_pruned_unless_forced(providers, stats, monkeypatch):
+    for name in ("adzuna", "remotive"):
+        providers(name)
+    observe(stats, "adzuna", 1.0, unique=20)
+    observe(stats, "remotive", 1.0, unique=0)
+    monkeypatch.setattr(job_search_engine.random, "random", lambda: 0.99)   # no exploration call
+
+    tiers, _nums, pruned = _adapt_plan([["adzuna", "remotive"]], "general", stats)
+    assert names(tiers) == [["adzuna"]]
+    assert pruned == ["remotive"]
+
+    # Forced providers are only demoted
+    tiers, tier_nums, pruned = _adapt_plan([["adzuna", "remotive"]], "general", stats, forced=True)
+    assert names(tiers) == [["adzuna"], ["remotive"]]
+    assert tier_nums == [1, 3]
+    assert pruned == []
+
+
+def test_pruned_providers_still_get_exploration_calls(providers, stats, monkeypatch):
+    for name in ("adzuna", "remotive"):
+        providers(name)
+    observe(stats, "adzuna", 1.0, unique=20)
+    observe(stats, "remotive", 1.0, unique=0)
+    monkeypatch.setattr(job_search_engine.random, "random", lambda: 0.0)
+
+    _tiers, _nums, pruned = _adapt_plan([["adzuna", "remotive"]], "general", stats)
+    assert pruned == []
+
+
+# ── Engine: what gets recorded ────────────────────────────────────────────────
+
+
+def test_unobserved_provider_always_fits_the_budget(providers, make_engine, stats):
+    providers("adzuna")
+    providers("remotive")
+    engine = make_engine()
+    assert engine._fits_budget("remotive", "general", 0.01)
+
+    observe(stats, "remotive", 2.0, unique=5, calls=1)
+    assert not engine._fits_budget("remotive", "general", 1.0)
+    assert engine._fits_budget("remotive", "general", 3.0)
+
+
+def test_backlogged_jobs_count_as_unique(providers, make_engine, stats):
+    providers("adzuna")
+    providers("remotive", count=30)
+    engine = make_engine()
+
+    payload = asyncio.run(engine.search("engineer", limit=10, min_results=10, mode="exhaustive"))
+    assert len(payload["jobs"]) == 10
+    snap = stats.snapshot("remotive", "general")
+    assert (snap.calls, snap.returned_jobs, snap.unique_jobs) == (1, 30, 30)
+
+
+def test_calls_running_when_the_page_fills_still_record(providers, make_engine, stats):
+    providers("adzuna", count=20)
+    slow = providers("remotive", delay_s=0.05, count=20)
+    engine = make_engine()
+
+    async def run():
+        payload = await engine.search("engineer", limit=10, min_results=10, mode="exhaustive")
+        assert stats.snapshot("remotive", "general").calls == 0
+        await asyncio.gather(*engine._settling)
+        return payload
+
+    payload = asyncio.run(run())
+    assert {job.source for job in payload["jobs"]} == {"adzuna"}
+    assert slow.calls == 1
+    snap = stats.snapshot("remotive", "general")
+    assert (snap.calls, snap.returned_jobs, snap.unique_jobs) == (1, 20, 20)
+    assert snap.p50_s >= 0.05
+
+
+def test_deadline_records_an_error_sample(providers, make_engine, stats):
+    providers("adzuna")
+    providers("remotive", delay_s=1.0, count=5)
+    engine = make_engine()
+
+    payload = asyncio.run(engine.search("engineer", limit=10, min_results=10, deadline_s=0.05))
+    assert payload["partial"] is True
+    snap = stats.snapshot("remotive", "general")
+    assert (snap.calls, snap.errors, snap.unique_jobs) == (1, 1, 0)
@@ -0,0 +1,73 @@
+from services.utils.job_record import JobRecord
+from services.utils.near_dupes import NearDuplicateIndex, collapse_near_duplicates, merge_cluster
+
+
+def job(source: str, title: str, company: str = "Acme GmbH", location: str = "Berlin", **extra) -> JobRecord:
+    return JobRecord(source=source, country="de", title=title, company=company, location=location, **extra)
+
+
+def test_syndicated_posting_is_matched_across_sources():
+    index = NearDuplicateIndex()
+    assert index.add(0, job("adzuna", "Sr. Python Developer (m/w/d)")) is None
+    assert index.add(1, job("jobspy", "Senior Python Developer", company="Acme")) == 0
+
+
+def test_distinct_roles_stay_separate():
+    pairs = [
+        ("Data Scientist", "Senior Data Scientist"),
+        ("React Developer", "React Native Developer"),
+        ("Backend Engineer II", "Backend Engineer III"),
+    ]
+    for title, other in pairs:
+        index = NearDuplicateIndex()
+        index.add(0, job("adzuna", title))
+        assert index.add(1, job("jobspy", other)) is None, (title, other)
+
+
+def test_same_source_is_never_merged():
+    index = NearDuplicateIndex()
+    index.add(0, job("adzuna", "Python Developer", location="Berlin"))
+    assert index.add(1, job("adzuna", "Python Developer", location="Berlin")) is None
+
+
+def test_different_company_or_location_is_not_a_duplicate():
+    index = NearDuplicateIndex()
+    index.add(0, job("adzuna", "Python Developer", company="Acme", location="Berlin"))
+    assert index.find(job("jobspy", "Python Developer", company="Initech", location="Berlin")) is None
+    assert index.find(job("jobspy", "Python Developer", company="Acme", location="Munich")) is None
+    assert index.find(job("jobspy", "Python Developer", company="Acme", location="Remote")) == 0
+
+
+def test_records_without_title_or_company_are_not_indexed():
+    index = NearDuplicateIndex()
+    assert index.add(0, job("adzuna", "Python Developer", company="")) is None
+    assert index.add(1, job("jobspy", "Python Developer", company="")) is None
+    assert index.add(2, job("remotive", "")) is None
+
+
+def test_collapse_keeps_the_richest_record_at_the_first_position():
+    jobs = [
+        job("adzuna", "Python Developer", location="", job_url="https://adzuna.example/1"),
+        job("remotive", "Go Developer"),
+        job("jobspy", "Python Developer", description_snippet="Build APIs", posted_at="2026-10-01"),
+    ]
+    collapsed = collapse_near_duplicates(jobs)
+    assert [j.title for j in collapsed] == ["Python Developer", "Go Developer"]
+    merged = collapsed[0]
+    assert merged.source == "jobspy"
+    assert merged.description_snippet == "Build APIs"
+    assert merged.job_url == "https://adzuna.example/1"
+
+
+def test_merge_cluster_fills_gaps_from_the_other_members():
+    rich = job(
+        "jobspy",
+        "Python Developer",
+        location="",
+        description_snippet="Long description",
+        job_url="https://jobspy.example/1",
+        posted_at="2026-10-01",
+    )
+    sparse = job("adzuna", "Python Developer", apply_url="https://apply.example/1")
+    merged = merge_cluster([sparse, rich])
+    assert (merged.source, merged.location, merged.apply_url) == ("jobspy", "Berlin", "https://apply.example/1")
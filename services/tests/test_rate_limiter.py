@@ -0,0 +1,208 @@
+import asyncio
+import threading
+import time
+import uuid
+
+import pytest
+
+from services.utils import rate_limiter
+from services.utils.rate_limiter import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    MemoryBucketBackend,
+    RateLimitPolicy,
+    RateLimiter,
+    RateLimitScheduler,
+    RedisBucketBackend,
+    SQLiteBucketBackend,
+    TokenBucket,
+)
+
+
+def fresh_key() -> str:
+    return f"test:{uuid.uuid4().hex}"
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def make_backend(request, tmp_path):
+    """Factory for backends sharing one store, like two processes would."""
+    if request.param == "memory":
+        backend = MemoryBucketBackend()
+        return lambda: backend
+    if request.param == "sqlite":
+        return lambda: SQLiteBucketBackend(tmp_path / "buckets.sqlite3")
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    server = fakeredis.FakeServer()
+    return lambda: RedisBucketBackend(client=fakeredis.FakeRedis(server=server))
+
+
+def test_fresh_bucket_starts_full_and_goes_negative(make_backend):
+    backend, key = make_backend(), fresh_key()
+    assert backend.take(key, 1.0, 3.0, 2.0) == pytest.approx(3.0)
+    assert backend.take(key, 1.0, 3.0, 2.0) == pytest.approx(1.0, abs=0.01)
+    assert backend.take(key, 1.0, 3.0, 0.0) == pytest.approx(-1.0, abs=0.01)
+
+
+def test_refill_is_capped_at_burst(make_backend):
+    backend, key = make_backend(), fresh_key()
+    backend.take(key, 100.0, 2.0, 2.0)
+    time.sleep(0.05)
+    assert backend.take(key, 100.0, 2.0, 0.0) == pytest.approx(2.0)
+
+
+def test_refill_follows_the_rate(make_backend):
+    backend, key = make_backend(), fresh_key()
+    backend.take(key, 10.0, 5.0, 5.0)
+    time.sleep(0.2)
+    assert backend.take(key, 10.0, 5.0, 0.0) == pytest.approx(2.0, abs=0.6)
+
+
+def test_negative_take_refunds(make_backend):
+    backend, key = make_backend(), fresh_key()
+    backend.take(key, 0.001, 2.0, 2.0)
+    backend.take(key, 0.001, 2.0, -1.5)
+    assert backend.take(key, 0.001, 2.0, 0.0) == pytest.approx(1.5, abs=0.01)
+
+
+def test_instances_share_the_budget(make_backend):
+    key = fresh_key()
+    first, second = make_backend(), make_backend()
+    first.take(key, 0.001, 2.0, 2.0)
+    assert second.take(key, 0.001, 2.0, 1.0) == pytest.approx(0.0, abs=0.01)
+
+
+def test_blocking_backends_take_off_the_event_loop(make_backend):
+    backend, key = make_backend(), fresh_key()
+    threads = []
+    take = backend.take
+
+    def spy(*args):
+        threads.append(threading.get_ident())
+        return take(*args)
+
+    backend.take = spy
+    asyncio.run(TokenBucket(100.0, burst=1.0, key=key, backend=backend).acquire())
+    assert len(threads) == 1
+    assert (threads[0] != threading.get_ident()) == backend.blocking
+
+
+def test_token_bucket_paces_after_the_burst():
+    bucket = TokenBucket(20.0, burst=2.0)
+
+    async def run():
+        return [await bucket.acquire() for _ in range(3)]
+
+    waits = asyncio.run(run())
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.05, abs=0.01)
+
+
+def test_cancelled_acquire_gives_its_token_back():
+    backend, key = MemoryBucketBackend(), fresh_key()
+    bucket = TokenBucket(1.0, burst=1.0, key=key, backend=backend)
+
+    async def run():
+        await bucket.acquire()
+        waiter = asyncio.ensure_future(bucket.acquire())
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    asyncio.run(run())
+    # Only the first token is spent: the level is back near 0, not -1
+    assert backend.take(key, 1.0, 1.0, 0.0) == pytest.approx(0.0, abs=0.05)
+
+
+def test_expected_wait_does_no_backend_io():
+    calls = []
+
+    class CountingBackend(MemoryBucketBackend):
+        def take(self, *args):
+            calls.append(args)
+            return super().take(*args)
+
+    bucket = TokenBucket(1.0, burst=1.0, key=fresh_key(), backend=CountingBackend())
+    assert bucket.expected_wait() == 0.0
+    asyncio.run(bucket.acquire())
+    assert bucket.expected_wait() == pytest.approx(1.0, abs=0.05)
+    assert len(calls) == 1
+
+
+def test_zero_delay_policy_never_waits():
+    limiter = RateLimiter(default_policy=RateLimitPolicy(0, 0, 0), policies={}, backend=MemoryBucketBackend())
+    assert asyncio.run(limiter.wait(key=fresh_key())) == 0.0
+
+
+def test_limiter_spaces_calls_by_the_policy_gap():
+    policy = RateLimitPolicy(min_delay_s=0.05, max_delay_s=0.05, jitter_s=0.0)
+    limiter = RateLimiter(
+        default_policy=policy, policies={}, backend=MemoryBucketBackend(), scheduler=RateLimitScheduler()
+    )
+    key = fresh_key()
+
+    async def run():
+        return [await limiter.wait(key=key) for _ in range(3)]
+
+    waits = asyncio.run(run())
+    assert waits[0] == 0.0
+    assert waits[1] == pytest.approx(0.05, abs=0.02)
+    assert waits[2] == pytest.approx(0.05, abs=0.02)
+
+
+def test_scheduler_serves_interactive_before_queued_background():
+    scheduler = RateLimitScheduler()
+    order = []
+
+    async def call(name, priority, hold=0.0):
+        async def reserve():
+            order.append(name)
+            await asyncio.sleep(hold)
+
+        await scheduler.run("k", priority, reserve)
+
+    async def run():
+        first = asyncio.ensure_future(call("first", PRIORITY_BACKGROUND, hold=0.02))
+        await asyncio.sleep(0)
+        background = [asyncio.ensure_future(call(f"bg{i}", PRIORITY_BACKGROUND)) for i in range(3)]
+        await asyncio.sleep(0)
+        interactive = asyncio.ensure_future(call("interactive", PRIORITY_INTERACTIVE))
+        await asyncio.sleep(0)
+        assert scheduler.depth("k") == 4
+        await asyncio.gather(first, interactive, *background)
+
+    asyncio.run(run())
+    assert order == ["first", "interactive", "bg0", "bg1", "bg2"]
+    assert scheduler.stats()["k"]["max_queued"] == 4
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    scheduler = RateLimitScheduler()
+
+    async def hold():
+        await asyncio.sleep(0.02)
+
+    async def run():
+        first = asyncio.ensure_future(scheduler.run("k", PRIORITY_INTERACTIVE, hold))
+        await asyncio.sleep(0)
+        queued = asyncio.ensure_future(scheduler.run("k", PRIORITY_INTERACTIVE, hold))
+        await asyncio.sleep(0)
+        queued.cancel()
+        await asyncio.gather(first, queued, return_exceptions=True)
+        assert scheduler.depth("k") == 0
+        await asyncio.wait_for(scheduler.run("k", PRIORITY_INTERACTIVE, hold), timeout=1.0)
+
+    asyncio.run(run())
+
+
+def test_failing_backend_falls_back_to_local_limiting():
+    class Broken(MemoryBucketBackend):
+        blocking = True
+
+        def take(self, *args):
+            raise ConnectionError("down")
+
+    bucket = TokenBucket(1.0, burst=1.0, key=fresh_key(), backend=Broken())
+    assert asyncio.run(bucket.acquire()) == 0.0
+    assert rate_limiter._observed[bucket.key][0] == pytest.approx(0.0, abs=0.01)
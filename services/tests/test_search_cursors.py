@@ -0,0 +1,74 @@
+import asyncio
+import os
+
+from services.utils.search_cursors import SearchCursorStore
+
+
+def test_round_trip(tmp_path):
+    store = SearchCursorStore(tmp_path)
+    state = {"query": "python", "page": 2, "seen": ["a", "b"], "backlog": [{"title": "x"}]}
+    cursor = store.create(state)
+    assert cursor
+    assert store.load(cursor) == state
+    assert store.load(cursor) == state   # a retried page sees the same snapshot
+
+
+def test_every_create_is_a_new_cursor(tmp_path):
+    store = SearchCursorStore(tmp_path)
+    first, second = store.create({"page": 2}), store.create({"page": 2})
+    assert first != second
+    assert store.load(first) == store.load(second) == {"page": 2}
+
+
+def test_unknown_or_malformed_cursors_load_as_none(tmp_path):
+    store = SearchCursorStore(tmp_path)
+    assert store.load("") is None
+    assert store.load("../../etc/passwd") is None
+    assert store.load("A" * 24) is None
+    assert not store.alive("A" * 24)
+
+
+def test_expired_cursor_is_removed_on_load(tmp_path):
+    store = SearchCursorStore(tmp_path, ttl_s=0.0)
+    cursor = store.create({"page": 2})
+    (tmp_path / f"{cursor}.json").write_text('{"created_at": 0, "state": {"page": 2}}', encoding="utf-8")
+    assert store.load(cursor) is None
+    assert not (tmp_path / f"{cursor}.json").exists()
+
+
+def test_corrupt_cursor_loads_as_none(tmp_path):
+    store = SearchCursorStore(tmp_path)
+    cursor = store.create({"page": 2})
+    (tmp_path / f"{cursor}.json").write_text("{not json", encoding="utf-8")
+    assert store.load(cursor) is None
+
+
+def test_alive_follows_the_ttl(tmp_path):
+    store = SearchCursorStore(tmp_path, ttl_s=60.0)
+    cursor = store.create({"page": 2})
+    assert store.alive(cursor)
+    os.utime(tmp_path / f"{cursor}.json", (0, 0))
+    assert not store.alive(cursor)
+
+
+def test_prune_expired_keeps_live_cursors(tmp_path):
+    store = SearchCursorStore(tmp_path, ttl_s=60.0)
+    old, live = store.create({"page": 2}), store.create({"page": 3})
+    os.utime(tmp_path / f"{old}.json", (0, 0))
+    assert store.prune_expired() == 1
+    assert store.load(old) is None
+    assert store.load(live) == {"page": 3}
+
+
+def test_background_pruning(tmp_path):
+    store = SearchCursorStore(tmp_path, ttl_s=60.0)
+    old = store.create({"page": 2})
+    os.utime(tmp_path / f"{old}.json", (0, 0))
+
+    async def run() -> None:
+        await store.start_pruning(interval_s=0.01)
+        await asyncio.sleep(0.05)
+        await store.stop_pruning()
+
+    asyncio.run(run())
+    assert not (tmp_path / f"{old}.json").exists()
@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+
+from services.utils.search_index import BM25Index, rank_jobs, tokenize
+
+
+def make_index() -> BM25Index:
+    index = BM25Index()
+    index.add("py", {"title": "Python Developer", "company": "Acme", "description_snippet": "Django and FastAPI"})
+    index.add("go", {"title": "Go Developer", "company": "Initech", "description_snippet": "Python tooling a plus"})
+    index.add("pm", {"title": "Product Manager", "company": "Globex"})
+    return index
+
+
+def test_tokenize_drops_stopwords_and_keeps_symbols():
+    assert tokenize("Head of C++ and C# in the Cloud") == ["head", "c++", "c#", "cloud"]
+
+
+def test_title_matches_outrank_description_matches():
+    hits = make_index().search("python")
+    assert [doc_id for doc_id, _score in hits] == ["py", "go"]
+    assert hits[0][1] > hits[1][1] > 0
+
+
+def test_require_all_and_candidates_narrow_the_results():
+    index = make_index()
+    assert [d for d, _s in index.search("python developer", require_all=True)] == ["py", "go"]
+    assert [d for d, _s in index.search("python manager", require_all=True)] == []
+    assert [d for d, _s in index.search("developer", candidates={"go"})] == ["go"]
+
+
+def test_k_limits_the_results():
+    assert len(make_index().search("developer", k=1)) == 1
+
+
+def test_remove_and_replace_keep_the_index_consistent():
+    index = make_index()
+    assert index.remove("py")
+    assert not index.remove("py")
+    assert "py" not in index and len(index) == 2
+    assert [d for d, _s in index.search("django")] == []
+
+    index.add("go", {"title": "Rust Developer"})
+    assert [d for d, _s in index.search("go")] == []
+    assert [d for d, _s in index.search("rust")] == ["go"]
+
+    index.clear()
+    assert len(index) == 0 and index.search("rust") == []
+
+
+def test_rank_jobs_puts_matches_first_and_keeps_the_rest_in_order():
+    jobs = [
+        SimpleNamespace(title="Office Manager", company="A"),
+        SimpleNamespace(title="Barista", company="B"),
+        SimpleNamespace(title="Senior Python Engineer", company="C"),
+    ]
+    assert [j.title for j in rank_jobs("python engineer", jobs)] == [
+        "Senior Python Engineer",
+        "Office Manager",
+        "Barista",
+    ]
+    assert rank_jobs("the", jobs) == jobs
@@ -0,0 +1,241 @@
+"""
+utils/cache_codec.py
+
+Binary encoding of cache envelopes.
+
+Layout of an encoded entry:
+
+    b"HFC" | schema version (1 byte) | codec id (1 byte) | compression id (1 byte) | body
+
+The body is the serialised envelope.  A list of jobs under `data["jobs"]`
+(pipeline JobRecords or a registered pydantic model) is stored column-wise:
+one field-name list plus one row of values per job, tagged with the
+registered type name, and decoded straight back into instances of that type
+(no lossy `str()` of the objects).  JobRecords are rebuilt by their plain
+constructor.  Pydantic models go through `model_validate`, because for these
+flat models pydantic's compiled validator is faster than `model_construct`,
+and it restores typed fields such as datetimes.
+
+Codecs: msgpack > orjson > json, picked by JOB_CACHE_CODEC ("auto" takes the
+first one installed).  Compression: zstd when JOB_CACHE_COMPRESSION allows it
+and `zstandard` is installed.  Entries written by any codec decode with any
+configuration that has the needed libraries; plain JSON entries from older
+versions are still read.
+
+Usage:
+    codec = get_default_codec()
+    raw = codec.encode(envelope)
+    envelope = codec.decode(raw)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from dataclasses import fields as dataclass_fields, is_dataclass
+from typing import Any, Callable, Dict, List, Optional, Type
+
+from services.responses.jobs import JobItem
+from services.utils.job_record import JOB_RECORD_FIELDS, JobRecord
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # optional dependency
+    orjson = None
+
+try:
+    import msgpack  # type: ignore
+except ImportError:  # optional dependency
+    msgpack = None
+
+try:
+    import zstandard  # type: ignore
+except ImportError:  # optional dependency
+    zstandard = None
+
+log = logging.getLogger(__name__)
+
+MAGIC = b"HFC"
+SCHEMA_VERSION = 1
+_HEADER_LEN = len(MAGIC) + 3
+
+CODEC_JSON, CODEC_ORJSON, CODEC_MSGPACK = 1, 2, 3
+COMPRESS_NONE, COMPRESS_ZSTD = 0, 1
+
+_CODEC_NAMES = {"json": CODEC_JSON, "orjson": CODEC_ORJSON, "msgpack": CODEC_MSGPACK}
+_COMPRESS_NAMES = {"none": COMPRESS_NONE, "zstd": COMPRESS_ZSTD}
+
+# Bodies smaller than this are not worth a compression frame
+_MIN_COMPRESS_BYTES = 1024
+_ZSTD_LEVEL = 3
+
+# ── Job model registry ────────────────────────────────────────────────────────
+# "job" (the pydantic JobItem) is what entries held before the pipeline moved to JobRecord
+_JOB_MODELS: Dict[str, Type[Any]] = {"job": JobItem, "record": JobRecord}
+_JOB_TAGS: Dict[Type[Any], str] = {JobItem: "job", JobRecord: "record"}
+
+
+def register_job_model(tag: str, model: Type[Any]) -> None:
+    """Let cached job lists of `model` (a pydantic model or dataclass) round-trip as `model` instances."""
+    _JOB_MODELS[tag] = model
+    _JOB_TAGS[model] = tag
+
+
+def _fields_of(model: Type[Any]) -> List[str]:
+    if model is JobRecord:
+        return list(JOB_RECORD_FIELDS)
+    if is_dataclass(model):
+        return [f.name for f in dataclass_fields(model)]
+    return list(model.model_fields)
+
+
+def _plain(value: Any) -> Any:
+    """Fallback for values the serialisers do not know."""
+    if isinstance(value, JobRecord):
+        return value.to_dict()
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def _pack_jobs(jobs: Any) -> Any:
+    if not isinstance(jobs, list) or not jobs:
+        return jobs
+    tag = _JOB_TAGS.get(type(jobs[0]))
+    if tag is None or any(type(job) is not type(jobs[0]) for job in jobs):
+        return jobs
+    fields = _fields_of(type(jobs[0]))
+    return {
+        "__jobs__": tag,
+        "fields": fields,
+        "rows": [[_field(job, f) for f in fields] for job in jobs],
+    }
+
+
+def _field(job: Any, name: str) -> Any:
+    value = getattr(job, name)
+    return value if value is None or isinstance(value, (str, int, float, bool)) else _plain(value)
+
+
+def _unpack_jobs(packed: Any) -> Any:
+    if not isinstance(packed, dict) or "__jobs__" not in packed:
+        return packed
+    model = _JOB_MODELS.get(packed["__jobs__"])
+    fields = packed["fields"]
+    if model is None:
+        return [dict(zip(fields, row)) for row in packed["rows"]]
+    if is_dataclass(model):
+        return [model(**dict(zip(fields, row))) for row in packed["rows"]]
+    return [model.model_validate(dict(zip(fields, row))) for row in packed["rows"]]
+
+
+def _map_jobs(envelope: Any, fn: Callable[[Any], Any]) -> Any:
+    data = envelope.get("data") if isinstance(envelope, dict) else None
+    if not isinstance(data, dict) or "jobs" not in data:
+        return envelope
+    return {**envelope, "data": {**data, "jobs": fn(data["jobs"])}}
+
+
+# ── Serialisers ───────────────────────────────────────────────────────────────
+
+
+def _dumps(codec: int, obj: Any) -> bytes:
+    if codec == CODEC_MSGPACK:
+        return msgpack.packb(obj, default=_plain, use_bin_type=True)
+    if codec == CODEC_ORJSON:
+        return orjson.dumps(obj, default=_plain, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_plain, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(codec: int, body: bytes) -> Any:
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise ValueError("entry needs the `msgpack` package")
+        return msgpack.unpackb(body, raw=False, strict_map_key=False)
+    if codec == CODEC_ORJSON and orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def _available(codec: int) -> bool:
+    return {CODEC_MSGPACK: msgpack, CODEC_ORJSON: orjson}.get(codec, json) is not None
+
+
+class CacheCodec:
+    """Encodes envelopes with one codec/compression; decodes any supported entry."""
+
+    def __init__(self, codec: str = "auto", compression: str = "auto") -> None:
+        self.codec = self._pick_codec(codec)
+        self.compression = self._pick_compression(compression)
+        self._compressor = zstandard.ZstdCompressor(level=_ZSTD_LEVEL) if self.compression == COMPRESS_ZSTD else None
+        self._decompressor = zstandard.ZstdDecompressor() if zstandard is not None else None
+
+    @property
+    def name(self) -> str:
+        codec = next(n for n, c in _CODEC_NAMES.items() if c == self.codec)
+        return f"{codec}+zstd" if self.compression == COMPRESS_ZSTD else codec
+
+    def encode(self, envelope: Dict[str, Any]) -> bytes:
+        body = _dumps(self.codec, _map_jobs(envelope, _pack_jobs))
+        compression = COMPRESS_NONE
+        if self._compressor is not None and len(body) >= _MIN_COMPRESS_BYTES:
+            body = self._compressor.compress(body)
+            compression = COMPRESS_ZSTD
+        return MAGIC + bytes((SCHEMA_VERSION, self.codec, compression)) + body
+
+    def decode(self, raw: bytes) -> Dict[str, Any]:
+        """Raises ValueError for entries this process cannot read."""
+        if not raw.startswith(MAGIC):
+            return json.loads(raw)   # plain JSON entry from an older version
+        version, codec, compression = raw[len(MAGIC): _HEADER_LEN]
+        if version != SCHEMA_VERSION:
+            raise ValueError(f"unsupported cache schema version {version}")
+        body = raw[_HEADER_LEN:]
+        if compression == COMPRESS_ZSTD:
+            if self._decompressor is None:
+                raise ValueError("entry needs the `zstandard` package")
+            body = self._decompressor.decompress(body)
+        elif compression != COMPRESS_NONE:
+            raise ValueError(f"unknown compression id {compression}")
+        return _map_jobs(_loads(codec, body), _unpack_jobs)
+
+    @staticmethod
+    def _pick_codec(name: str) -> int:
+        name = (name or "auto").strip().lower()
+        if name in _CODEC_NAMES:
+            codec = _CODEC_NAMES[name]
+            if _available(codec):
+                return codec
+            log.warning("cache_codec: %s is not installed – choosing automatically", name)
+        for codec in (CODEC_MSGPACK, CODEC_ORJSON):
+            if _available(codec):
+                return codec
+        return CODEC_JSON
+
+    @staticmethod
+    def _pick_compression(name: str) -> int:
+        name = (name or "auto").strip().lower()
+        if _COMPRESS_NAMES.get(name) == COMPRESS_NONE:
+            return COMPRESS_NONE
+        if zstandard is None:
+            if name == "zstd":
+                log.warning("cache_codec: zstandard is not installed – storing uncompressed")
+            return COMPRESS_NONE
+        return COMPRESS_ZSTD
+
+
+# ── Module-level singleton ────────────────────────────────────────────────────
+_default_codec: Optional[CacheCodec] = None
+
+
+def get_default_codec() -> CacheCodec:
+    global _default_codec
+    if _default_codec is None:
+        _default_codec = CacheCodec(
+            codec=os.getenv("JOB_CACHE_CODEC", "auto"),
+            compression=os.getenv("JOB_CACHE_COMPRESSION", "auto"),
+        )
+    return _default_codec
@@ -0,0 +1,193 @@
+"""
+utils/circuit_breaker.py
+
+Per-provider circuit breakers.
+
+closed     calls flow; outcomes are kept for a sliding window and the breaker
+           opens once the window holds enough calls with a high failure rate
+open       calls are refused instantly until the cooldown has passed
+half-open  one probe call is let through; success closes the breaker,
+           failure re-opens it with a doubled cooldown (capped)
+
+A provider that is not installed, lacks credentials or is down therefore
+costs nothing on the hot path instead of three retried attempts per search.
+
+Usage:
+    breaker = get_default_breakers().get("usajobs")
+    if not breaker.allow():
+        ...                                   # report "circuit_open"
+    try:
+        result = await call()
+        breaker.record_success() if not result.error else breaker.record_failure()
+    except asyncio.CancelledError:
+        breaker.release()                     # neither success nor failure
+        raise
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass
+class BreakerPolicy:
+    window_s: float = 300.0        # outcomes older than this are forgotten
+    min_calls: int = 3             # never open on fewer calls than this
+    failure_rate: float = 0.6      # open at or above this failure ratio
+    cooldown_s: float = 60.0       # first open period
+    max_cooldown_s: float = 900.0  # cap for repeated re-opens
+
+
+class CircuitBreaker:
+    """
+    Breaker for one provider.  Single event loop use; not thread-safe.
+    """
+
+    def __init__(self, name: str, policy: Optional[BreakerPolicy] = None) -> None:
+        self.name = name
+        self.policy = policy or BreakerPolicy()
+        self._state = CLOSED
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._opened_at = 0.0
+        self._cooldown_s = self.policy.cooldown_s
+        self._probe_in_flight = False
+        self.last_error: Optional[str] = None
+
+    # ── Public API ────────────────────────────────────────────────────────────
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self._cooldown_s:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go through now.  In half-open, admits a single probe."""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        if self._state == HALF_OPEN:
+            log.info("circuit_breaker: %s closed after a successful probe", self.name)
+            self._state = CLOSED
+            self._outcomes.clear()
+            self._cooldown_s = self.policy.cooldown_s
+        self._probe_in_flight = False
+        self._push(True)
+
+    def record_failure(self, error: Optional[str] = None) -> None:
+        self.last_error = error or self.last_error
+        self._probe_in_flight = False
+        if self._state == HALF_OPEN:
+            self._open(min(self.policy.max_cooldown_s, self._cooldown_s * 2))
+            return
+        self._push(False)
+        if self._state == CLOSED and self._should_open():
+            self._open(self.policy.cooldown_s)
+
+    def release(self) -> None:
+        """Forget an admitted call without an outcome (e.g. cancelled by a deadline)."""
+        self._probe_in_flight = False
+
+    def reset(self) -> None:
+        self._state = CLOSED
+        self._outcomes.clear()
+        self._cooldown_s = self.policy.cooldown_s
+        self._probe_in_flight = False
+        self.last_error = None
+
+    def status(self) -> Dict[str, Any]:
+        self._trim()
+        state = self.state
+        calls = len(self._outcomes)
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        retry_in = None
+        if state == OPEN:
+            retry_in = round(max(0.0, self._cooldown_s - (time.monotonic() - self._opened_at)), 1)
+        return {
+            "provider": self.name,
+            "state": state,
+            "window_calls": calls,
+            "window_failures": failures,
+            "failure_rate": round(failures / calls, 3) if calls else 0.0,
+            "retry_in_s": retry_in,
+            "last_error": self.last_error,
+        }
+
+    # ── Internals ─────────────────────────────────────────────────────────────
+
+    def _push(self, ok: bool) -> None:
+        self._outcomes.append((time.monotonic(), ok))
+        self._trim()
+
+    def _trim(self) -> None:
+        cutoff = time.monotonic() - self.policy.window_s
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            self._outcomes.popleft()
+
+    def _should_open(self) -> bool:
+        calls = len(self._outcomes)
+        if calls < self.policy.min_calls:
+            return False
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        return failures / calls >= self.policy.failure_rate
+
+    def _open(self, cooldown_s: float) -> None:
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._cooldown_s = cooldown_s
+        log.warning(
+            "circuit_breaker: %s open for %.0fs (last error: %s)",
+            self.name,
+            cooldown_s,
+            self.last_error,
+        )
+
+
+class CircuitBreakerRegistry:
+    """One breaker per provider name, created on first use."""
+
+    def __init__(self, policy: Optional[BreakerPolicy] = None) -> None:
+        self.policy = policy or BreakerPolicy()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = self._breakers[name] = CircuitBreaker(name, self.policy)
+        return breaker
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [self._breakers[name].status() for name in sorted(self._breakers)]
+
+    def reset(self, name: Optional[str] = None) -> None:
+        targets = [self._breakers[name]] if name in self._breakers else ([] if name else list(self._breakers.values()))
+        for breaker in targets:
+            breaker.reset()
+
+
+# ── Module-level singleton ────────────────────────────────────────────────────
+_default_breakers: Optional[CircuitBreakerRegistry] = None
+
+
+def get_default_breakers() -> CircuitBreakerRegistry:
+    global _default_breakers
+    if _default_breakers is None:
+        _default_breakers = CircuitBreakerRegistry()
+    return _default_breakers
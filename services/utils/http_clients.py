@@ -0,0 +1,205 @@
+"""
+utils/http_clients.py
+
+Shared, lifecycle-managed httpx.AsyncClient pools (one pool per host).
+
+Every provider used to open a fresh AsyncClient per search, paying for DNS
+and TLS handshakes on every call.  The registry keeps one keep-alive pool per
+host instead, with per-host connection limits and optional HTTP/2.
+
+Usage:
+    client = get_http_client("https://remotive.io/api/remote-jobs")
+    r = await client.get(url, params={"search": "python"})
+
+    # app startup / shutdown
+    await get_default_registry().open()
+    await get_default_registry().aclose()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+from services.core.config import settings
+
+log = logging.getLogger(__name__)
+
+DEFAULT_UA = "HuntFlow/1.0"
+
+
+@dataclass
+class HostPoolLimits:
+    max_connections: int = settings.HTTP_MAX_CONNECTIONS_PER_HOST
+    max_keepalive_connections: int = settings.HTTP_MAX_KEEPALIVE_PER_HOST
+
+
+# ── Per-host limits ───────────────────────────────────────────────────────────
+# Fan-out heavy APIs get a bigger pool; full-feed endpoints only ever need one
+# or two connections.
+HOST_LIMITS: Dict[str, HostPoolLimits] = {
+    "api.adzuna.com": HostPoolLimits(max_connections=16, max_keepalive_connections=8),
+    "www.themuse.com": HostPoolLimits(max_connections=6, max_keepalive_connections=4),
+    "data.usajobs.gov": HostPoolLimits(max_connections=4, max_keepalive_connections=2),
+    "remoteok.com": HostPoolLimits(max_connections=2, max_keepalive_connections=1),
+    "www.arbeitnow.com": HostPoolLimits(max_connections=2, max_keepalive_connections=1),
+}
+
+# Hosts warmed up when the app starts
+PROVIDER_HOSTS = [
+    "https://api.adzuna.com",
+    "https://remotive.io",
+    "https://himalayas.app",
+    "https://jobicy.com",
+    "https://www.arbeitnow.com",
+    "https://remoteok.com",
+    "https://www.themuse.com",
+    "https://data.usajobs.gov",
+]
+
+
+def _h2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def _host_of(url: str) -> str:
+    try:
+        parsed = urlparse(url)
+        return f"{parsed.scheme or 'https'}://{parsed.netloc.lower()}"
+    except Exception:
+        return "unknown"
+
+
+class HttpClientRegistry:
+    """
+    Hands out one pooled AsyncClient per host.
+
+    Clients are bound to the event loop that created them; when a different
+    loop asks for the same host (e.g. a CLI run via asyncio.run), a fresh
+    client is created for that loop and the old one is closed: on its own
+    loop if that is still running elsewhere, otherwise on the new one.
+    """
+
+    def __init__(
+        self,
+        timeout_s: float = float(settings.REQUEST_TIMEOUT_S),
+        keepalive_expiry_s: float = settings.HTTP_KEEPALIVE_EXPIRY_S,
+        http2: bool = settings.HTTP2_ENABLED,
+        host_limits: Optional[Dict[str, HostPoolLimits]] = None,
+        default_limits: Optional[HostPoolLimits] = None,
+        transport_factory: Optional[Callable[[str, httpx.Limits], httpx.AsyncBaseTransport]] = None,
+    ) -> None:
+        self.timeout_s = timeout_s
+        self.keepalive_expiry_s = keepalive_expiry_s
+        self.http2 = http2 and _h2_available()
+        if http2 and not self.http2:
+            log.warning("http_clients: HTTP/2 requested but 'h2' is not installed – using HTTP/1.1")
+        self.host_limits = dict(HOST_LIMITS if host_limits is None else host_limits)
+        self.default_limits = default_limits or HostPoolLimits()
+        # (netloc, pool limits) -> transport; lets benchmarks send provider traffic to a local stand-in
+        self.transport_factory = transport_factory
+        self._clients: Dict[str, Tuple[httpx.AsyncClient, asyncio.AbstractEventLoop]] = {}
+        self._retiring: Set[asyncio.Future] = set()
+
+    # ── Public API ────────────────────────────────────────────────────────────
+
+    def client_for(self, url: str) -> httpx.AsyncClient:
+        """Return the pooled client for the host of `url`, creating it if needed."""
+        host = _host_of(url)
+        loop = asyncio.get_running_loop()
+
+        entry = self._clients.get(host)
+        if entry is not None:
+            client, owner = entry
+            if owner is loop and not client.is_closed:
+                return client
+            if not client.is_closed:
+                self._retire(host, client, owner, loop)
+
+        client = self._build_client(host)
+        self._clients[host] = (client, loop)
+        log.debug("http_clients: opened pool for %s", host)
+        return client
+
+    async def open(self, hosts: Iterable[str] = PROVIDER_HOSTS) -> None:
+        """Create pools for the known provider hosts up front."""
+        for host in hosts:
+            self.client_for(host)
+
+    async def aclose(self) -> None:
+        """Close every pool owned by the running loop."""
+        loop = asyncio.get_running_loop()
+        for host, (client, owner) in list(self._clients.items()):
+            if owner is not loop:
+                continue
+            try:
+                await client.aclose()
+            except Exception as exc:
+                log.warning("http_clients: error closing pool for %s – %s", host, exc)
+            self._clients.pop(host, None)
+
+    def hosts(self) -> list[str]:
+        return sorted(self._clients)
+
+    # ── Internals ─────────────────────────────────────────────────────────────
+
+    def _retire(
+        self,
+        host: str,
+        client: httpx.AsyncClient,
+        owner: asyncio.AbstractEventLoop,
+        loop: asyncio.AbstractEventLoop,
+    ) -> None:
+        """Schedule closing a pool that belongs to another event loop."""
+        if owner.is_running() and not owner.is_closed():
+            asyncio.run_coroutine_threadsafe(self._close_quietly(host, client), owner)
+            return
+        task = loop.create_task(self._close_quietly(host, client))
+        self._retiring.add(task)
+        task.add_done_callback(self._retiring.discard)
+
+    @staticmethod
+    async def _close_quietly(host: str, client: httpx.AsyncClient) -> None:
+        try:
+            await client.aclose()
+            log.debug("http_clients: closed pool for %s left by another event loop", host)
+        except Exception as exc:
+            log.warning("http_clients: error closing pool for %s – %s", host, exc)
+
+    def _build_client(self, host: str) -> httpx.AsyncClient:
+        netloc = urlparse(host).netloc
+        limits = self.host_limits.get(netloc, self.default_limits)
+        pool_limits = httpx.Limits(
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry_s,
+        )
+        return httpx.AsyncClient(
+            timeout=self.timeout_s,
+            headers={"User-Agent": DEFAULT_UA},
+            follow_redirects=True,
+            http2=self.http2,
+            limits=pool_limits,
+            transport=self.transport_factory(netloc, pool_limits) if self.transport_factory else None,
+        )
+
+
+# ── Module-level singleton ────────────────────────────────────────────────────
+_default_registry: Optional[HttpClientRegistry] = None
+
+
+def get_default_registry() -> HttpClientRegistry:
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = HttpClientRegistry()
+    return _default_registry
+
+
+def get_http_client(url: str) -> httpx.AsyncClient:
+    return get_default_registry().client_for(url)
@@ -1,14 +1,39 @@
 """
 utils/job_cache.py
 
-Disk-backed job cache with a configurable TTL (default: 1 hour).
+Two-tier job cache (memory LRU over sharded disk files) with a soft and a
+hard TTL.
+
+    age <= ttl_s         fresh: served as is
+    age <= hard_ttl_s    stale: `lookup` still returns it (hit.stale is True)
+                         so callers can answer at once and refresh in the
+                         background (stale-while-revalidate); `get` ignores it
+    older                expired: gone for every caller, removed by prune
 
 Usage:
     cache = JobCache()
-    cached = cache.get(query="python developer", where="remote", providers=["remotive"])
-    if cached is None:
+    hit = cache.lookup(query="python developer", where="remote", providers=["remotive"])
+    if hit is None:
         result = await engine.search(...)
         cache.set(query=..., where=..., providers=..., data=result)
+    elif hit.stale:
+        schedule_refresh()                    # and return hit.data right away
+
+Tiers:
+    memory   LRU of decoded payloads, bounded by entry count and bytes;
+             per process, so a write elsewhere shows up once the local copy
+             goes stale or is evicted
+    disk     <cache_dir>/<key[:2]>/<key>.bin, bounded by JOB_CACHE_MAX_BYTES;
+             a SQLite index (key -> cached_at, size, last access) drives
+             pruning and LRU eviction without opening the entry files.
+             Memory hits count as accesses too: they are batched and written
+             to the index every few seconds and before any eviction
+             Entries are encoded by utils/cache_codec.py (msgpack/orjson,
+             zstd, job lists decoded straight into JobRecords or job models)
+
+JOB_CACHE_DIR, JOB_CACHE_TTL_S, JOB_CACHE_HARD_TTL_S, JOB_CACHE_MAX_BYTES,
+JOB_CACHE_MEMORY_ENTRIES, JOB_CACHE_MEMORY_BYTES, JOB_CACHE_CODEC and
+JOB_CACHE_COMPRESSION configure the defaults.
 """
 
 from __future__ import annotations
@@ -17,34 +42,96 @@ import hashlib
 import json
 import logging
 import os
+import sqlite3
+import tempfile
+import threading
 import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.utils.cache_codec import CacheCodec, get_default_codec
 
 log = logging.getLogger(__name__)
 
 # ── Default config ────────────────────────────────────────────────────────────
 _DEFAULT_CACHE_DIR = Path(os.getenv("JOB_CACHE_DIR", "/tmp/huntflow_job_cache"))
 _DEFAULT_TTL_S: float = float(os.getenv("JOB_CACHE_TTL_S", "3600"))   # 1 hour
+_DEFAULT_HARD_TTL_S: float = float(os.getenv("JOB_CACHE_HARD_TTL_S", "86400"))   # 1 day
+_DEFAULT_MAX_BYTES: int = int(os.getenv("JOB_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+_DEFAULT_MEMORY_ENTRIES: int = int(os.getenv("JOB_CACHE_MEMORY_ENTRIES", "256"))
+_DEFAULT_MEMORY_BYTES: int = int(os.getenv("JOB_CACHE_MEMORY_BYTES", str(32 * 1024 * 1024)))
+_TOUCH_FLUSH_S = 30.0   # how often memory-hit access times reach the disk index
+
+_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key       TEXT PRIMARY KEY,
+    cached_at REAL NOT NULL,
+    size      INTEGER NOT NULL,
+    accessed  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_cached_at ON entries(cached_at);
+CREATE INDEX IF NOT EXISTS idx_entries_accessed  ON entries(accessed);
+"""
+
+
+@dataclass
+class CacheHit:
+    data: Any
+    age_s: float
+    stale: bool
 
 
 class JobCache:
     """
-    Simple file-based cache for job search results.
+    Two-tier cache for job search results.
 
-    Each cache entry is a JSON file named by a stable hash of the search
-    parameters.  Expired files are replaced on the next write.
+    Each disk entry is a codec-encoded file named by a stable hash of the
+    search parameters, written through a per-writer temp file and an atomic rename.
+    `ttl_s` is the soft TTL; the hard TTL never drops below it.  Index and
+    file errors are logged and swallowed so the cache never breaks a search.
     """
 
     def __init__(
         self,
         cache_dir: Path = _DEFAULT_CACHE_DIR,
         ttl_s: float = _DEFAULT_TTL_S,
+        hard_ttl_s: float = _DEFAULT_HARD_TTL_S,
+        max_bytes: int = _DEFAULT_MAX_BYTES,
+        memory_entries: int = _DEFAULT_MEMORY_ENTRIES,
+        memory_bytes: int = _DEFAULT_MEMORY_BYTES,
+        codec: Optional[CacheCodec] = None,
     ) -> None:
         self.cache_dir = Path(cache_dir)
         self.ttl_s = ttl_s
+        self._hard_ttl_s = hard_ttl_s
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.memory_bytes = memory_bytes
+        self.codec = codec or get_default_codec()
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
+        # key -> (cached_at, size, data)
+        self._memory: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+        self._memory_used = 0
+        # key -> last memory hit not yet written to the index
+        self._touched: Dict[str, float] = {}
+        self._touched_flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.cache_dir / "index.sqlite3"), check_same_thread=False, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_INDEX_SCHEMA)
+
+    @property
+    def hard_ttl_s(self) -> float:
+        return max(self.ttl_s, self._hard_ttl_s)
+
+    @hard_ttl_s.setter
+    def hard_ttl_s(self, value: float) -> None:
+        self._hard_ttl_s = value
+
     # ── Public API ────────────────────────────────────────────────────────────
 
     def get(
@@ -54,28 +141,47 @@ class JobCache:
         providers: Optional[List[str]] = None,
     ) -> Optional[Any]:
         """
-        Return cached data if it exists and is not expired, else None.
+        Return cached data if it exists and is still fresh, else None.
         """
-        path = self._path_for(query, where, providers)
-        if not path.exists():
-            return None
+        hit = self.lookup(query, where, providers)
+        return hit.data if hit is not None and not hit.stale else None
 
-        try:
-            raw = path.read_text(encoding="utf-8")
-            envelope = json.loads(raw)
-        except Exception as exc:
-            log.warning("job_cache: corrupt entry %s – ignoring (%s)", path.name, exc)
-            return None
+    def lookup(
+        self,
+        query: str,
+        where: Optional[str] = None,
+        providers: Optional[List[str]] = None,
+    ) -> Optional[CacheHit]:
+        """
+        Return the entry unless it is missing or past the hard TTL; entries
+        past the soft TTL come back with `stale=True`.
+        """
+        key = self.key(query, where, providers)
+        now = time.time()
 
-        cached_at: float = envelope.get("cached_at", 0.0)
-        age = time.time() - cached_at
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self._touched[key] = now
+                if time.monotonic() - self._touched_flushed_at >= _TOUCH_FLUSH_S:
+                    self._flush_touched()
+        if entry is None:
+            entry = self._read(key)
+            if entry is None:
+                return None
+            self._remember(key, *entry)
+        cached_at, _size, data = entry
 
-        if age > self.ttl_s:
-            log.debug("job_cache: stale entry (age=%.0fs > ttl=%.0fs)", age, self.ttl_s)
+        age = now - cached_at
+        if age > self.hard_ttl_s:
+            log.debug("job_cache: expired entry (age=%.0fs > hard ttl=%.0fs)", age, self.hard_ttl_s)
+            self._drop(key)
             return None
 
-        log.debug("job_cache: HIT for key=%s (age=%.0fs)", path.stem[:12], age)
-        return envelope.get("data")
+        stale = age > self.ttl_s
+        log.debug("job_cache: %s for key=%s (age=%.0fs)", "STALE HIT" if stale else "HIT", key[:12], age)
+        return CacheHit(data=data, age_s=age, stale=stale)
 
     def set(
         self,
@@ -88,21 +194,42 @@ class JobCache:
         Persist search results to disk.  Silently swallows write errors so
         that a full disk or permission issue never breaks the caller.
         """
-        path = self._path_for(query, where, providers)
+        key = self.key(query, where, providers)
+        cached_at = time.time()
         envelope = {
-            "cached_at": time.time(),
+            "cached_at": cached_at,
             "query": query,
             "where": where,
             "providers": sorted(providers or []),
             "data": data,
         }
         try:
-            tmp = path.with_suffix(".tmp")
-            tmp.write_text(json.dumps(envelope, default=str), encoding="utf-8")
-            tmp.replace(path)   # atomic rename
+            raw = self.codec.encode(envelope)
+        except Exception as exc:
+            log.warning("job_cache: could not encode entry for key=%s – %s", key[:12], exc)
+            return
+        # The codec round-trips job lists losslessly, so memory keeps the
+        # caller's objects instead of decoding what was just encoded
+        self._remember(key, cached_at, len(raw), data)
+
+        path = self._path_for_key(key)
+        try:
+            path.parent.mkdir(exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{key}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as fh:
+                    fh.write(raw)
+                os.replace(tmp, path)   # atomic rename
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
             log.debug("job_cache: wrote %s", path.name)
         except Exception as exc:
             log.warning("job_cache: could not write %s – %s", path.name, exc)
+            return
+
+        self._index_put(key, cached_at, len(raw))
+        self._enforce_budget()
 
     def invalidate(
         self,
@@ -111,46 +238,60 @@ class JobCache:
         providers: Optional[List[str]] = None,
     ) -> bool:
         """Delete a specific cache entry.  Returns True if the file existed."""
-        path = self._path_for(query, where, providers)
-        if path.exists():
-            path.unlink(missing_ok=True)
-            return True
-        return False
+        key = self.key(query, where, providers)
+        existed = self._path_for_key(key).exists()
+        self._drop(key)
+        return existed
 
     def clear_all(self) -> int:
         """Delete every cache file.  Returns how many files were removed."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_used = 0
+            self._touched.clear()
         removed = 0
-        for f in self.cache_dir.glob("*.json"):
-            try:
-                f.unlink()
-                removed += 1
-            except Exception:
-                pass
+        # Also sweeps JSON files left by older versions of the cache
+        for pattern in ("*.bin", "*.json"):
+            for f in self.cache_dir.rglob(pattern):
+                try:
+                    f.unlink()
+                    removed += 1
+                except Exception:
+                    pass
+        self._index_exec("DELETE FROM entries")
         return removed
 
     def prune_expired(self) -> int:
-        """Remove expired entries.  Returns how many were pruned."""
-        pruned = 0
-        now = time.time()
-        for f in self.cache_dir.glob("*.json"):
-            try:
-                envelope = json.loads(f.read_text(encoding="utf-8"))
-                age = now - envelope.get("cached_at", 0.0)
-                if age > self.ttl_s:
-                    f.unlink()
-                    pruned += 1
-            except Exception:
-                pass
-        return pruned
+        """Remove entries past the hard TTL.  Returns how many were pruned."""
+        cutoff = time.time() - self.hard_ttl_s
+        keys = self._index_keys("SELECT key FROM entries WHERE cached_at < ?", (cutoff,))
+        for key in keys:
+            self._drop(key)
+        return len(keys)
 
-    # ── Internals ─────────────────────────────────────────────────────────────
+    def stats(self) -> dict:
+        with self._lock:
+            memory = {"entries": len(self._memory), "bytes": self._memory_used}
+            try:
+                entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            except sqlite3.Error:
+                entries, size = None, None
+        return {
+            "codec": self.codec.name,
+            "memory": memory,
+            "disk": {"entries": entries, "bytes": size, "max_bytes": self.max_bytes},
+        }
 
-    def _cache_key(
+    def key(
         self,
         query: str,
-        where: Optional[str],
-        providers: Optional[List[str]],
+        where: Optional[str] = None,
+        providers: Optional[List[str]] = None,
     ) -> str:
+        """
+        Stable fingerprint of the search parameters; names the cache file and
+        keys request coalescing, so both agree on what counts as the same search.
+        """
         parts = {
             "query": query.strip().lower(),
             "where": (where or "").strip().lower(),
@@ -159,14 +300,110 @@ class JobCache:
         raw = json.dumps(parts, sort_keys=True)
         return hashlib.sha256(raw.encode()).hexdigest()[:32]
 
-    def _path_for(
-        self,
-        query: str,
-        where: Optional[str],
-        providers: Optional[List[str]],
-    ) -> Path:
-        key = self._cache_key(query, where, providers)
-        return self.cache_dir / f"{key}.json"
+    # ── Internals ─────────────────────────────────────────────────────────────
+
+    def _path_for_key(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.bin"
+
+    def _read(self, key: str) -> Optional[Tuple[float, int, Any]]:
+        path = self._path_for_key(key)
+        try:
+            raw = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as exc:
+            log.warning("job_cache: could not read %s – %s", path.name, exc)
+            return None
+
+        try:
+            envelope = self.codec.decode(raw)
+        except Exception as exc:
+            log.warning("job_cache: corrupt entry %s – ignoring (%s)", path.name, exc)
+            return None
+
+        self._index_exec("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+        return envelope.get("cached_at", 0.0), len(raw), envelope.get("data")
+
+    def _remember(self, key: str, cached_at: float, size: int, data: Any) -> None:
+        if size > self.memory_bytes:
+            return
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_used -= old[1]
+            self._memory[key] = (cached_at, size, data)
+            self._memory_used += size
+            while self._memory and (len(self._memory) > self.memory_entries or self._memory_used > self.memory_bytes):
+                _key, (_cached_at, evicted_size, _data) = self._memory.popitem(last=False)
+                self._memory_used -= evicted_size
+
+    def _drop(self, key: str) -> None:
+        with self._lock:
+            self._touched.pop(key, None)
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_used -= old[1]
+        self._path_for_key(key).unlink(missing_ok=True)
+        self._index_exec("DELETE FROM entries WHERE key = ?", (key,))
+
+    def _enforce_budget(self) -> None:
+        """Evict least recently used disk entries until the tier fits `max_bytes`."""
+        with self._lock:
+            try:
+                total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+                if total <= self.max_bytes:
+                    return
+                # Entries served from memory must not look idle to the eviction order
+                self._flush_touched()
+                victims = []
+                for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY accessed"):
+                    if total <= self.max_bytes:
+                        break
+                    victims.append(key)
+                    total -= size
+            except sqlite3.Error as exc:
+                log.warning("job_cache: index unavailable – %s", exc)
+                return
+        for key in victims:
+            self._drop(key)
+        log.info("job_cache: evicted %d entries to stay under %d bytes", len(victims), self.max_bytes)
+
+    def _flush_touched(self) -> None:
+        """Write batched memory-hit access times to the index (caller holds the lock)."""
+        self._touched_flushed_at = time.monotonic()
+        if not self._touched:
+            return
+        touched = [(accessed, key) for key, accessed in self._touched.items()]
+        self._touched.clear()
+        try:
+            self._conn.executemany("UPDATE entries SET accessed = MAX(accessed, ?) WHERE key = ?", touched)
+            self._conn.commit()
+        except sqlite3.Error as exc:
+            log.warning("job_cache: index update failed – %s", exc)
+
+    def _index_put(self, key: str, cached_at: float, size: int) -> None:
+        self._index_exec(
+            "INSERT INTO entries (key, cached_at, size, accessed) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET cached_at = excluded.cached_at, size = excluded.size, "
+            "accessed = excluded.accessed",
+            (key, cached_at, size, cached_at),
+        )
+
+    def _index_exec(self, sql: str, params: tuple = ()) -> None:
+        with self._lock:
+            try:
+                self._conn.execute(sql, params)
+                self._conn.commit()
+            except sqlite3.Error as exc:
+                log.warning("job_cache: index update failed – %s", exc)
+
+    def _index_keys(self, sql: str, params: tuple = ()) -> List[str]:
+        with self._lock:
+            try:
+                return [row[0] for row in self._conn.execute(sql, params)]
+            except sqlite3.Error as exc:
+                log.warning("job_cache: index query failed – %s", exc)
+                return []
 
 
 # ── Module-level singleton (optional convenience) ─────────────────────────────
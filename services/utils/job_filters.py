@@ -0,0 +1,218 @@
+"""
+utils/job_filters.py
+
+Local evaluation of the filter predicates a provider could not push down.
+
+`compile_filters` turns the residual SearchFilters into a single predicate
+(closures built once per search, no per-job parsing of the filters), and
+`apply_filters` runs it over a result list in one pass.
+
+Jobs are kept when a predicate cannot be decided from the data we have: an
+unparseable `posted_at` passes the recency check, salary predicates always
+pass because JobRecord carries no salary, and a region location ("eu",
+"usa", "uk") is matched against its countries and major cities, rejecting
+only jobs placed in another known region ("Eindhoven" passes "eu", "Austin,
+TX" does not).
+
+Usage:
+    pushed, residual = split_filters(provider.capabilities, filters)
+    result = await provider.search(query, where=pushed.location, filters=pushed)
+    jobs = apply_filters(result.jobs, residual)
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, List, Optional, Sequence
+
+from services.services.providers.base import SearchFilters
+from services.utils.query_canon import canonicalize
+
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+_REMOTE_WORDS = ("remote", "anywhere", "worldwide", "work from home", "wfh")
+
+# Regions (as canonicalized by utils/query_canon) mapped to how boards spell
+# places inside them: region names, countries (English and native) and major
+# cities, accent-free.  Boards without location support ("Berlin, Germany")
+# are filtered against these.
+_UK_PLACES = (
+    "uk", "united kingdom", "great britain", "britain", "england", "scotland", "wales", "northern ireland",
+    "london", "manchester", "edinburgh", "glasgow", "birmingham", "bristol", "leeds", "cambridge", "oxford",
+    "belfast", "cardiff", "liverpool",
+)
+_REGION_PLACES = {
+    "eu": _UK_PLACES + (
+        "eu", "europe", "european union", "emea",
+        "austria", "osterreich", "belgium", "belgique", "belgie", "bulgaria", "croatia", "cyprus", "czechia",
+        "czech republic", "denmark", "danmark", "estonia", "finland", "suomi", "france", "germany", "deutschland",
+        "greece", "hungary", "ireland", "italy", "italia", "latvia", "lithuania", "luxembourg", "malta",
+        "netherlands", "nederland", "holland", "poland", "polska", "portugal", "romania", "slovakia", "slovenia",
+        "spain", "espana", "sweden", "sverige", "norway", "norge", "switzerland", "schweiz", "suisse", "iceland",
+        "berlin", "munich", "munchen", "hamburg", "frankfurt", "cologne", "koln", "stuttgart", "dusseldorf",
+        "leipzig", "paris", "lyon", "toulouse", "amsterdam", "rotterdam", "utrecht", "brussels", "antwerp",
+        "vienna", "wien", "zurich", "geneva", "basel", "madrid", "barcelona", "valencia", "lisbon", "lisboa",
+        "porto", "rome", "roma", "milan", "milano", "dublin", "cork", "warsaw", "warszawa", "krakow", "wroclaw",
+        "prague", "praha", "budapest", "bucharest", "athens", "stockholm", "gothenburg", "copenhagen", "oslo",
+        "helsinki", "tallinn", "riga", "vilnius", "sofia", "zagreb", "ljubljana", "bratislava",
+    ),
+    "usa": (
+        "us", "usa", "united states", "america",
+        "alabama", "alaska", "arizona", "arkansas", "california", "colorado", "connecticut", "delaware",
+        "florida", "georgia", "hawaii", "idaho", "illinois", "indiana", "iowa", "kansas", "kentucky",
+        "louisiana", "maine", "maryland", "massachusetts", "michigan", "minnesota", "mississippi", "missouri",
+        "montana", "nebraska", "nevada", "new hampshire", "new jersey", "new mexico", "new york",
+        "north carolina", "north dakota", "ohio", "oklahoma", "oregon", "pennsylvania", "rhode island",
+        "south carolina", "south dakota", "tennessee", "texas", "utah", "vermont", "virginia", "washington",
+        "west virginia", "wisconsin", "wyoming",
+        "san francisco", "seattle", "austin", "boston", "chicago", "los angeles", "denver", "atlanta", "miami",
+        "dallas", "houston", "san diego", "san jose", "portland", "philadelphia", "phoenix",
+    ),
+    "uk": _UK_PLACES,
+}
+# Places outside every region above: a region filter rejects them
+_ELSEWHERE_PLACES = (
+    "canada", "toronto", "vancouver", "montreal", "mexico", "brazil", "sao paulo", "argentina", "buenos aires",
+    "colombia", "chile", "australia", "sydney", "melbourne", "new zealand", "auckland", "india", "bangalore",
+    "bengaluru", "hyderabad", "pune", "mumbai", "delhi", "pakistan", "singapore", "japan", "tokyo", "china",
+    "shanghai", "hong kong", "philippines", "manila", "indonesia", "vietnam", "egypt", "cairo", "nigeria",
+    "lagos", "kenya", "nairobi", "south africa", "cape town", "uae", "dubai", "saudi arabia", "riyadh", "israel",
+    "tel aviv",
+)
+# "City, ST" state codes; "DE" is left out because boards use it for Germany
+_US_STATE_CODES = frozenset(
+    "al ak az ar ca co ct fl ga hi id il in ia ks ky la me md ma mi mn ms mo mt ne nv nh nj nm ny nc nd oh ok "
+    "or pa ri sc sd tn tx ut vt va wa wv wi wy dc".split()
+)
+_STATE_CODE_RE = re.compile(r",\s*([a-z]{2})\b")
+
+# Words in a `where`/category value that carry no location/category signal
+_NOISE_WORDS = frozenset({"and", "in", "of", "the", "or", "jobs"})
+
+
+def _fold(text: str) -> str:
+    """Lower-cased and accent-free ("München" -> "munchen")."""
+    return "".join(ch for ch in unicodedata.normalize("NFKD", text or "") if not unicodedata.combining(ch)).lower()
+
+
+def _region_matcher(places: Sequence[str]) -> Callable[[str, set], bool]:
+    """Match folded location text: single words as whole words ("us" is not in "Austria"), phrases as substrings."""
+    phrases = [p for p in places if " " in p]
+    words = {p for p in places if " " not in p}
+    return lambda location, location_words: bool(words & location_words) or any(p in location for p in phrases)
+
+
+_REGION_MATCHERS = {region: _region_matcher(places) for region, places in _REGION_PLACES.items()}
+_ELSEWHERE_MATCHER = _region_matcher(_ELSEWHERE_PLACES)
+
+
+def _in_region(region: str, location: str, location_words: set) -> bool:
+    if _REGION_MATCHERS[region](location, location_words):
+        return True
+    if region == "usa":
+        return any(code in _US_STATE_CODES for code in _STATE_CODE_RE.findall(location))
+    return False
+
+
+def _words(text: str) -> List[str]:
+    return [w for w in _WORD_RE.findall((text or "").lower()) if w not in _NOISE_WORDS]
+
+
+def parse_posted_at(value: Any) -> Optional[datetime]:
+    """ISO-8601 strings or epoch seconds (as int or digit string) to aware UTC datetimes."""
+    if value is None or value == "":
+        return None
+    try:
+        if isinstance(value, (int, float)) or str(value).isdigit():
+            return datetime.fromtimestamp(float(value), tz=timezone.utc)
+        parsed = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+    except (ValueError, OverflowError, OSError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _location_predicate(where: str) -> Callable[[Any], bool]:
+    region = canonicalize("", where).location
+    if region in _REGION_PLACES:
+        others = [r for r in _REGION_PLACES if r != region]
+
+        def check_region(job: Any) -> bool:
+            location = _fold(getattr(job, "location", "") or "")
+            if not location or any(w in location for w in _REMOTE_WORDS):
+                return True
+            location_words = set(_WORD_RE.findall(location))
+            if _in_region(region, location, location_words):
+                return True
+            # Places we cannot place are kept; only a known place outside the region is a miss
+            if _ELSEWHERE_MATCHER(location, location_words):
+                return False
+            return not any(_in_region(other, location, location_words) for other in others)
+
+        return check_region
+
+    words = _words(_fold(where))
+
+    def check(job: Any) -> bool:
+        location = _fold(getattr(job, "location", "") or "")
+        if not location or any(w in location for w in _REMOTE_WORDS):
+            return True
+        location_words = set(_WORD_RE.findall(location))
+        return bool(words) and all(w in location_words for w in words)
+
+    return check
+
+
+def _remote_predicate(job: Any) -> bool:
+    text = f"{getattr(job, 'location', '')} {getattr(job, 'title', '')} {getattr(job, 'description_snippet', '')}".lower()
+    return any(w in text for w in _REMOTE_WORDS)
+
+
+def _recency_predicate(max_days_old: int) -> Callable[[Any], bool]:
+    cutoff = datetime.now(timezone.utc) - timedelta(days=max_days_old)
+
+    def check(job: Any) -> bool:
+        posted = parse_posted_at(getattr(job, "posted_at", None))
+        return posted is None or posted >= cutoff
+
+    return check
+
+
+def _category_predicate(category: str) -> Callable[[Any], bool]:
+    words = _words(category)
+
+    def check(job: Any) -> bool:
+        text = f"{getattr(job, 'title', '')} {getattr(job, 'description_snippet', '')}".lower()
+        return any(w in text for w in words)
+
+    return check
+
+
+def compile_filters(filters: Optional[SearchFilters]) -> Optional[Callable[[Any], bool]]:
+    """One predicate for all active filters, or None when nothing needs checking."""
+    if filters is None:
+        return None
+
+    checks: List[Callable[[Any], bool]] = []
+    if filters.location and filters.location.strip():
+        checks.append(_location_predicate(filters.location))
+    if filters.remote_only:
+        checks.append(_remote_predicate)
+    if filters.max_days_old:
+        checks.append(_recency_predicate(filters.max_days_old))
+    if filters.category and _words(filters.category):
+        checks.append(_category_predicate(filters.category))
+
+    if not checks:
+        return None
+    if len(checks) == 1:
+        return checks[0]
+    return lambda job: all(check(job) for check in checks)
+
+
+def apply_filters(jobs: Sequence[Any], filters: Optional[SearchFilters]) -> List[Any]:
+    matches = compile_filters(filters)
+    if matches is None:
+        return list(jobs)
+    return [job for job in jobs if matches(job)]
@@ -0,0 +1,68 @@
+"""
+utils/job_record.py
+
+The job record passed through the search pipeline (providers, feed mirrors,
+dedupe, ranking, cache, store).
+
+A slotted dataclass rather than a pydantic model: building one is a plain
+attribute assignment with no validation pass, it carries no per-instance
+`__dict__`, and `source`/`country` are interned so the few distinct values
+are shared across thousands of records.  Pydantic models (`JobItem` in
+responses/ and routes/) are built from it only at the HTTP boundary.
+
+Usage:
+    job = JobRecord(source="remotive", country="", title="Python Developer", company="Acme", location="Remote")
+    job.to_dict()
+    JobRecord.from_any(model_or_dict)
+"""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+
+@dataclass(slots=True)
+class JobRecord:
+    source: str
+    country: str
+    title: str
+    company: str
+    location: str
+    description_snippet: str = ""
+    job_url: str = ""
+    apply_url: str = ""
+    posted_at: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        self.source = sys.intern(self.source or "")
+        self.country = sys.intern(self.country or "")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {f: getattr(self, f) for f in JOB_RECORD_FIELDS}
+
+    @classmethod
+    def from_any(cls, job: Any) -> "JobRecord":
+        """Build a record from a pydantic job model, a dict or the scraper dataclass."""
+        if isinstance(job, cls):
+            return job
+        data = job if isinstance(job, dict) else (job.model_dump() if hasattr(job, "model_dump") else vars(job))
+        posted_at = data.get("posted_at")
+        if isinstance(posted_at, datetime):
+            posted_at = posted_at.isoformat()
+        return cls(
+            source=str(data.get("source") or "unknown"),
+            country=str(data.get("country") or ""),
+            title=str(data.get("title") or ""),
+            company=str(data.get("company") or ""),
+            location=str(data.get("location") or ""),
+            description_snippet=str(data.get("description_snippet") or ""),
+            job_url=str(data.get("job_url") or data.get("url") or ""),
+            apply_url=str(data.get("apply_url") or ""),
+            posted_at=str(posted_at) if posted_at else None,
+        )
+
+
+JOB_RECORD_FIELDS: Tuple[str, ...] = tuple(f.name for f in fields(JobRecord))
@@ -0,0 +1,327 @@
+"""
+utils/job_store.py
+
+Durable SQLite (WAL) store of every job seen by any provider, the /jobs/extract
+route or the scraper CLI.
+
+Jobs are upserted by the same stable key `dedupe_jobs` uses
+(apply_url/job_url | title | company) and indexed by source, country,
+posted_at and company, so searches can be topped up from local data instead
+of refetching and re-parsing the same postings.  An in-memory BM25 index
+over title/company/location/description (built lazily, then maintained on
+every upsert/prune from the rows as stored) ranks free-text searches.
+
+Async callers use `aupsert_many` / `asearch`, which run the SQLite work and
+the index build in a worker thread.  `start_pruning` runs a background task
+that deletes jobs not seen for JOB_STORE_RETENTION_S (default 30 days).
+
+Usage:
+    store = get_default_store()
+    store.upsert_many(result.jobs)
+    jobs = store.query(text="python developer", country="de", limit=20)
+    jobs = store.search("python developer", k=20, seen_within_s=86400)
+
+    await store.aupsert_many(result.jobs)          # from the event loop
+    await store.start_pruning()                    # app startup / shutdown
+    await store.stop_pruning()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable, List, Optional
+
+from services.utils.job_record import JobRecord
+from services.services.providers.base import job_key
+from services.utils.search_index import BM25Index
+
+log = logging.getLogger(__name__)
+
+# ── Default config ────────────────────────────────────────────────────────────
+_DEFAULT_STORE_PATH = Path(os.getenv("JOB_STORE_PATH", "/tmp/huntflow_jobs.sqlite3"))
+_DEFAULT_RETENTION_S: float = float(os.getenv("JOB_STORE_RETENTION_S", str(30 * 86400)))   # 30 days
+_DEFAULT_PRUNE_INTERVAL_S: float = float(os.getenv("JOB_STORE_PRUNE_INTERVAL_S", "3600"))   # 1 hour
+
+_KEY_BATCH = 500   # keys per `IN (...)` lookup, under SQLite's parameter limit
+
+_INDEXED_FIELDS = ("title", "company", "location", "description_snippet")
+
+_FIELDS = (
+    "source",
+    "country",
+    "title",
+    "company",
+    "location",
+    "description_snippet",
+    "job_url",
+    "apply_url",
+    "posted_at",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    key                 TEXT PRIMARY KEY,
+    source              TEXT NOT NULL DEFAULT '',
+    country             TEXT NOT NULL DEFAULT '',
+    title               TEXT NOT NULL DEFAULT '',
+    company             TEXT NOT NULL DEFAULT '',
+    location            TEXT NOT NULL DEFAULT '',
+    description_snippet TEXT NOT NULL DEFAULT '',
+    job_url             TEXT NOT NULL DEFAULT '',
+    apply_url           TEXT NOT NULL DEFAULT '',
+    posted_at           TEXT,
+    first_seen          REAL NOT NULL,
+    last_seen           REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_source    ON jobs(source);
+CREATE INDEX IF NOT EXISTS idx_jobs_country   ON jobs(country);
+CREATE INDEX IF NOT EXISTS idx_jobs_posted_at ON jobs(posted_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_company   ON jobs(company COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_jobs_last_seen ON jobs(last_seen);
+"""
+
+# Non-empty incoming values win; empty ones never blank out what we know.
+_UPSERT = f"""
+INSERT INTO jobs (key, {", ".join(_FIELDS)}, first_seen, last_seen)
+VALUES (?, {", ".join("?" for _ in _FIELDS)}, ?, ?)
+ON CONFLICT(key) DO UPDATE SET
+    {", ".join(f"{f} = COALESCE(NULLIF(excluded.{f}, ''), jobs.{f})" for f in _FIELDS)},
+    last_seen = excluded.last_seen
+"""
+
+
+class JobStore:
+    """
+    Thread-safe SQLite job store.  Write errors are logged and swallowed so a
+    locked or read-only database never breaks a search.
+    """
+
+    def __init__(self, path: Path = _DEFAULT_STORE_PATH) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=5.0)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._index: Optional[BM25Index] = None
+        self._prune_task: Optional[asyncio.Task] = None
+
+    # ── Public API ────────────────────────────────────────────────────────────
+
+    def upsert_many(self, jobs: Iterable[Any]) -> int:
+        """Insert or refresh jobs.  Returns how many rows were written."""
+        now = time.time()
+        rows = []
+        for job in jobs:
+            try:
+                item = JobRecord.from_any(job)
+            except Exception as exc:
+                log.debug("job_store: skipping unparseable job – %s", exc)
+                continue
+            if not (item.title or item.job_url or item.apply_url):
+                continue
+            rows.append((job_key(item), *(getattr(item, f) for f in _FIELDS), now, now))
+
+        if not rows:
+            return 0
+        try:
+            with self._lock, self._conn:
+                self._conn.executemany(_UPSERT, rows)
+                if self._index is not None:
+                    # Index what the upsert kept (it never blanks stored values), not the incoming row
+                    self._index_keys([row[0] for row in rows])
+            return len(rows)
+        except Exception as exc:
+            log.warning("job_store: upsert of %d jobs failed – %s", len(rows), exc)
+            return 0
+
+    def query(
+        self,
+        text: Optional[str] = None,
+        source: Optional[str] = None,
+        country: Optional[str] = None,
+        company: Optional[str] = None,
+        posted_since: Optional[str] = None,
+        seen_within_s: Optional[float] = None,
+        limit: int = 50,
+    ) -> List[JobRecord]:
+        """
+        Filter stored jobs.  `text` requires every whitespace-separated term to
+        appear in the title, company or location.  Newest postings first.
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+
+        if source:
+            clauses.append("(source = ? OR source LIKE ?)")
+            params += [source, f"{source}:%"]
+        if country:
+            clauses.append("country = ?")
+            params.append(country.strip().lower())
+        if company:
+            clauses.append("company = ? COLLATE NOCASE")
+            params.append(company.strip())
+        if posted_since:
+            clauses.append("posted_at >= ?")
+            params.append(posted_since)
+        if seen_within_s is not None:
+            clauses.append("last_seen >= ?")
+            params.append(time.time() - seen_within_s)
+        for term in (text or "").lower().split():
+            clauses.append("(title || ' ' || company || ' ' || location) LIKE ?")
+            params.append(f"%{term}%")
+
+        sql = f"SELECT {', '.join(_FIELDS)} FROM jobs"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY posted_at DESC, last_seen DESC LIMIT ?"
+        params.append(int(limit))
+
+        try:
+            with self._lock:
+                rows = self._conn.execute(sql, params).fetchall()
+        except Exception as exc:
+            log.warning("job_store: query failed – %s", exc)
+            return []
+        return [JobRecord(**dict(row)) for row in rows]
+
+    def search(
+        self,
+        query: str,
+        k: int = 20,
+        source: Optional[str] = None,
+        country: Optional[str] = None,
+        seen_within_s: Optional[float] = None,
+        require_all: bool = True,
+    ) -> List[JobRecord]:
+        """
+        BM25-ranked free-text search, best match first.  Structured filters
+        are resolved in SQL first and restrict the candidates scored.
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+        if source:
+            clauses.append("(source = ? OR source LIKE ?)")
+            params += [source, f"{source}:%"]
+        if country:
+            clauses.append("country = ?")
+            params.append(country.strip().lower())
+        if seen_within_s is not None:
+            clauses.append("last_seen >= ?")
+            params.append(time.time() - seen_within_s)
+
+        try:
+            with self._lock:
+                index = self._ensure_index()
+                candidates = None
+                if clauses:
+                    sql = "SELECT key FROM jobs WHERE " + " AND ".join(clauses)
+                    candidates = {row[0] for row in self._conn.execute(sql, params)}
+                hits = index.search(query, k=k, require_all=require_all, candidates=candidates)
+                if not hits:
+                    return []
+                keys = [key for key, _score in hits]
+                sql = f"SELECT key, {', '.join(_FIELDS)} FROM jobs WHERE key IN ({', '.join('?' for _ in keys)})"
+                rows = {row["key"]: row for row in self._conn.execute(sql, keys)}
+        except Exception as exc:
+            log.warning("job_store: search failed – %s", exc)
+            return []
+
+        return [JobRecord(**{f: rows[key][f] for f in _FIELDS}) for key in keys if key in rows]
+
+    async def aupsert_many(self, jobs: Iterable[Any]) -> int:
+        """`upsert_many` in a worker thread."""
+        return await asyncio.to_thread(self.upsert_many, list(jobs))
+
+    async def asearch(self, query: str, **kwargs: Any) -> List[JobRecord]:
+        """`search` in a worker thread (the first call also builds the index there)."""
+        return await asyncio.to_thread(self.search, query, **kwargs)
+
+    def count(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0])
+
+    def prune(self, older_than_s: float) -> int:
+        """Delete jobs not seen for `older_than_s` seconds.  Returns how many were removed."""
+        cutoff = time.time() - older_than_s
+        with self._lock, self._conn:
+            if self._index is not None:
+                for (key,) in self._conn.execute("SELECT key FROM jobs WHERE last_seen < ?", (cutoff,)):
+                    self._index.remove(key)
+            cur = self._conn.execute("DELETE FROM jobs WHERE last_seen < ?", (cutoff,))
+            return cur.rowcount
+
+    async def start_pruning(
+        self,
+        retention_s: float = _DEFAULT_RETENTION_S,
+        interval_s: float = _DEFAULT_PRUNE_INTERVAL_S,
+    ) -> None:
+        """Prune jobs not seen for `retention_s` now and every `interval_s` after."""
+        if self._prune_task is None or self._prune_task.done():
+            self._prune_task = asyncio.create_task(self._prune_loop(retention_s, interval_s), name="job-store-prune")
+
+    async def stop_pruning(self) -> None:
+        if self._prune_task is not None:
+            self._prune_task.cancel()
+            try:
+                await self._prune_task
+            except asyncio.CancelledError:
+                pass
+            self._prune_task = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ── Internals ─────────────────────────────────────────────────────────────
+
+    async def _prune_loop(self, retention_s: float, interval_s: float) -> None:
+        while True:
+            try:
+                pruned = await asyncio.to_thread(self.prune, retention_s)
+                if pruned:
+                    log.info("job_store: pruned %d jobs not seen for %.0fs", pruned, retention_s)
+            except Exception as exc:
+                log.warning("job_store: prune failed – %s", exc)
+            await asyncio.sleep(interval_s)
+
+    def _index_keys(self, keys: List[str]) -> None:
+        """(Re)index these keys from their stored rows (caller holds the lock)."""
+        for start in range(0, len(keys), _KEY_BATCH):
+            batch = keys[start: start + _KEY_BATCH]
+            sql = (
+                f"SELECT key, {', '.join(_INDEXED_FIELDS)} FROM jobs "
+                f"WHERE key IN ({', '.join('?' for _ in batch)})"
+            )
+            for row in self._conn.execute(sql, batch):
+                self._index.add(row["key"], {f: row[f] or "" for f in _INDEXED_FIELDS})
+
+    def _ensure_index(self) -> BM25Index:
+        """Build the BM25 index from the table on first use (caller holds the lock)."""
+        if self._index is None:
+            index = BM25Index()
+            sql = f"SELECT key, {', '.join(_INDEXED_FIELDS)} FROM jobs"
+            for row in self._conn.execute(sql):
+                index.add(row["key"], {f: row[f] or "" for f in _INDEXED_FIELDS})
+            self._index = index
+            log.info("job_store: indexed %d jobs", len(index))
+        return self._index
+
+
+# ── Module-level singleton ────────────────────────────────────────────────────
+_default_store: Optional[JobStore] = None
+
+
+def get_default_store() -> JobStore:
+    global _default_store
+    if _default_store is None:
+        _default_store = JobStore()
+    return _default_store
@@ -0,0 +1,121 @@
+"""
+utils/json_stream.py
+
+Incremental decoding of one JSON array out of a chunked response body.
+
+`iter_array_items` walks down to the array at `path` (a sequence of object
+keys; empty for a top-level array) and yields its elements one at a time as
+the bytes arrive.  Each element is decoded by the stdlib's C scanner
+(`JSONDecoder.raw_decode`), so only the current element and the unread tail
+of the last chunk are held in memory, and a caller that stops iterating
+stops reading the body.  Sibling values before the array are decoded and
+dropped; anything after it is never read.
+
+Usage:
+    async with client.stream("GET", url) as r:
+        r.raise_for_status()
+        async for item in iter_array_items(r.aiter_bytes(), path=("data",)):
+            ...
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import Any, AsyncIterator, Sequence
+
+_DECODER = json.JSONDecoder()
+_WS = re.compile(r"[ \t\n\r]*")
+
+
+class _Reader:
+    """Text buffer over an async byte stream; consumed text is dropped on every refill."""
+
+    def __init__(self, chunks: AsyncIterator[bytes]) -> None:
+        self._chunks = chunks.__aiter__()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    async def fill(self) -> bool:
+        """Append the next chunk.  False once the stream is exhausted."""
+        if self.eof:
+            return False
+        try:
+            chunk = await self._chunks.__anext__()
+            text = self._utf8.decode(chunk)
+        except StopAsyncIteration:
+            self.eof = True
+            text = self._utf8.decode(b"", final=True)
+        self.buf = self.buf[self.pos:] + text
+        self.pos = 0
+        return True
+
+    async def peek(self) -> str:
+        """Next non-whitespace character, without consuming it."""
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not await self.fill():
+                raise ValueError("unexpected end of JSON body")
+
+    async def expect(self, char: str) -> None:
+        found = await self.peek()
+        if found != char:
+            raise ValueError(f"expected {char!r} in JSON body, found {found!r}")
+        self.pos += 1
+
+    async def value(self) -> Any:
+        await self.peek()
+        while True:
+            try:
+                obj, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Most likely the value continues in the next chunk
+                if not await self.fill():
+                    raise
+                continue
+            # A number (or literal) ending at the buffer edge may continue in the next chunk
+            if end == len(self.buf) and not self.eof and not isinstance(obj, (dict, list, str)):
+                await self.fill()
+                continue
+            self.pos = end
+            return obj
+
+
+async def iter_array_items(chunks: AsyncIterator[bytes], path: Sequence[str] = ()) -> AsyncIterator[Any]:
+    """
+    Yield the elements of the array at `path`.  Raises ValueError if the
+    body is malformed or the path does not lead to an array.
+    """
+    reader = _Reader(chunks)
+    for key in path:
+        await _enter_key(reader, key)
+
+    await reader.expect("[")
+    if await reader.peek() == "]":
+        return
+    while True:
+        yield await reader.value()
+        if await reader.peek() == "]":
+            return
+        await reader.expect(",")
+
+
+async def _enter_key(reader: _Reader, key: str) -> None:
+    """Position the reader at the value of `key` in the object that starts here."""
+    await reader.expect("{")
+    if await reader.peek() == "}":
+        raise ValueError(f"JSON body has no {key!r} key")
+    while True:
+        name = await reader.value()
+        await reader.expect(":")
+        if name == key:
+            return
+        await reader.value()   # sibling value: decode and drop
+        if await reader.peek() == "}":
+            raise ValueError(f"JSON body has no {key!r} key")
+        await reader.expect(",")
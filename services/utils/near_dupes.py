@@ -0,0 +1,256 @@
+"""
+utils/near_dupes.py
+
+Near-duplicate job detection across providers (MinHash + LSH banding).
+
+Exact dedupe keys (url|title|company) miss the same posting syndicated by
+Adzuna, Remotive and JobSpy under different redirect URLs and slightly
+different titles ("Sr. Python Developer (m/w/d)" vs "Senior Python
+Developer").  Each job gets a MinHash signature over character shingles of
+its normalised title and company; LSH bands bucket likely matches so
+candidate pairs are found without comparing every pair, and candidates are
+confirmed by estimated Jaccard similarity plus a company/location
+compatibility check.
+
+Similar is not the same role: "Data Scientist" / "Senior Data Scientist"
+and "React Developer" / "React Native Developer" are close in shingle space
+but are different postings.  A confirmed pair must therefore also share the
+same title words once abbreviations, gender/work-mode suffixes, filler words
+and words of either job's location are set aside (so seniority, level
+numbers and qualifiers all have to agree).  Only records from different
+sources are merged (one board does not syndicate to itself), and records
+without a title or company are never indexed.
+
+Usage:
+    jobs = collapse_near_duplicates(jobs)          # keeps the richest record per cluster
+
+    index = NearDuplicateIndex()
+    if index.add(i, job) is None:                  # streaming: first sighting wins
+        emit(job)
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import zlib
+from dataclasses import is_dataclass, replace
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+# ── Defaults ──────────────────────────────────────────────────────────────────
+DEFAULT_THRESHOLD = 0.7     # min estimated Jaccard similarity to merge
+DEFAULT_NUM_PERM = 32       # signature length
+DEFAULT_BANDS = 8           # LSH bands (rows per band = num_perm / bands)
+SHINGLE_SIZE = 3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_ABBREVIATIONS = {
+    "sr": "senior",
+    "snr": "senior",
+    "jr": "junior",
+    "jnr": "junior",
+    "eng": "engineer",
+    "engr": "engineer",
+    "dev": "developer",
+    "mgr": "manager",
+    "swe": "software engineer",
+}
+
+# Gender/work-mode suffixes that vary between boards for the same posting
+_NOISE_RE = re.compile(r"\((?:m|f|w|d|x|h|all)(?:\s*/\s*(?:m|f|w|d|x|h))*\)|\b(?:remote|hybrid|onsite|on-site)\b", re.I)
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+# Words two titles may disagree on and still name the same role
+_FILLER_WORDS = {"a", "an", "and", "the", "of", "for", "to", "in", "at", "with", "on", "m", "f", "w", "d", "x", "h", "all"}
+_COMPANY_SUFFIXES = {"inc", "ltd", "llc", "gmbh", "ag", "bv", "sa", "sas", "plc", "co", "corp", "limited"}
+
+
+def _normalize_title(title: str) -> str:
+    title = _NOISE_RE.sub(" ", (title or "").lower())
+    words = [_ABBREVIATIONS.get(w, w) for w in _WORD_RE.findall(title)]
+    return " ".join(words)
+
+
+def _normalize_company(company: str) -> str:
+    words = [w for w in _WORD_RE.findall((company or "").lower()) if w not in _COMPANY_SUFFIXES]
+    return " ".join(words)
+
+
+def _same_role(job: Any, other: Any) -> bool:
+    """
+    Titles name the same role: every word one title has and the other lacks
+    is filler or part of either job's location ("Python Developer Berlin").
+    """
+    words = set(_normalize_title(getattr(job, "title", "")).split())
+    other_words = set(_normalize_title(getattr(other, "title", "")).split())
+    ignorable = _FILLER_WORDS | _words(getattr(job, "location", "")) | _words(getattr(other, "location", ""))
+    return not ((words ^ other_words) - ignorable)
+
+
+def _indexable(job: Any) -> bool:
+    """Records without a title or company carry too little to match on."""
+    return bool(_normalize_title(getattr(job, "title", "")) and _normalize_company(getattr(job, "company", "")))
+
+
+def _words(text: str) -> set:
+    return set(_WORD_RE.findall((text or "").lower()))
+
+
+def _compatible(a: str, b: str, wildcard: str = "") -> bool:
+    """Empty values, the wildcard word or any shared word count as compatible."""
+    wa, wb = _words(a), _words(b)
+    if not wa or not wb:
+        return True
+    if wildcard and (wildcard in wa or wildcard in wb):
+        return True
+    return bool(wa & wb)
+
+
+def _shingles(text: str, k: int = SHINGLE_SIZE) -> set:
+    text = f" {text} "
+    if len(text) <= k:
+        return {zlib.crc32(text.encode())}
+    return {zlib.crc32(text[i: i + k].encode()) for i in range(len(text) - k + 1)}
+
+
+def richness(job: Any) -> Tuple[int, int, int]:
+    """How much a record tells us: filled fields, posting date, description length."""
+    fields = ("title", "company", "location", "description_snippet", "job_url", "apply_url", "posted_at")
+    filled = sum(1 for f in fields if getattr(job, f, None))
+    return filled, int(bool(getattr(job, "posted_at", None))), len(getattr(job, "description_snippet", "") or "")
+
+
+class NearDuplicateIndex:
+    """
+    Incremental MinHash/LSH index.  `add` returns the id of an already indexed
+    near-duplicate, or None after indexing the new job (records without a
+    title or company are neither matched nor indexed).
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        num_perm: int = DEFAULT_NUM_PERM,
+        bands: int = DEFAULT_BANDS,
+        seed: int = 1,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[Hashable]] = {}
+        self._entries: Dict[Hashable, Tuple[Tuple[int, ...], Any]] = {}
+
+    def signature(self, job: Any) -> Tuple[int, ...]:
+        text = f"{_normalize_title(getattr(job, 'title', ''))} @ {_normalize_company(getattr(job, 'company', ''))}"
+        shingles = _shingles(text)
+        return tuple(
+            min(((a * s + b) % _MERSENNE_PRIME) & _MAX_HASH for s in shingles)
+            for a, b in self._perms
+        )
+
+    def similarity(self, sig_a: Sequence[int], sig_b: Sequence[int]) -> float:
+        return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / self.num_perm
+
+    def find(self, job: Any, signature: Optional[Tuple[int, ...]] = None) -> Optional[Hashable]:
+        if not _indexable(job):
+            return None
+        sig = signature or self.signature(job)
+        checked = set()
+        for band_key in self._band_keys(sig):
+            for other_id in self._buckets.get(band_key, ()):
+                if other_id in checked:
+                    continue
+                checked.add(other_id)
+                other_sig, other = self._entries[other_id]
+                if self.similarity(sig, other_sig) < self.threshold:
+                    continue
+                source, other_source = getattr(job, "source", ""), getattr(other, "source", "")
+                if source and source == other_source:
+                    continue
+                if not _same_role(job, other):
+                    continue
+                country, other_country = getattr(job, "country", ""), getattr(other, "country", "")
+                if country and other_country and country != other_country:
+                    continue
+                if not _compatible(getattr(job, "company", ""), getattr(other, "company", "")):
+                    continue
+                if not _compatible(getattr(job, "location", ""), getattr(other, "location", ""), wildcard="remote"):
+                    continue
+                return other_id
+        return None
+
+    def add(self, item_id: Hashable, job: Any) -> Optional[Hashable]:
+        if not _indexable(job):
+            return None
+        sig = self.signature(job)
+        match = self.find(job, sig)
+        if match is not None:
+            return match
+        self._entries[item_id] = (sig, job)
+        for band_key in self._band_keys(sig):
+            self._buckets.setdefault(band_key, []).append(item_id)
+        return None
+
+    def _band_keys(self, sig: Tuple[int, ...]):
+        for band in range(self.bands):
+            yield band, sig[band * self.rows: (band + 1) * self.rows]
+
+
+def merge_cluster(members: Sequence[Any]) -> Any:
+    """The richest record of a cluster, with its empty fields filled from the rest."""
+    best = max(members, key=richness)
+    others = [m for m in members if m is not best]
+    update = {}
+    for field in ("company", "location", "description_snippet", "job_url", "apply_url", "posted_at", "country"):
+        if getattr(best, field, None):
+            continue
+        for other in others:
+            value = getattr(other, field, None)
+            if value:
+                update[field] = value
+                break
+    if update and is_dataclass(best):
+        return replace(best, **update)
+    if update and hasattr(best, "model_copy"):
+        return best.model_copy(update=update)
+    return best
+
+
+def collapse_near_duplicates(
+    jobs: Sequence[Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    num_perm: int = DEFAULT_NUM_PERM,
+    bands: int = DEFAULT_BANDS,
+) -> List[Any]:
+    """
+    Merge near-duplicate clusters, keeping the richest record of each (with
+    gaps filled from the others) at the position of the cluster's first job.
+    """
+    if len(jobs) < 2:
+        return list(jobs)
+
+    index = NearDuplicateIndex(threshold=threshold, num_perm=num_perm, bands=bands)
+    clusters: Dict[int, List[int]] = {}
+    order: List[int] = []
+    for i, job in enumerate(jobs):
+        root = index.add(i, job)
+        if root is None:
+            clusters[i] = [i]
+            order.append(i)
+        else:
+            clusters[root].append(i)
+
+    out: List[Any] = []
+    for root in order:
+        members = [jobs[i] for i in clusters[root]]
+        out.append(members[0] if len(members) == 1 else merge_cluster(members))
+    return out
@@ -0,0 +1,202 @@
+"""
+utils/provider_stats.py
+
+Persistent per-provider, per-query-class search statistics.
+
+For every (provider, query class) pair we keep a bounded window of recent
+latencies, the number of calls and errors, and how many jobs the provider
+contributed after dedupe.  The planner in JobSearchEngine uses these to rank
+providers by expected unique jobs per second and to skip providers that
+rarely add anything for a given intent.
+
+Stats are kept in memory and flushed to a small JSON file (debounced).
+
+Usage:
+    stats = get_default_provider_stats()
+    stats.record("remotive", "remote", latency_s=1.2, returned=40, unique=31)
+    snap = stats.snapshot("remotive", "remote")
+    snap.unique_per_s
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Deque, Dict, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+# ── Default config ────────────────────────────────────────────────────────────
+_DEFAULT_STATS_PATH = Path(os.getenv("PROVIDER_STATS_PATH", "/tmp/huntflow_provider_stats.json"))
+_LATENCY_WINDOW = 50          # latency samples kept per (provider, query class)
+_FLUSH_INTERVAL_S = 30.0      # min seconds between automatic disk writes
+
+
+def _percentile(sorted_values: list, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[idx]
+
+
+@dataclass
+class ProviderStatsSnapshot:
+    provider: str
+    query_class: str
+    calls: int = 0
+    errors: int = 0
+    returned_jobs: int = 0
+    unique_jobs: int = 0
+    p50_s: float = 0.0
+    p90_s: float = 0.0
+    p99_s: float = 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.calls if self.calls else 0.0
+
+    @property
+    def mean_unique(self) -> float:
+        return self.unique_jobs / self.calls if self.calls else 0.0
+
+    @property
+    def unique_per_s(self) -> float:
+        """Expected unique jobs per second of wall-clock spent on this provider."""
+        return self.mean_unique / max(self.p50_s, 0.1)
+
+
+@dataclass
+class _Entry:
+    calls: int = 0
+    errors: int = 0
+    returned_jobs: int = 0
+    unique_jobs: int = 0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=_LATENCY_WINDOW))
+
+
+class ProviderStats:
+    """
+    In-memory stats with a debounced JSON snapshot on disk.
+    """
+
+    def __init__(
+        self,
+        path: Path = _DEFAULT_STATS_PATH,
+        flush_interval_s: float = _FLUSH_INTERVAL_S,
+    ) -> None:
+        self.path = Path(path)
+        self.flush_interval_s = flush_interval_s
+        self._entries: Dict[Tuple[str, str], _Entry] = {}
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self._load()
+
+    # ── Public API ────────────────────────────────────────────────────────────
+
+    def record(
+        self,
+        provider: str,
+        query_class: str,
+        latency_s: float,
+        returned: int = 0,
+        unique: int = 0,
+        error: bool = False,
+    ) -> None:
+        entry = self._entries.setdefault((provider, query_class), _Entry())
+        entry.calls += 1
+        entry.errors += int(bool(error))
+        entry.returned_jobs += returned
+        entry.unique_jobs += unique
+        entry.latencies.append(round(float(latency_s), 4))
+        self._dirty = True
+
+        if time.monotonic() - self._last_flush >= self.flush_interval_s:
+            self.flush()
+
+    def snapshot(self, provider: str, query_class: str) -> ProviderStatsSnapshot:
+        entry = self._entries.get((provider, query_class))
+        if entry is None:
+            return ProviderStatsSnapshot(provider=provider, query_class=query_class)
+        lat = sorted(entry.latencies)
+        return ProviderStatsSnapshot(
+            provider=provider,
+            query_class=query_class,
+            calls=entry.calls,
+            errors=entry.errors,
+            returned_jobs=entry.returned_jobs,
+            unique_jobs=entry.unique_jobs,
+            p50_s=_percentile(lat, 0.5),
+            p90_s=_percentile(lat, 0.9),
+            p99_s=_percentile(lat, 0.99),
+        )
+
+    def all_snapshots(self) -> list[ProviderStatsSnapshot]:
+        return [self.snapshot(p, qc) for (p, qc) in sorted(self._entries)]
+
+    def flush(self) -> None:
+        """Write the stats to disk.  Never raises."""
+        if not self._dirty:
+            return
+        data = {
+            f"{p}|{qc}": {
+                "calls": e.calls,
+                "errors": e.errors,
+                "returned_jobs": e.returned_jobs,
+                "unique_jobs": e.unique_jobs,
+                "latencies": list(e.latencies),
+            }
+            for (p, qc), e in self._entries.items()
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+            tmp.write_text(json.dumps(data), encoding="utf-8")
+            tmp.replace(self.path)
+            self._dirty = False
+            self._last_flush = time.monotonic()
+        except Exception as exc:
+            log.warning("provider_stats: could not write %s – %s", self.path, exc)
+
+    def reset(self) -> None:
+        self._entries.clear()
+        self._dirty = True
+        self.flush()
+
+    # ── Internals ─────────────────────────────────────────────────────────────
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception as exc:
+            log.warning("provider_stats: corrupt stats file %s – ignoring (%s)", self.path, exc)
+            return
+
+        for raw_key, raw in (data or {}).items():
+            provider, _, query_class = raw_key.partition("|")
+            entry = _Entry(
+                calls=int(raw.get("calls", 0)),
+                errors=int(raw.get("errors", 0)),
+                returned_jobs=int(raw.get("returned_jobs", 0)),
+                unique_jobs=int(raw.get("unique_jobs", 0)),
+            )
+            entry.latencies.extend(float(x) for x in raw.get("latencies") or [])
+            self._entries[(provider, query_class)] = entry
+
+
+# ── Module-level singleton ────────────────────────────────────────────────────
+_default_stats: Optional[ProviderStats] = None
+
+
+def get_default_provider_stats() -> ProviderStats:
+    global _default_stats
+    if _default_stats is None:
+        _default_stats = ProviderStats()
+    return _default_stats
@@ -0,0 +1,176 @@
+"""
+utils/query_canon.py
+
+Canonical form of a search's query and location, so that spellings of the
+same search share cache entries, single-flight keys and planner decisions.
+
+- Case, whitespace and punctuation are folded ("Sr. Python-Developer" -> "senior python developer")
+- Abbreviations are expanded from a synonym table ("dev" -> "developer", "k8s" -> "kubernetes")
+- Remote intent in either field becomes a flag ("python developer remote" -> remote=True)
+- Location aliases collapse ("Europe", "EU" -> "eu"); "anywhere" means remote with no location
+- `key` is the sorted, de-duplicated token set, so word order does not split the cache
+
+The canonical forms are keys only.  Providers are asked `search_query` and
+`search_location`: the caller's own words, case-folded, with just the
+remote-intent and filler words taken out.  Boards match titles on plain
+substrings ("full stack", "node.js", "new york, ny"), and the rewritten
+spellings ("fullstack", "nodejs", "new york ny") would miss them.
+
+Canonicalizing a canonical query, or the provider-facing form, gives the
+same keys, so state carried in cursors and revalidation runs can be passed
+through again safely.
+
+Usage:
+    canon = canonicalize("Sr. Python Dev", where="remote - EU")
+    canon.text             # "senior python developer"   (planning)
+    canon.key              # "developer python senior"   (what cache keys use)
+    canon.location         # "eu"
+    canon.remote           # True
+    canon.search_query     # "sr. python dev"            (what providers are asked)
+    canon.search_location  # "eu"
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+# ── Tables ────────────────────────────────────────────────────────────────────
+# Token (after folding) -> expansion.  Keep entries unambiguous in job titles.
+SYNONYMS: Dict[str, str] = {
+    "sr": "senior",
+    "snr": "senior",
+    "jr": "junior",
+    "jnr": "junior",
+    "dev": "developer",
+    "devs": "developer",
+    "eng": "engineer",
+    "engr": "engineer",
+    "swe": "software engineer",
+    "sde": "software engineer",
+    "mgr": "manager",
+    "admin": "administrator",
+    "sysadmin": "system administrator",
+    "ml": "machine learning",
+    "js": "javascript",
+    "ts": "typescript",
+    "k8s": "kubernetes",
+    "node.js": "nodejs",
+    "react.js": "react",
+    "reactjs": "react",
+    "vue.js": "vue",
+    "vuejs": "vue",
+    ".net": "dotnet",
+}
+
+# Multi-word spellings folded into one token before synonyms apply
+PHRASES: List[Tuple[str, str]] = [
+    ("front end", "frontend"),
+    ("back end", "backend"),
+    ("full stack", "fullstack"),
+    ("work from home", "remote"),
+    ("united states of america", "usa"),
+    ("united states", "usa"),
+    ("united kingdom", "uk"),
+    ("great britain", "uk"),
+    ("united arab emirates", "uae"),
+    ("european union", "eu"),
+]
+
+REMOTE_WORDS = frozenset({"remote", "remotely", "wfh", "telecommute", "telework"})
+# Location values that only say "not tied to a place"
+ANYWHERE_WORDS = frozenset({"anywhere", "worldwide", "global", "globally"})
+
+LOCATION_ALIASES: Dict[str, str] = {
+    "europe": "eu",
+    "us": "usa",
+    "u.s": "usa",
+    "u.s.a": "usa",
+    "america": "usa",
+    "gb": "uk",
+    "britain": "uk",
+}
+
+# Words that carry no search intent in a job query or location
+QUERY_FILLER = frozenset({"a", "an", "the", "job", "jobs", "position", "positions", "role", "roles", "opening", "openings", "vacancy", "vacancies"})
+LOCATION_FILLER = frozenset({"only", "based", "in", "or", "and"})
+
+# A token may keep inner dots/plus/hash ("node.js", "c++", "c#") and a leading dot (".net")
+_TOKEN_RE = re.compile(r"\.?[^\W_](?:[^\W_]|[+#.])*")
+# Separators left at the edge of a value once intent words are removed ("remote - EU")
+_EDGE_PUNCT = "()[],;:/|-"
+
+
+@dataclass(frozen=True)
+class CanonicalQuery:
+    text: str                 # folded, expanded, intent words removed (planning)
+    key: str                  # order-insensitive form for cache and coalescing keys
+    location: Optional[str]   # canonical place, None when unrestricted
+    remote: bool
+    search_query: str = ""                  # caller's query, case-folded, for providers
+    search_location: Optional[str] = None   # caller's location, case-folded, for providers
+
+    @property
+    def where(self) -> str:
+        """Location intent as one string ("remote eu") for planning and keys."""
+        return " ".join(part for part in ("remote" if self.remote else "", self.location or "") if part)
+
+
+def _tokens(text: Optional[str]) -> List[str]:
+    # Drop accents but keep every script (Arabic queries stay searchable)
+    folded = "".join(ch for ch in unicodedata.normalize("NFKD", text or "") if not unicodedata.combining(ch)).lower()
+    tokens = [t.rstrip(".") for t in _TOKEN_RE.findall(folded)]
+    joined = " ".join(t for t in tokens if t)
+    for phrase, token in PHRASES:
+        joined = re.sub(rf"(?<!\S){re.escape(phrase)}(?!\S)", token, joined)
+    out: List[str] = []
+    for token in joined.split():
+        out.extend(SYNONYMS.get(token, token).split())
+    return out
+
+
+def _provider_form(text: Optional[str], drop: frozenset) -> str:
+    """Case-folded `text` without the words in `drop`; spelling and punctuation are kept."""
+    words = [w for w in (text or "").casefold().split() if w.strip(_EDGE_PUNCT) not in drop]
+    return " ".join(words).strip(_EDGE_PUNCT + " ")
+
+
+def _unique(tokens: List[str]) -> List[str]:
+    return list(dict.fromkeys(tokens))
+
+
+def canonicalize(query: str, where: Optional[str] = None, remote_only: bool = False) -> CanonicalQuery:
+    """Canonical form of a search.  `remote_only` folds in an explicit remote filter."""
+    remote = remote_only
+    words: List[str] = []
+    for token in _tokens(query):
+        if token in REMOTE_WORDS:
+            remote = True
+        elif token not in QUERY_FILLER:
+            words.append(token)
+    words = _unique(words)
+    # A query made only of filler or intent words keeps them rather than becoming empty
+    if not words:
+        words = _unique(_tokens(query))
+
+    place: List[str] = []
+    for token in _tokens(where):
+        if token in REMOTE_WORDS or token in ANYWHERE_WORDS:
+            remote = True
+        elif token not in LOCATION_FILLER:
+            place.append(LOCATION_ALIASES.get(token, token))
+    place = _unique(place)
+
+    search_query = _provider_form(query, REMOTE_WORDS | QUERY_FILLER) or " ".join((query or "").casefold().split())
+    search_location = _provider_form(where, REMOTE_WORDS | ANYWHERE_WORDS | LOCATION_FILLER) if place else ""
+
+    return CanonicalQuery(
+        text=" ".join(words),
+        key=" ".join(sorted(words)),
+        location=" ".join(place) or None,
+        remote=remote,
+        search_query=search_query,
+        search_location=search_location or None,
+    )
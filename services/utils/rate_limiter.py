@@ -13,23 +13,79 @@ Tier C – HTML scrapers / heavy adapters (slow/fragile): 8–14 s gap
 
 The default (unknown key) falls into Tier B so we are conservative with
 anything not explicitly listed.
+
+TokenBucket caps the request *rate* of a whole upstream (e.g. every Adzuna
+call from every route and provider) while allowing concurrent bursts; get
+one per key with `get_token_bucket`.
+
+Both are token buckets kept in a shared backend, so every uvicorn worker,
+the CLI runner and the automation worker draw from the same budget:
+
+    memory   per process (tests, single worker)
+    sqlite   one file with a write lock per update (single host, default);
+             state survives restarts, so a fresh deploy does not burst
+    redis    atomic Lua script (multi-host); needs the optional `redis` package
+
+Select with RATE_LIMIT_BACKEND / RATE_LIMIT_DB_PATH / REDIS_URL.
+
+Backend I/O never runs on the event loop: takes go through a worker thread
+for the SQLite and Redis backends, refunds of cancelled reservations are
+handed to the executor, and `expected_wait` estimates from the level this
+process last saw for the key (refilled locally) instead of querying the
+backend, so deadline planning costs no I/O.
+
+Within a process, RateLimiter.wait goes through a RateLimitScheduler: one
+waiter per key reserves at a time, in priority order, so an interactive
+search arriving behind a queue of background (automation) calls takes the
+next slot instead of the last.  Background waiters age towards interactive
+priority so they cannot starve.  `get_default_scheduler().stats()` reports
+queue depth and wait times per key.
 """
 
 from __future__ import annotations
 
 import asyncio
+import logging
+import os
 import random
+import sqlite3
+import threading
 import time
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, Optional
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
 from urllib.parse import urlparse
 
+from services.core.config import settings
+
+try:
+    import redis  # type: ignore
+except ImportError:  # optional dependency
+    redis = None
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# ── Default config ────────────────────────────────────────────────────────────
+_DEFAULT_DB_PATH = Path(os.getenv("RATE_LIMIT_DB_PATH", "/tmp/huntflow_rate_limits.sqlite3"))
+
+# Priority classes: lower is served first
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BACKGROUND = "background"
+PRIORITIES: Dict[str, int] = {PRIORITY_INTERACTIVE: 0, PRIORITY_BACKGROUND: 1}
+
+_AGING_S = 30.0          # a waiter gains one priority class per this many seconds queued
+_WAIT_SAMPLES = 200      # recent waits kept per key and class for stats
+
 
 @dataclass
 class RateLimitPolicy:
     min_delay_s: float = 3.0
     max_delay_s: float = 6.0
     jitter_s: float = 1.0
+    burst: float = 1.0
 
 
 # ── Per-provider policies ─────────────────────────────────────────────────────
@@ -62,13 +118,359 @@ PROVIDER_POLICIES: Dict[str, RateLimitPolicy] = {
 }
 
 
+# ── Bucket backends ───────────────────────────────────────────────────────────
+#
+# A backend implements one atomic step, `take(key, rate_per_s, burst, tokens)`:
+# refill the bucket for the time elapsed, subtract `tokens` (the level may go
+# negative, which is how later callers queue up) and return the level from
+# *before* the subtraction.  All wait arithmetic lives in `_wait_for`.
+
+
+def _refill(level: Optional[float], updated: float, now: float, rate_per_s: float, burst: float) -> float:
+    if level is None:
+        return burst
+    return min(burst, level + max(0.0, now - updated) * rate_per_s)
+
+
+def _wait_for(before: float, tokens: float, rate_per_s: float) -> float:
+    """Seconds until the first of `tokens` is covered by the bucket."""
+    return max(0.0, (min(tokens, 1.0) - before) / rate_per_s)
+
+
+class MemoryBucketBackend:
+    """Process-local buckets."""
+
+    blocking = False
+
+    def __init__(self) -> None:
+        self._state: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate_per_s: float, burst: float, tokens: float) -> float:
+        with self._lock:
+            now = time.time()
+            level, updated = self._state.get(key, (None, now))
+            before = _refill(level, updated, now, rate_per_s, burst)
+            self._state[key] = (before - tokens, now)
+            return before
+
+
+class SQLiteBucketBackend:
+    """
+    Buckets in a SQLite file shared by every process on the host.  Each take
+    runs in a BEGIN IMMEDIATE transaction, so updates are serialised by the
+    database write lock.
+    """
+
+    blocking = True
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS buckets (
+        key     TEXT PRIMARY KEY,
+        tokens  REAL NOT NULL,
+        updated REAL NOT NULL
+    )
+    """
+
+    def __init__(self, path: Path = _DEFAULT_DB_PATH) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(self._SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread: takes run in the default executor
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=10.0, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def take(self, key: str, rate_per_s: float, burst: float, tokens: float) -> float:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+            before = _refill(row[0] if row else None, row[1] if row else now, now, rate_per_s, burst)
+            conn.execute(
+                "INSERT INTO buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                (key, before - tokens, now),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return before
+
+
+_REDIS_TAKE = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local tokens = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local before = burst
+if state[1] then
+    before = math.min(burst, tonumber(state[1]) + math.max(0, now - tonumber(state[2])) * rate)
+end
+local level = before - tokens
+redis.call('HSET', KEYS[1], 'tokens', tostring(level), 'updated', tostring(now))
+-- once the bucket would be full again the key carries no information
+redis.call('EXPIRE', KEYS[1], math.ceil(math.max(0, burst - level) / rate) + 60)
+return tostring(before)
+"""
+
+
+class RedisBucketBackend:
+    """
+    Buckets in Redis (or anything speaking its protocol with EVALSHA and
+    TIME), updated by one Lua script so concurrent hosts cannot race.
+    """
+
+    blocking = True
+
+    def __init__(self, url: Optional[str] = None, client=None, prefix: str = "huntflow:ratelimit:") -> None:
+        if client is None:
+            if redis is None:
+                raise RuntimeError("RATE_LIMIT_BACKEND=redis needs the `redis` package")
+            client = redis.Redis.from_url(url or settings.REDIS_URL)
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(_REDIS_TAKE)
+
+    def take(self, key: str, rate_per_s: float, burst: float, tokens: float) -> float:
+        raw = self._script(keys=[self.prefix + key], args=[rate_per_s, burst, tokens])
+        return float(raw.decode() if isinstance(raw, bytes) else raw)
+
+
+_fallback_backend = MemoryBucketBackend()
+_default_backend = None
+
+
+def get_default_backend():
+    """Backend chosen by RATE_LIMIT_BACKEND; falls back to SQLite, then memory."""
+    global _default_backend
+    if _default_backend is None:
+        kind = (settings.RATE_LIMIT_BACKEND or "sqlite").strip().lower()
+        try:
+            if kind == "redis":
+                _default_backend = RedisBucketBackend()
+            elif kind == "memory":
+                _default_backend = _fallback_backend
+        except Exception as exc:
+            log.warning("rate_limiter: %s backend unavailable – using sqlite (%s)", kind, exc)
+        if _default_backend is None:
+            try:
+                _default_backend = SQLiteBucketBackend()
+            except Exception as exc:
+                log.warning("rate_limiter: sqlite backend unavailable – using memory (%s)", exc)
+                _default_backend = _fallback_backend
+    return _default_backend
+
+
+# Last bucket level this process saw per key: (tokens after the take, when)
+_observed: Dict[str, Tuple[float, float]] = {}
+
+
+def _estimated_level(key: str, rate_per_s: float, burst: float) -> float:
+    """The last seen level refilled to now; a key never taken from counts as full."""
+    level, updated = _observed.get(key, (None, 0.0))
+    return _refill(level, updated, time.time(), rate_per_s, burst)
+
+
+async def _take(backend, key: str, rate_per_s: float, burst: float, tokens: float) -> float:
+    """Run one take, off the event loop for I/O backends; never raises."""
+    now = time.time()
+    try:
+        if backend.blocking:
+            before = await asyncio.to_thread(backend.take, key, rate_per_s, burst, tokens)
+        else:
+            before = backend.take(key, rate_per_s, burst, tokens)
+    except Exception as exc:
+        log.warning("rate_limiter: shared backend failed for %s – limiting locally (%s)", key, exc)
+        before = _fallback_backend.take(key, rate_per_s, burst, tokens)
+    _observed[key] = (before - tokens, now)
+    return before
+
+
+def _refund(backend, key: str, rate_per_s: float, burst: float, tokens: float) -> None:
+    """
+    Give back `tokens` of a cancelled reservation.  Called from a cancelled
+    task, so I/O backends are handed to the executor rather than awaited.
+    """
+    level, updated = _observed.get(key, (None, 0.0))
+    if level is not None:
+        _observed[key] = (level + tokens, updated)
+
+    def give_back() -> None:
+        try:
+            backend.take(key, rate_per_s, burst, -tokens)
+        except Exception:
+            _fallback_backend.take(key, rate_per_s, burst, -tokens)
+
+    if not backend.blocking:
+        give_back()
+        return
+    try:
+        asyncio.get_running_loop().run_in_executor(None, give_back)
+    except RuntimeError:   # no loop (interpreter shutdown): refund inline
+        give_back()
+
+
+# ── In-process scheduling ─────────────────────────────────────────────────────
+
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "enqueued", "future")
+
+    def __init__(self, priority: int, seq: int, future: asyncio.Future) -> None:
+        self.priority = priority
+        self.seq = seq
+        self.enqueued = time.monotonic()
+        self.future = future
+
+    def rank(self, now: float) -> Tuple[float, int]:
+        return self.priority - (now - self.enqueued) / _AGING_S, self.seq
+
+
+class _KeyQueue:
+    __slots__ = ("busy", "waiters", "max_depth", "waits")
+
+    def __init__(self) -> None:
+        self.busy = False
+        self.waiters: List[_Waiter] = []
+        self.max_depth = 0
+        self.waits: Dict[str, Deque[float]] = {}
+
+
+class RateLimitScheduler:
+    """
+    Hands out turns per key: `run(key, priority, reserve)` waits until no
+    other caller of that key is reserving, best-ranked waiter first (priority
+    class, then arrival, with aging), and runs `reserve` while holding the
+    turn.  Single event loop use; the shared bucket handles other processes.
+    """
+
+    def __init__(self) -> None:
+        self._queues: Dict[str, _KeyQueue] = {}
+        self._seq = 0
+
+    async def run(self, key: str, priority: str, reserve: Callable[[], Awaitable[T]]) -> T:
+        level = PRIORITIES.get(priority, PRIORITIES[PRIORITY_INTERACTIVE])
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = _KeyQueue()
+
+        started = time.monotonic()
+        if queue.busy:
+            self._seq += 1
+            waiter = _Waiter(level, self._seq, asyncio.get_running_loop().create_future())
+            queue.waiters.append(waiter)
+            queue.max_depth = max(queue.max_depth, len(queue.waiters))
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                if waiter in queue.waiters:
+                    queue.waiters.remove(waiter)
+                elif waiter.future.done() and not waiter.future.cancelled():
+                    self._hand_off(queue)      # the turn reached us as we were cancelled
+                raise
+        else:
+            queue.busy = True
+
+        try:
+            return await reserve()
+        finally:
+            self._record(queue, priority, time.monotonic() - started)
+            self._hand_off(queue)
+
+    def _hand_off(self, queue: _KeyQueue) -> None:
+        now = time.monotonic()
+        while queue.waiters:
+            waiter = min(queue.waiters, key=lambda w: w.rank(now))
+            queue.waiters.remove(waiter)
+            if not waiter.future.done():
+                waiter.future.set_result(None)
+                return
+        queue.busy = False
+
+    @staticmethod
+    def _record(queue: _KeyQueue, priority: str, wait_s: float) -> None:
+        samples = queue.waits.get(priority)
+        if samples is None:
+            samples = queue.waits[priority] = deque(maxlen=_WAIT_SAMPLES)
+        samples.append(wait_s)
+
+    def depth(self, key: str) -> int:
+        queue = self._queues.get(key)
+        return len(queue.waiters) if queue else 0
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Queue depth and recent wait times (seconds, incl. bucket sleep) per key."""
+        out: Dict[str, Dict[str, Any]] = {}
+        for key in sorted(self._queues):
+            queue = self._queues[key]
+            depth: Dict[str, int] = {}
+            for waiter in queue.waiters:
+                name = next((n for n, lvl in PRIORITIES.items() if lvl == waiter.priority), str(waiter.priority))
+                depth[name] = depth.get(name, 0) + 1
+            waits = {}
+            for priority, samples in queue.waits.items():
+                ordered = sorted(samples)
+                waits[priority] = {
+                    "count": len(ordered),
+                    "mean_s": round(sum(ordered) / len(ordered), 3),
+                    "p50_s": round(ordered[len(ordered) // 2], 3),
+                    "p95_s": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+                    "max_s": round(ordered[-1], 3),
+                }
+            out[key] = {
+                "queued": len(queue.waiters),
+                "queued_by_priority": depth,
+                "max_queued": queue.max_depth,
+                "busy": queue.busy,
+                "waits": waits,
+            }
+        return out
+
+
+_default_scheduler: Optional[RateLimitScheduler] = None
+
+
+def get_default_scheduler() -> RateLimitScheduler:
+    global _default_scheduler
+    if _default_scheduler is None:
+        _default_scheduler = RateLimitScheduler()
+    return _default_scheduler
+
+
 @dataclass
 class RateLimiter:
+    """
+    Gap-based politeness on top of a shared token bucket: each policy is a
+    bucket refilling one token per `min_delay_s`, and every call draws a
+    random cost so consecutive calls end up `min_delay_s`–`max_delay_s`
+    (+ jitter) apart, across every process sharing the backend.  Callers
+    in this process are ordered by the (shared) scheduler.
+    """
+
     default_policy: RateLimitPolicy = field(default_factory=lambda: _TIER_B)
     policies: Dict[str, RateLimitPolicy] = field(
         default_factory=lambda: dict(PROVIDER_POLICIES)
     )
-    _last_hit: Dict[str, float] = field(default_factory=dict)
+    backend: object = None
+    scheduler: Optional[RateLimitScheduler] = None
+
+    def __post_init__(self) -> None:
+        if self.backend is None:
+            self.backend = get_default_backend()
+        if self.scheduler is None:
+            self.scheduler = get_default_scheduler()
 
     def _policy_for(self, key: str) -> RateLimitPolicy:
         return self.policies.get(key, self.default_policy)
@@ -83,26 +485,96 @@ class RateLimiter:
         except Exception:
             return "unknown"
 
-    async def wait(self, *, url: Optional[str] = None, key: Optional[str] = None) -> float:
+    def expected_wait(self, *, url: Optional[str] = None, key: Optional[str] = None) -> float:
+        """
+        Lower bound of how long `wait` would sleep right now (no jitter, no
+        reservation, counting every queued waiter as ahead).  Used by
+        deadline-aware callers to skip work early.  Estimated from this
+        process's last take on the key, without backend I/O.
+        """
+        k = key or self._key_from_url(url)
+        policy = self._policy_for(k)
+        if policy.min_delay_s <= 0:
+            return 0.0
+        rate = 1.0 / policy.min_delay_s
+        before = _estimated_level(k, rate, policy.burst)
+        return _wait_for(before, 1.0, rate) + self.scheduler.depth(k) * policy.min_delay_s
+
+    async def wait(
+        self,
+        *,
+        url: Optional[str] = None,
+        key: Optional[str] = None,
+        priority: str = PRIORITY_INTERACTIVE,
+    ) -> float:
         """
         Enforce the gap between consecutive calls to the same provider/host.
-        Returns the actual sleep time in seconds.
+        Returns the time spent sleeping for the bucket in seconds.
         """
         k = key or self._key_from_url(url)
         policy = self._policy_for(k)
+        if policy.min_delay_s <= 0:
+            return 0.0
+        return await self.scheduler.run(k, priority, lambda: self._reserve(k, policy))
 
-        now = time.monotonic()
-        last = self._last_hit.get(k, 0.0)
+    async def _reserve(self, k: str, policy: RateLimitPolicy) -> float:
+        gap = random.uniform(policy.min_delay_s, max(policy.min_delay_s, policy.max_delay_s))
+        gap += random.uniform(0.0, policy.jitter_s)
+        rate = 1.0 / policy.min_delay_s
+        cost = gap * rate
 
-        base = random.uniform(policy.min_delay_s, policy.max_delay_s)
-        jitter = random.uniform(0.0, policy.jitter_s)
-        target_gap = base + jitter
+        before = await _take(self.backend, k, rate, policy.burst, cost)
+        sleep_s = _wait_for(before, cost, rate)
+        if sleep_s > 0:
+            try:
+                await asyncio.sleep(sleep_s)
+            except asyncio.CancelledError:
+                _refund(self.backend, k, rate, policy.burst, cost)
+                raise
+        return sleep_s
 
-        elapsed = now - last
-        sleep_s = max(0.0, target_gap - elapsed)
 
-        if sleep_s > 0:
-            await asyncio.sleep(sleep_s)
+class TokenBucket:
+    """
+    Async token bucket: `rate_per_s` sustained, up to `burst` at once.
+
+    Tokens are reserved on entry (the balance may go negative), so waiters
+    are served in arrival order without a lock; a cancelled waiter gives its
+    token back.
+    """
+
+    def __init__(self, rate_per_s: float, burst: float = 1.0, key: Optional[str] = None, backend=None) -> None:
+        if rate_per_s <= 0:
+            raise ValueError("rate_per_s must be positive")
+        self.rate_per_s = float(rate_per_s)
+        self.burst = max(1.0, float(burst))
+        self.key = key or f"bucket:{id(self)}"
+        self.backend = backend or (_fallback_backend if key is None else get_default_backend())
+
+    def expected_wait(self, tokens: float = 1.0) -> float:
+        """Estimated from this process's last take on the bucket, without backend I/O."""
+        before = _estimated_level(self.key, self.rate_per_s, self.burst)
+        return _wait_for(before, tokens, self.rate_per_s)
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """Take `tokens`, sleeping until they are available.  Returns the sleep time."""
+        before = await _take(self.backend, self.key, self.rate_per_s, self.burst, tokens)
+        wait_s = _wait_for(before, tokens, self.rate_per_s)
+        if wait_s > 0:
+            try:
+                await asyncio.sleep(wait_s)
+            except asyncio.CancelledError:
+                _refund(self.backend, self.key, self.rate_per_s, self.burst, tokens)
+                raise
+        return wait_s
+
+
+_BUCKETS: Dict[str, TokenBucket] = {}
+
 
-        self._last_hit[k] = time.monotonic()
-        return sleep_s
\ No newline at end of file
+def get_token_bucket(key: str, rate_per_s: float, burst: float = 1.0) -> TokenBucket:
+    """Bucket for `key` in the default (shared) backend; created with the given rate on first use."""
+    bucket = _BUCKETS.get(key)
+    if bucket is None:
+        bucket = _BUCKETS[key] = TokenBucket(rate_per_s, burst, key=f"bucket:{key}")
+    return bucket
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import random
+import time
 from typing import Callable, TypeVar, Awaitable, Optional
 
 T = TypeVar("T")
@@ -15,7 +16,14 @@ async def with_retries(
     max_delay_s: float = 20.0,
     jitter_ratio: float = 0.25,
     on_retry: Optional[Callable[[int, Exception, float], None]] = None,
+    deadline: Optional[float] = None,
 ) -> T:
+    """
+    Retry `fn` with exponential backoff.
+
+    `deadline` is a time.monotonic() timestamp; a retry whose backoff sleep
+    would end past it is not attempted and the last error is raised instead.
+    """
     attempt = 1
     delay = base_delay_s
 
@@ -27,6 +35,8 @@ async def with_retries(
                 raise
             jitter = delay * random.uniform(-jitter_ratio, jitter_ratio)
             sleep_s = min(max_delay_s, max(0.0, delay + jitter))
+            if deadline is not None and time.monotonic() + sleep_s >= deadline:
+                raise
             if on_retry:
                 on_retry(attempt, e, sleep_s)
             await asyncio.sleep(sleep_s)
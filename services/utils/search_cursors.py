@@ -0,0 +1,153 @@
+"""
+utils/search_cursors.py
+
+Server-side state behind the opaque `next_cursor` of a multi-provider search.
+
+A cursor id names an immutable JSON snapshot: the search parameters, the
+tier plan, per-provider paging state, the dedupe seen-set and any jobs that
+were fetched but did not fit the page.  Every page writes a fresh snapshot,
+so retrying a page with the same cursor returns the same slice instead of
+skipping one.  `start_pruning` runs a background task that removes expired
+cursors every SEARCH_CURSOR_PRUNE_INTERVAL_S (default 10 minutes).
+
+Usage:
+    store = get_default_cursor_store()
+    cursor = store.create(state)
+    state = store.load(cursor)          # None when unknown or expired
+    store.alive(cursor)                 # cheap existence / expiry check
+
+    await store.start_pruning()         # app startup / shutdown
+    await store.stop_pruning()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import re
+import secrets
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+log = logging.getLogger(__name__)
+
+# ── Default config ────────────────────────────────────────────────────────────
+_DEFAULT_CURSOR_DIR = Path(os.getenv("SEARCH_CURSOR_DIR", "/tmp/huntflow_search_cursors"))
+# Matches the job cache hard TTL, so a cached first page, even one served
+# stale, still carries a live cursor
+_DEFAULT_TTL_S: float = float(os.getenv("SEARCH_CURSOR_TTL_S", "86400"))   # 1 day
+_DEFAULT_PRUNE_INTERVAL_S: float = float(os.getenv("SEARCH_CURSOR_PRUNE_INTERVAL_S", "600"))   # 10 minutes
+
+_CURSOR_RE = re.compile(r"^[A-Za-z0-9_-]{16,64}$")
+
+
+class SearchCursorStore:
+    """One JSON file per cursor; expired files are removed on read or prune."""
+
+    def __init__(
+        self,
+        cursor_dir: Path = _DEFAULT_CURSOR_DIR,
+        ttl_s: float = _DEFAULT_TTL_S,
+    ) -> None:
+        self.cursor_dir = Path(cursor_dir)
+        self.ttl_s = ttl_s
+        self.cursor_dir.mkdir(parents=True, exist_ok=True)
+        self._prune_task: Optional[asyncio.Task] = None
+
+    # ── Public API ────────────────────────────────────────────────────────────
+
+    def create(self, state: Dict[str, Any]) -> Optional[str]:
+        """Persist `state` under a new cursor id.  Returns None if it could not be written."""
+        cursor = secrets.token_urlsafe(18)
+        path = self._path_for(cursor)
+        envelope = {"created_at": time.time(), "state": state}
+        try:
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(envelope, default=str), encoding="utf-8")
+            tmp.replace(path)   # atomic rename
+        except Exception as exc:
+            log.warning("search_cursors: could not write %s – %s", path.name, exc)
+            return None
+        return cursor
+
+    def load(self, cursor: str) -> Optional[Dict[str, Any]]:
+        if not cursor or not _CURSOR_RE.match(cursor):
+            return None
+        path = self._path_for(cursor)
+        try:
+            envelope = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            log.warning("search_cursors: corrupt cursor %s – ignoring (%s)", path.name, exc)
+            return None
+
+        if time.time() - envelope.get("created_at", 0.0) > self.ttl_s:
+            path.unlink(missing_ok=True)
+            return None
+        return envelope.get("state")
+
+    def alive(self, cursor: str) -> bool:
+        """Whether `cursor` still names an unexpired snapshot (without reading it)."""
+        if not cursor or not _CURSOR_RE.match(cursor):
+            return False
+        try:
+            return time.time() - self._path_for(cursor).stat().st_mtime <= self.ttl_s
+        except OSError:
+            return False
+
+    def prune_expired(self) -> int:
+        """Remove expired cursors.  Returns how many were pruned."""
+        pruned = 0
+        cutoff = time.time() - self.ttl_s
+        for f in self.cursor_dir.glob("*.json"):
+            try:
+                if f.stat().st_mtime < cutoff:
+                    f.unlink()
+                    pruned += 1
+            except Exception:
+                pass
+        return pruned
+
+    async def start_pruning(self, interval_s: float = _DEFAULT_PRUNE_INTERVAL_S) -> None:
+        """Remove expired cursors now and every `interval_s` after."""
+        if self._prune_task is None or self._prune_task.done():
+            self._prune_task = asyncio.create_task(self._prune_loop(interval_s), name="search-cursor-prune")
+
+    async def stop_pruning(self) -> None:
+        if self._prune_task is not None:
+            self._prune_task.cancel()
+            try:
+                await self._prune_task
+            except asyncio.CancelledError:
+                pass
+            self._prune_task = None
+
+    # ── Internals ─────────────────────────────────────────────────────────────
+
+    def _path_for(self, cursor: str) -> Path:
+        return self.cursor_dir / f"{cursor}.json"
+
+    async def _prune_loop(self, interval_s: float) -> None:
+        while True:
+            try:
+                pruned = await asyncio.to_thread(self.prune_expired)
+                if pruned:
+                    log.info("search_cursors: pruned %d expired cursors", pruned)
+            except Exception as exc:
+                log.warning("search_cursors: prune failed – %s", exc)
+            await asyncio.sleep(interval_s)
+
+
+# ── Module-level singleton ────────────────────────────────────────────────────
+_default_store: Optional[SearchCursorStore] = None
+
+
+def get_default_cursor_store() -> SearchCursorStore:
+    global _default_store
+    if _default_store is None:
+        _default_store = SearchCursorStore()
+    return _default_store
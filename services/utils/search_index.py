@@ -0,0 +1,170 @@
+"""
+utils/search_index.py
+
+In-process BM25 inverted index over job fields.
+
+Supports incremental insert/delete, field-weighted term frequencies and
+top-k retrieval with a heap, so relevance ranking over locally held jobs
+(job store, feed mirrors) takes milliseconds instead of a linear substring
+scan over every document.
+
+Usage:
+    index = BM25Index()
+    index.add("job-1", {"title": "Python Developer", "company": "Acme"})
+    index.search("python dev", k=10)          # -> [("job-1", 1.73)]
+    index.remove("job-1")
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, Optional, Set, Tuple
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+# A few words that carry no signal in job titles/descriptions
+STOPWORDS = frozenset({"a", "an", "and", "at", "for", "in", "of", "on", "or", "the", "to", "with"})
+
+DEFAULT_FIELD_WEIGHTS: Dict[str, float] = {
+    "title": 3.0,
+    "company": 1.5,
+    "location": 1.0,
+    "description_snippet": 1.0,
+}
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if t not in STOPWORDS]
+
+
+class BM25Index:
+    """
+    Okapi BM25 over weighted fields.  Not thread-safe; callers that share an
+    index across threads must serialise access.
+    """
+
+    def __init__(
+        self,
+        k1: float = 1.2,
+        b: float = 0.75,
+        field_weights: Optional[Mapping[str, float]] = None,
+    ) -> None:
+        self.k1 = k1
+        self.b = b
+        self.field_weights = dict(field_weights or DEFAULT_FIELD_WEIGHTS)
+        self._postings: Dict[str, Dict[Hashable, float]] = {}
+        self._doc_terms: Dict[Hashable, Tuple[str, ...]] = {}
+        self._doc_len: Dict[Hashable, float] = {}
+        self._total_len = 0.0
+
+    # ── Public API ────────────────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return len(self._doc_len)
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self._doc_len
+
+    def add(self, doc_id: Hashable, fields: Mapping[str, str]) -> None:
+        """Index a document, replacing any previous version with the same id."""
+        if doc_id in self._doc_len:
+            self.remove(doc_id)
+
+        tf: Counter = Counter()
+        for name, text in fields.items():
+            weight = self.field_weights.get(name, 1.0)
+            for token in tokenize(text):
+                tf[token] += weight
+
+        length = sum(tf.values())
+        for token, freq in tf.items():
+            self._postings.setdefault(token, {})[doc_id] = freq
+        self._doc_terms[doc_id] = tuple(tf)
+        self._doc_len[doc_id] = length
+        self._total_len += length
+
+    def add_many(self, docs: Iterable[Tuple[Hashable, Mapping[str, str]]]) -> None:
+        for doc_id, fields in docs:
+            self.add(doc_id, fields)
+
+    def remove(self, doc_id: Hashable) -> bool:
+        length = self._doc_len.pop(doc_id, None)
+        if length is None:
+            return False
+        for token in self._doc_terms.pop(doc_id, ()):
+            posting = self._postings.get(token)
+            if posting is None:
+                continue
+            posting.pop(doc_id, None)
+            if not posting:
+                del self._postings[token]
+        self._total_len -= length
+        return True
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._doc_terms.clear()
+        self._doc_len.clear()
+        self._total_len = 0.0
+
+    def search(
+        self,
+        query: str,
+        k: int = 20,
+        require_all: bool = False,
+        candidates: Optional[Set[Hashable]] = None,
+    ) -> List[Tuple[Hashable, float]]:
+        """
+        Top-k (doc_id, score) pairs, best first.
+
+        `require_all` keeps only documents containing every query term;
+        `candidates` restricts scoring to a pre-filtered id set.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self._doc_len:
+            return []
+
+        postings = [self._postings.get(t, {}) for t in terms]
+        if require_all:
+            if any(not p for p in postings):
+                return []
+            allowed = set(min(postings, key=len))
+            for p in postings:
+                allowed.intersection_update(p)
+            candidates = allowed if candidates is None else (allowed & candidates)
+
+        n_docs = len(self._doc_len)
+        avg_len = self._total_len / n_docs if n_docs else 1.0
+        scores: Dict[Hashable, float] = {}
+
+        for posting in postings:
+            if not posting:
+                continue
+            idf = math.log(1.0 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+            for doc_id, tf in posting.items():
+                if candidates is not None and doc_id not in candidates:
+                    continue
+                norm = self.k1 * (1.0 - self.b + self.b * self._doc_len[doc_id] / avg_len)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1.0) / (tf + norm)
+
+        return heapq.nlargest(k, scores.items(), key=lambda kv: kv[1])
+
+
+def rank_jobs(query: str, jobs: List[Any]) -> List[Any]:
+    """
+    Order jobs by BM25 relevance to `query` using a throwaway index.
+    Jobs that do not match keep their original relative order at the end.
+    """
+    if len(jobs) < 2 or not tokenize(query):
+        return list(jobs)
+
+    index = BM25Index()
+    for i, job in enumerate(jobs):
+        index.add(i, {f: str(getattr(job, f, "") or "") for f in DEFAULT_FIELD_WEIGHTS})
+
+    ranked = [i for i, _score in index.search(query, k=len(jobs))]
+    matched = set(ranked)
+    return [jobs[i] for i in ranked] + [job for i, job in enumerate(jobs) if i not in matched]
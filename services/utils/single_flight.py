@@ -0,0 +1,69 @@
+"""
+utils/single_flight.py
+
+Request coalescing: concurrent calls with the same key share one execution.
+
+The first caller starts the work as a task; callers arriving while it runs
+await the same task instead of repeating it, so a burst of identical cold
+searches costs one provider fan-out and one cache write.  A caller that is
+cancelled stops waiting without cancelling the shared work.
+
+Usage:
+    flights = get_default_single_flight()
+    result = await flights.do(cache.key(query, where, providers), lambda: run_search())
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Per-key in-flight tasks.  Single event loop use; not thread-safe."""
+
+    def __init__(self) -> None:
+        self._flights: Dict[str, asyncio.Task] = {}
+        self.started = 0
+        self.joined = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._flights.get(key)
+        if task is None or task.done():
+            task = asyncio.ensure_future(fn())
+            self._flights[key] = task
+            task.add_done_callback(lambda t, k=key: self._forget(k, t))
+            self.started += 1
+        else:
+            log.debug("single_flight: joining in-flight call for key=%s", key[:12])
+            self.joined += 1
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"in_flight": len(self._flights), "started": self.started, "joined": self.joined}
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        # Nobody may be left to await a failed flight; mark its error as seen
+        if not task.cancelled():
+            task.exception()
+
+
+# ── Module-level singleton ────────────────────────────────────────────────────
+_default_single_flight: Optional[SingleFlight] = None
+
+
+def get_default_single_flight() -> SingleFlight:
+    global _default_single_flight
+    if _default_single_flight is None:
+        _default_single_flight = SingleFlight()
+    return _default_single_flight